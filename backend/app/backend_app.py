@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from datetime import date, datetime, time as dt_time
 from typing import List, Optional
 import uuid
 
 from fastapi import Depends, FastAPI, File, Form, HTTPException, UploadFile, status, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 import requests # Top-level import
 
 
 
 from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models.queue import SearchQueue, SearchStatus
@@ -68,6 +73,13 @@ from app import schemas
 from app.schemas.queue import SearchQueueResponse # Explicit import if not in __init__
 from app.crud import opportunity as opportunity_crud
 from app.crud import user as user_crud
+from app.crud import queue as queue_crud
+from app.services.query_keys import discovery_key
+from app.services.locations import normalize_location, resolve_location_ids
+from app.services.pdf_pool import PDF_POOL, PdfPoolBusy
+from app.services.resume_text import content_sha256, extract_resume_text_async
+from app.services.salary import parse_salary_floor
+from app.services.skills import canonical_keys, resolve_skill_ids, skills_in
 from app.db.session import get_db
 from app.models import Opportunity, UserOpportunity, ApplicationStage
 
@@ -140,7 +152,15 @@ class AnalyzeResponse(BaseModel):
   summary: str
 
 
-app = FastAPI(title="Job Aggregator Prototype API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  # PDF workers are spawned once, before the first upload arrives
+  PDF_POOL.start()
+  yield
+  PDF_POOL.shutdown()
+
+
+app = FastAPI(title="Job Aggregator Prototype API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
   CORSMiddleware,
@@ -185,6 +205,27 @@ def health() -> dict[str, str]:
   return {"status": "ok"}
 
 
+def _listing_filters(
+  skills: Optional[str], location: Optional[str], salary_min: Optional[str]
+) -> tuple[List[int], List[str], Optional[int]]:
+  """Parses the listing filters shared by /opportunities and /ats/rank; 400 on unknown values."""
+  # Comma-separated skill names; listings must require all of them
+  skill_filter, unknown_skills = resolve_skill_ids(s for s in (skills or "").split(",") if s.strip())
+  if unknown_skills:
+    raise HTTPException(status_code=400, detail=f"Unknown skills: {', '.join(unknown_skills)}")
+
+  # Location name -> gazetteer ids (a country or state covers its cities)
+  location_filter = sorted(resolve_location_ids([location])) if location and location.strip() else []
+  if location and location.strip() and not location_filter:
+    raise HTTPException(status_code=400, detail=f"Unknown location: {location}")
+
+  # Minimum annual pay in INR ("12 LPA", "12" lakhs or "1200000")
+  salary_floor = parse_salary_floor(salary_min)
+  if salary_min and salary_min.strip() and salary_floor is None:
+    raise HTTPException(status_code=400, detail=f"Unreadable salary_min: {salary_min}")
+  return skill_filter, location_filter, salary_floor
+
+
 @app.get("/opportunities", response_model=schemas.PaginatedOpportunities)
 def list_opportunities(
   page: int = 1,
@@ -192,14 +233,25 @@ def list_opportunities(
   source: Optional[str] = None,
   status: Optional[str] = None,
   job_type: Optional[str] = None,
+  skills: Optional[str] = None,
+  location: Optional[str] = None,
+  salary_min: Optional[str] = None,
+  experience_years: Optional[int] = None,
   db: Session = Depends(get_db),
 ) -> schemas.PaginatedOpportunities:
   # 0. Clamp pagination bounds
   page = max(1, page)
   limit = max(1, min(limit, 100))
 
+  skill_filter, location_filter, salary_floor = _listing_filters(skills, location, salary_min)
+  if experience_years is not None:
+    experience_years = max(0, experience_years)
+
   # 1. Check Cache
-  cache_key = f"opps:p{page}:l{limit}:src{source}:st{status}:jt{job_type}"
+  cache_key = (
+    f"opps:p{page}:l{limit}:src{source}:st{status}:jt{job_type}"
+    f":sk{sorted(skill_filter)}:loc{location_filter}:sal{salary_floor}:exp{experience_years}"
+  )
   cached = get_cache(cache_key)
   if cached:
       return cached
@@ -225,6 +277,10 @@ def list_opportunities(
         source=src_enum,
         status=status_enum,
         job_type=type_enum,
+        skill_ids=skill_filter,
+        location_ids=location_filter,
+        salary_min=salary_floor,
+        experience_years=experience_years,
         skip=offset,
         limit=limit,
       )
@@ -273,6 +329,14 @@ def list_opportunities(
   return response
 
 
+@app.get("/opportunities/locations")
+def opportunity_locations(db: Session = Depends(get_db)) -> List[dict]:
+  """Location facets: listing counts per gazetteer location."""
+  if not db.bind:
+    return []
+  return opportunity_crud.location_facets(db)
+
+
 @app.post("/opportunities", response_model=schemas.Opportunity)
 def create_opportunity(
   opportunity_in: schemas.OpportunityBase,
@@ -299,15 +363,38 @@ import os
 os.makedirs("app/static/resumes", exist_ok=True)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
+def _save_upload(path: str, content: bytes) -> None:
+  with open(path, "wb") as f:
+    f.write(content)
+
+
+async def _resume_text(content: bytes, db: Session) -> str:
+  """Resume text via the content-hash cache and the PDF pool; 503 when saturated or a worker died, 504 on timeout."""
+  try:
+    return await extract_resume_text_async(content, db)
+  except BrokenProcessPool:
+    # The pool has already been replaced; the client can simply retry
+    raise HTTPException(
+      status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+      detail="The PDF worker crashed while reading this file. Please retry.",
+      headers={"Retry-After": "1"},
+    )
+  except PdfPoolBusy:
+    raise HTTPException(
+      status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+      detail="Too many PDFs are being processed. Please retry shortly.",
+      headers={"Retry-After": "5"},
+    )
+  except asyncio.TimeoutError:
+    raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Timed out reading the PDF")
+
+
 @app.post("/analyze-cv", response_model=AnalyzeResponse)
 async def analyze_cv(
   file: UploadFile = File(...),
   user_id: Optional[str] = None,
   db: Session = Depends(get_db)
 ) -> AnalyzeResponse:
-  import io
-  from pypdf import PdfReader
-  
   # Read content
   content = await file.read()
 
@@ -317,46 +404,31 @@ async def analyze_cv(
   if len(content) > 5 * 1024 * 1024:
       raise HTTPException(status_code=400, detail="File too large (max 5MB)")
   
+  # Repeat uploads of the same file reuse the text extracted the first time
+  text = await _resume_text(content, db)
+
   # Save file locally
   filename = f"{uuid.uuid4()}_{file.filename}"
   file_path = f"app/static/resumes/{filename}"
   
-  with open(file_path, "wb") as f:
-      f.write(content)
+  await run_in_threadpool(_save_upload, file_path, content)
       
   # Generate Access URL (assuming localhost for prototype)
   # In prod, this would be S3 or similar.
   storage_url = f"http://localhost:8000/static/resumes/{filename}"
 
-  text = ""
-  try:
-    # Attempt to read as PDF
-    reader = PdfReader(io.BytesIO(content))
-    for page in reader.pages:
-      text += page.extract_text() + "\n"
-  except Exception:
-    pass
-
-  # Basic keyword extraction
-  text_lower = text.lower()
-  found_skills = []
-  all_skills = [
-    "python", "react", "next.js", "typescript", "javascript", "sql", "postgresql",
-    "docker", "aws", "fastapi", "django", "flask", "node.js", "java", "c++",
-    "machine learning", "data science", "html", "css", "tailwind"
-  ]
-
-  for skill in all_skills:
-    if skill in text_lower:
-      found_skills.append(skill.title())
+  # Skill extraction against the shared taxonomy
+  cv_skills = skills_in(text)
+  found_skills = [skill.name for skill in cv_skills]
+  skill_keys = {skill.key for skill in cv_skills}
 
   # Infer roles based on skills
   suggested_roles = []
-  if "python" in text_lower or "django" in text_lower or "fastapi" in text_lower:
+  if skill_keys & {"python", "django", "fastapi"}:
     suggested_roles.append("Backend Engineer")
-  if "react" in text_lower or "next.js" in text_lower or "typescript" in text_lower:
+  if skill_keys & {"react", "next.js", "typescript"}:
     suggested_roles.append("Frontend Engineer")
-  if "data science" in text_lower or "machine learning" in text_lower:
+  if skill_keys & {"data science", "machine learning"}:
     suggested_roles.append("Data Scientist")
   
   if not suggested_roles:
@@ -373,7 +445,9 @@ async def analyze_cv(
         storage_url=storage_url, 
         skills=found_skills,
         roles=list(set(suggested_roles)),
-        summary=f"Analyzed {len(found_skills)} skills"
+        summary=f"Analyzed {len(found_skills)} skills",
+        content_sha256=content_sha256(content),
+        resume_text=text or None,
       )
     except Exception as e:
       print(f"Failed to persist CV upload: {e}")
@@ -558,31 +632,20 @@ def ats_check(
   
   # Let's try to get job preferences as a proxy for skills
   pref = user_crud.get_job_preference(db, payload.user_id)
-  user_skills = []
+  user_skills = set()
   if pref and pref.priority_skills:
-    user_skills = [s.lower() for s in pref.priority_skills]
+    user_skills = canonical_keys(pref.priority_skills)
   
   # If no prefs, default to some common ones for demo purposes if user exists
   if not user_skills:
-     user_skills = ["python", "react", "communication"]
+     user_skills = {"python", "react", "communication"}
 
-  # 2. Parse Job Description
-  jd_text = payload.job_description.lower()
-  
-  # Simple keyword extraction from JD (naive approach)
-  # In a real app, use NLP (spacy/nltk)
-  common_tech_keywords = [
-    "python", "java", "c++", "javascript", "typescript", "react", "angular", "vue",
-    "node.js", "django", "flask", "fastapi", "sql", "postgresql", "mongodb", "aws",
-    "docker", "kubernetes", "git", "ci/cd", "communication", "teamwork", "leadership",
-    "problem solving", "agile", "scrum"
-  ]
-  
-  jd_keywords = [kw for kw in common_tech_keywords if kw in jd_text]
+  # 2. Parse Job Description: skills from the shared taxonomy, in JD order
+  jd_keywords = skills_in(payload.job_description)
   
   # 3. Compare
-  matched = [skill for skill in jd_keywords if skill in user_skills]
-  missing = [skill for skill in jd_keywords if skill not in user_skills]
+  matched = [skill for skill in jd_keywords if skill.key in user_skills]
+  missing = [skill for skill in jd_keywords if skill.key not in user_skills]
   
   # 4. Score
   if not jd_keywords:
@@ -595,14 +658,14 @@ def ats_check(
   if score < 50:
     recommendations.append("Your CV is missing many key skills mentioned in the JD.")
   if missing:
-    recommendations.append(f"Consider adding projects that use: {', '.join(missing[:3])}.")
+    recommendations.append(f"Consider adding projects that use: {', '.join(m.name for m in missing[:3])}.")
   if not missing:
     recommendations.append("Great match! Your profile aligns well with this job.")
     
   return ATSCheckResponse(
     score=score,
-    matched_skills=[m.title() for m in matched],
-    missing_skills=[m.title() for m in missing],
+    matched_skills=[m.name for m in matched],
+    missing_skills=[m.name for m in missing],
     recommendations=recommendations
   )
 
@@ -618,13 +681,14 @@ class ATSAnalyzeResponse(BaseModel):
 async def analyze_ats_upload(
   file: UploadFile = File(...),
   job_description: str = Form(...),
+  db: Session = Depends(get_db),
 ):
   if not job_description.strip():
       raise HTTPException(status_code=400, detail="Job description cannot be empty")
   analyzer = ATSAnalyzer()
   content = await file.read()
   
-  result = analyzer.analyze(content, job_description)
+  result = analyzer.analyze_text(await _resume_text(content, db), job_description)
   
   return ATSAnalyzeResponse(
     score=result.get("score", 0),
@@ -633,6 +697,74 @@ async def analyze_ats_upload(
   )
 
 
+from app.services.job_ranking import rank_jobs
+
+# Newest listings matching the filters that a resume is scored against
+RANK_CANDIDATES = 2000
+
+class RankedOpportunity(BaseModel):
+  opportunity: schemas.Opportunity
+  score: float
+  missing_keywords: List[str] = []
+
+class ATSRankResponse(BaseModel):
+  results: List[RankedOpportunity]
+  candidates: int
+
+@app.post("/ats/rank", response_model=ATSRankResponse)
+async def rank_listings_for_resume(
+  file: UploadFile = File(...),
+  limit: int = Form(10),
+  job_type: Optional[str] = Form(None),
+  skills: Optional[str] = Form(None),
+  location: Optional[str] = Form(None),
+  salary_min: Optional[str] = Form(None),
+  experience_years: Optional[int] = Form(None),
+  db: Session = Depends(get_db),
+) -> ATSRankResponse:
+  """
+  The listings that best fit an uploaded resume. The PDF is parsed and
+  vectorized once, then scored against every filtered candidate in a
+  single sparse matrix-vector product (see app.services.job_ranking).
+  """
+  limit = max(1, min(limit, 50))
+  skill_filter, location_filter, salary_floor = _listing_filters(skills, location, salary_min)
+  type_enum = None
+  if job_type:
+    try: type_enum = schemas.JobType(job_type.lower())
+    except ValueError: raise HTTPException(status_code=400, detail=f"Unknown job_type: {job_type}")
+
+  resume_text = await _resume_text(await file.read(), db)
+  if not resume_text.strip():
+    raise HTTPException(status_code=400, detail="Could not extract text from the uploaded PDF")
+  if not db.bind:
+    return ATSRankResponse(results=[], candidates=0)
+
+  def rank():
+    # Loading up to RANK_CANDIDATES rows and scoring them both block, so they
+    # run on the threadpool instead of the event loop
+    candidates, _ = opportunity_crud.list_opportunities(
+      db=db,
+      status=schemas.OpportunityStatus.OPEN,
+      job_type=type_enum,
+      skill_ids=skill_filter,
+      location_ids=location_filter,
+      salary_min=salary_floor,
+      experience_years=max(0, experience_years) if experience_years is not None else None,
+      limit=RANK_CANDIDATES,
+    )
+    return candidates, rank_jobs(resume_text, candidates, limit)
+
+  candidates, ranked = await run_in_threadpool(rank)
+  return ATSRankResponse(
+    results=[
+      RankedOpportunity(opportunity=r.opportunity, score=r.score, missing_keywords=r.missing_keywords)
+      for r in ranked
+    ],
+    candidates=len(candidates),
+  )
+
+
 
 # ========================
 # AGENT DEEP SCAN TRIGGER
@@ -676,7 +808,7 @@ def trigger_github_action(logger=None):
 @app.post("/opportunities/discover", response_model=schemas.SearchQueueResponse)
 def discover_opportunities(
   payload: schemas.DiscoverRequest,
-  user_id: Optional[str] = None, # Optional for now, or extract from auth if available
+  user_id: Optional[uuid.UUID] = None, # Optional for now, or extract from auth if available; non-UUIDs get a 422
   db: Session = Depends(get_db)
 ):
   import logging
@@ -694,10 +826,10 @@ def discover_opportunities(
       out = []
       for l in loc_list or []:
           if not l: continue
-          s = l.strip()
+          # Gazetteer spelling for known places ("bangalore" -> "Bengaluru")
+          s = normalize_location(l)
           if not s: continue
 
-          s = s.title()
           if s not in out:
               out.append(s)
       return out
@@ -744,25 +876,65 @@ def discover_opportunities(
   if not task_query.strip():
       raise HTTPException(status_code=400, detail="Query cannot be empty. Please provide skills or location.")
 
-  # 4. Create Queue Item
+  # 4. Coalesce with an identical pending/recent request. Only worker mode
+  # completes queue items; a GitHub run never does, so joining there would
+  # leave later requesters waiting on an item that never finishes.
+  worker_mode = os.getenv("AGENT_DISPATCH_MODE", "github") == "worker"
+  dedupe_key = None
+  if worker_mode:
+      dedupe_key = discovery_key(
+          payload.roles or payload.skills, locations, salary_min=payload.salary_min, limit=payload.limit
+      )
+      coalesce_window = int(os.getenv("DISCOVER_COALESCE_SECONDS", str(queue_crud.DEFAULT_COALESCE_SECONDS)))
+      existing = queue_crud.find_coalescable(db, dedupe_key, coalesce_window)
+      if existing:
+          queue_crud.attach_requester(db, existing, user_id)
+          db.commit()
+          db.refresh(existing)
+          print(f"🔗 Joined existing queue item {existing.id}")
+          return existing
+
+  # 5. Create Queue Item
   queue_item = SearchQueue(
       query=task_query,
+      user_id=user_id,
+      dedupe_key=dedupe_key,
+      requesters=[str(user_id)] if user_id else [],
       resolved_locations_source=resolved_locations_source,
       filters={
           "location": payload.location, 
           "resolved_locations": locations, 
           "salary_min": payload.salary_min,
           "limit": payload.limit,
-          "skills": payload.skills
+          "skills": payload.skills,
+          "roles": payload.roles
       }
   )
   db.add(queue_item)
-  db.commit()
+  if worker_mode:
+      # Wakes the long-running agent workers (`agent_main.py --worker`) on commit
+      queue_crud.notify_new_item(db)
+  try:
+      db.commit()
+  except IntegrityError:
+      # Lost the race against an identical request; join its item instead
+      db.rollback()
+      existing = queue_crud.find_coalescable(db, dedupe_key, coalesce_window) if dedupe_key else None
+      if existing is None:
+          raise
+      queue_crud.attach_requester(db, existing, user_id)
+      db.commit()
+      db.refresh(existing)
+      return existing
   db.refresh(queue_item)
   
   print("📦 Queue item created")
+
+  # With a worker daemon consuming the queue there is nothing to dispatch
+  if worker_mode:
+      return queue_item
   
-  # 5. Trigger GitHub Action (Synchronous & Strict)
+  # 6. Trigger GitHub Action (Synchronous & Strict)
   success, msg = trigger_github_action(logger)
   
   if not success:
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
+import uuid
 
-from sqlalchemy import select
+from sqlalchemy import String, and_, any_, bindparam, func, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
 
 from app import schemas
@@ -12,6 +14,8 @@ from app.models import (
   OpportunityStatus,
   UserOpportunity,
 )
+from app.services.classifier import EXPERIENCE_SLACK, MID_MIN_YEARS
+from app.services.locations import PLACES, resolve_location_ids
 
 
 def create_opportunity(
@@ -29,15 +33,64 @@ def get_opportunity_by_link(db: Session, link: str) -> Optional[Opportunity]:
   return db.query(Opportunity).filter(Opportunity.apply_link == link).first()
 
 
+LINK_LOOKUP_CHUNK = 1000
+
+
+def get_existing_links(db: Session, links: Iterable[str]) -> Dict[str, uuid.UUID]:
+  """Batch variant of get_opportunity_by_link: one `= ANY(:links)` query per chunk."""
+  unique = list(dict.fromkeys(l for l in links if l))
+  stmt = select(Opportunity.apply_link, Opportunity.id).where(
+    Opportunity.apply_link == any_(bindparam("links", type_=ARRAY(String)))
+  )
+  found: Dict[str, uuid.UUID] = {}
+  for i in range(0, len(unique), LINK_LOOKUP_CHUNK):
+    chunk = unique[i:i + LINK_LOOKUP_CHUNK]
+    for link, op_id in db.execute(stmt, {"links": chunk}):
+      found[link] = op_id
+  return found
+
+
+def _location_filter(location: str):
+  """
+  Exact `location_id IN (...)` match when the gazetteer knows `location`
+  (a country or state includes everything under it); free-text ILIKE otherwise.
+  """
+  ids = resolve_location_ids([location])
+  if ids:
+    return Opportunity.location_id.in_(sorted(ids))
+  return Opportunity.location.ilike(f"%{location.strip()}%")
+
+
+def _experience_filter(experience_years: int):
+  """SQL form of classifier.fits_experience: index-backed on (experience_min_years, seniority_band)."""
+  clause = or_(
+    Opportunity.experience_min_years.is_(None),
+    Opportunity.experience_min_years <= experience_years + EXPERIENCE_SLACK,
+  )
+  if experience_years < MID_MIN_YEARS:
+    clause = and_(clause, or_(Opportunity.seniority_band.is_(None), Opportunity.seniority_band != "senior"))
+  return clause
+
+
 def list_opportunities(
   db: Session,
   *,
   source: Optional[OpportunitySource] = None,
   status: Optional[OpportunityStatus] = None,
   job_type: Optional[schemas.JobType] = None,
+  skill_ids: Optional[List[int]] = None,
+  location_ids: Optional[List[str]] = None,
+  salary_min: Optional[int] = None,
+  experience_years: Optional[int] = None,
   skip: int = 0,
   limit: int = 20,
 ) -> tuple[List[Opportunity], int]:
+  """
+  Newest listings matching the filters; `skill_ids` requires every given
+  skill (GIN `@>`), `location_ids` any of the given gazetteer ids, and
+  `salary_min` (annual INR) a pay range reaching at least that much;
+  `experience_years` keeps postings that suit that much experience.
+  """
   stmt = select(Opportunity)
   if source:
     stmt = stmt.filter(Opportunity.source == source)
@@ -45,10 +98,17 @@ def list_opportunities(
     stmt = stmt.filter(Opportunity.status == status)
   if job_type:
     stmt = stmt.filter(Opportunity.job_type == job_type)
+  if skill_ids:
+    stmt = stmt.filter(Opportunity.skill_ids.contains(skill_ids))
+  if location_ids:
+    stmt = stmt.filter(Opportunity.location_id.in_(location_ids))
+  if salary_min:
+    stmt = stmt.filter(Opportunity.salary_annual_max >= salary_min)
+  if experience_years is not None:
+    stmt = stmt.filter(_experience_filter(experience_years))
   
   # Total count query
   # Use a separate simpler query for performance and reliability
-  from sqlalchemy import func
   count_stmt = select(func.count(Opportunity.id))
   if source:
     count_stmt = count_stmt.filter(Opportunity.source == source)
@@ -56,6 +116,14 @@ def list_opportunities(
     count_stmt = count_stmt.filter(Opportunity.status == status)
   if job_type:
     count_stmt = count_stmt.filter(Opportunity.job_type == job_type)
+  if skill_ids:
+    count_stmt = count_stmt.filter(Opportunity.skill_ids.contains(skill_ids))
+  if location_ids:
+    count_stmt = count_stmt.filter(Opportunity.location_id.in_(location_ids))
+  if salary_min:
+    count_stmt = count_stmt.filter(Opportunity.salary_annual_max >= salary_min)
+  if experience_years is not None:
+    count_stmt = count_stmt.filter(_experience_filter(experience_years))
     
   total = db.scalar(count_stmt) or 0
   
@@ -66,6 +134,73 @@ def list_opportunities(
   return list(db.scalars(stmt)), total
 
 
+def search_opportunities(
+  db: Session,
+  terms: Iterable[str],
+  location: Optional[str] = None,
+  limit: int = 20,
+  salary_min: Optional[int] = None,
+) -> List[Opportunity]:
+  """Newest listings whose title mentions any of `terms` (and `location` / `salary_min`, if given)."""
+  patterns = [f"%{t.strip()}%" for t in terms if t and t.strip()]
+  stmt = select(Opportunity)
+  if patterns:
+    stmt = stmt.filter(or_(*(Opportunity.role_title.ilike(p) for p in patterns)))
+  if location:
+    stmt = stmt.filter(_location_filter(location))
+  if salary_min:
+    stmt = stmt.filter(Opportunity.salary_annual_max >= salary_min)
+  stmt = stmt.order_by(Opportunity.created_at.desc()).limit(limit)
+  return list(db.scalars(stmt))
+
+
+MATCH_CANDIDATES = 500
+
+
+def match_opportunities(
+  db: Session,
+  skill_ids: Iterable[int],
+  location: Optional[str] = None,
+  limit: int = 20,
+  salary_min: Optional[int] = None,
+) -> List[Opportunity]:
+  """
+  Listings sharing at least one of `skill_ids`, ranked by how many they share.
+
+  Candidates come from the GIN index (`skill_ids && :ids`), newest first and
+  capped at MATCH_CANDIDATES; ranking is a set intersection per candidate, so
+  no listing text is read at request time.
+  """
+  wanted = set(skill_ids)
+  if not wanted:
+    return []
+  stmt = select(Opportunity).filter(Opportunity.skill_ids.overlap(sorted(wanted)))
+  if location:
+    stmt = stmt.filter(_location_filter(location))
+  if salary_min:
+    stmt = stmt.filter(Opportunity.salary_annual_max >= salary_min)
+  stmt = stmt.order_by(Opportunity.created_at.desc()).limit(MATCH_CANDIDATES)
+  candidates = list(db.scalars(stmt))
+  # Stable sort: equal overlaps keep newest-first order
+  candidates.sort(key=lambda op: len(wanted.intersection(op.skill_ids or ())), reverse=True)
+  return candidates[:limit]
+
+
+def location_facets(db: Session) -> List[dict]:
+  """Listing counts per gazetteer location, largest first; unresolved locations are left out."""
+  stmt = (
+    select(Opportunity.location_id, func.count(Opportunity.id))
+    .filter(Opportunity.location_id.is_not(None))
+    .group_by(Opportunity.location_id)
+    .order_by(func.count(Opportunity.id).desc())
+  )
+  facets = []
+  for location_id, count in db.execute(stmt):
+    place = PLACES.get(location_id)
+    facets.append({"id": location_id, "name": place.name if place else location_id, "count": count})
+  return facets
+
+
 def create_user_opportunity(
   db: Session, user_id: str, payload: schemas.UserOpportunityBase
 ) -> UserOpportunity:
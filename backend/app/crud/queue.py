@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import or_, select, text, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.models import ApplicationStage, UserOpportunity
+from app.models.queue import SearchQueue, SearchStatus
+
+# Postgres NOTIFY channel agent workers LISTEN on for new queue items
+SEARCH_QUEUE_CHANNEL = "search_queue"
+
+# A claimed item must be heartbeated within this window or it is reclaimed
+DEFAULT_LEASE_SECONDS = 300
+# Claims per item (initial run + retries) before it is marked FAILED
+MAX_ATTEMPTS = 3
+# Completed items younger than this are reused for identical discovery requests
+DEFAULT_COALESCE_SECONDS = 900
+
+
+def notify_new_item(db: Session) -> None:
+  """Wakes listening workers; delivered when the surrounding transaction commits."""
+  db.execute(text(f"NOTIFY {SEARCH_QUEUE_CHANNEL}"))
+
+
+def claim_pending(
+  db: Session,
+  worker_id: str,
+  limit: int = 1,
+  lease_seconds: int = DEFAULT_LEASE_SECONDS,
+) -> List[SearchQueue]:
+  """
+  Leases up to `limit` items to `worker_id`, oldest first, and returns them.
+
+  Candidates are PENDING items plus PROCESSING items whose lease expired (the
+  worker holding them crashed or stalled). Rows are selected with
+  `FOR UPDATE SKIP LOCKED`, so concurrent workers never claim the same item and
+  never wait on each other. Expired items that already used up MAX_ATTEMPTS are
+  marked FAILED instead of being handed out again.
+  """
+  now = func.now()
+  items = db.scalars(
+    select(SearchQueue)
+    .where(
+      or_(
+        SearchQueue.status == SearchStatus.PENDING,
+        (SearchQueue.status == SearchStatus.PROCESSING) & (SearchQueue.lease_expires_at < now),
+      )
+    )
+    .order_by(SearchQueue.created_at)
+    .limit(limit)
+    .with_for_update(skip_locked=True)
+  ).all()
+
+  claimed = []
+  for item in items:
+    if item.status == SearchStatus.PROCESSING and item.attempts >= MAX_ATTEMPTS:
+      item.status = SearchStatus.FAILED
+      item.last_error = f"Lease held by {item.locked_by} expired after {item.attempts} attempts"
+      item.locked_by = None
+      item.lease_expires_at = None
+      continue
+    item.status = SearchStatus.PROCESSING
+    item.locked_by = worker_id
+    item.lease_expires_at = now + timedelta(seconds=lease_seconds)
+    item.heartbeat_at = now
+    item.attempts = (item.attempts or 0) + 1
+    claimed.append(item)
+  db.commit()
+
+  for item in claimed:
+    db.refresh(item)
+  return claimed
+
+
+def heartbeat(
+  db: Session,
+  item_id,
+  worker_id: str,
+  lease_seconds: int = DEFAULT_LEASE_SECONDS,
+) -> bool:
+  """Extends the lease on an item; False means the lease was lost to another worker."""
+  result = db.execute(
+    update(SearchQueue)
+    .where(
+      SearchQueue.id == item_id,
+      SearchQueue.locked_by == worker_id,
+      SearchQueue.status == SearchStatus.PROCESSING,
+    )
+    .values(
+      lease_expires_at=func.now() + timedelta(seconds=lease_seconds),
+      heartbeat_at=func.now(),
+    )
+  )
+  db.commit()
+  return bool(result.rowcount)
+
+
+def _owned(db: Session, item_id, worker_id: Optional[str]) -> Optional[SearchQueue]:
+  item = db.get(SearchQueue, item_id, with_for_update=True)
+  if item is None or (worker_id is not None and item.locked_by != worker_id):
+    # Lease expired and the item now belongs to someone else
+    db.rollback()
+    return None
+  return item
+
+
+def find_coalescable(
+  db: Session, dedupe_key: str, completed_within: int = DEFAULT_COALESCE_SECONDS
+) -> Optional[SearchQueue]:
+  """
+  Returns (row-locked) the item an identical request can join: the active
+  pending/processing item for `dedupe_key`, else one completed recently.
+  """
+  return db.scalars(
+    select(SearchQueue)
+    .where(
+      SearchQueue.dedupe_key == dedupe_key,
+      or_(
+        SearchQueue.status.in_([SearchStatus.PENDING, SearchStatus.PROCESSING]),
+        (SearchQueue.status == SearchStatus.COMPLETED)
+        & (SearchQueue.updated_at > func.now() - timedelta(seconds=completed_within)),
+      ),
+    )
+    .order_by(SearchQueue.created_at.desc())
+    .limit(1)
+    .with_for_update()
+  ).first()
+
+
+def attach_requester(db: Session, item: SearchQueue, user_id: Optional[str]) -> SearchQueue:
+  """
+  Adds `user_id` to a coalesced item's requesters. If the item already
+  completed, its results are fanned out to the new requester right away.
+  Caller commits.
+  """
+  if user_id is None or str(user_id) in (item.requesters or []):
+    return item
+  item.requesters = [*(item.requesters or []), str(user_id)]
+  if item.status == SearchStatus.COMPLETED:
+    fan_out_results(db, item, item.result_ids or [], user_ids=[str(user_id)])
+  return item
+
+
+def fan_out_results(
+  db: Session, item: SearchQueue, opportunity_ids: Iterable, user_ids: Optional[Iterable[str]] = None
+) -> int:
+  """
+  Suggests the listings a queue item produced to every requester (or just
+  `user_ids`), skipping listings a user already tracks. Caller commits.
+  """
+  opportunity_ids = [uuid.UUID(str(o)) for o in opportunity_ids]
+  users = []
+  for u in user_ids if user_ids is not None else item.requesters or []:
+    try:
+      users.append(uuid.UUID(str(u)))
+    except ValueError:
+      # Requesters stored before the endpoint validated ids; one bad id must not fail the item
+      continue
+  if not opportunity_ids or not users:
+    return 0
+
+  existing = set(
+    db.execute(
+      select(UserOpportunity.user_id, UserOpportunity.opportunity_id).where(
+        UserOpportunity.user_id.in_(users),
+        UserOpportunity.opportunity_id.in_(opportunity_ids),
+      )
+    ).all()
+  )
+  reason = f"Found by your search for '{item.query}'"
+  rows = [
+    UserOpportunity(user_id=u, opportunity_id=o, stage=ApplicationStage.SUGGESTED, match_reason=reason)
+    for u in users
+    for o in opportunity_ids
+    if (u, o) not in existing
+  ]
+  db.add_all(rows)
+  return len(rows)
+
+
+def mark_completed(
+  db: Session,
+  item_id,
+  worker_id: Optional[str] = None,
+  result_ids: Optional[Iterable] = None,
+) -> Optional[SearchQueue]:
+  """Completes the item and fans `result_ids` out to its requesters in the same transaction."""
+  item = _owned(db, item_id, worker_id)
+  if item:
+    if result_ids is not None:
+      item.result_ids = [str(r) for r in result_ids]
+      fan_out_results(db, item, item.result_ids)
+    item.status = SearchStatus.COMPLETED
+    item.locked_by = None
+    item.lease_expires_at = None
+    db.commit()
+  return item
+
+
+def mark_failed(
+  db: Session,
+  item_id,
+  error: Optional[str] = None,
+  worker_id: Optional[str] = None,
+) -> Optional[SearchQueue]:
+  """Records the error and re-queues the item, or fails it once MAX_ATTEMPTS is reached."""
+  item = _owned(db, item_id, worker_id)
+  if item:
+    item.last_error = error
+    item.status = SearchStatus.PENDING if item.attempts < MAX_ATTEMPTS else SearchStatus.FAILED
+    item.locked_by = None
+    item.lease_expires_at = None
+    db.commit()
+  return item
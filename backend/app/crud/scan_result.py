@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.models import Opportunity
+from app.models.scan_result import ScanResult
+
+
+def get_scan(db: Session, query_key: str, include_expired: bool = False) -> Optional[ScanResult]:
+  """Cached scan for `query_key`; expired entries only when `include_expired`."""
+  stmt = select(ScanResult).where(ScanResult.query_key == query_key)
+  if not include_expired:
+    stmt = stmt.where(ScanResult.expires_at > func.now())
+  return db.scalars(stmt).first()
+
+
+def record_scan(
+  db: Session,
+  query_key: str,
+  query: str,
+  filters: dict,
+  result_ids: Iterable,
+  ttl_seconds: int,
+) -> None:
+  """Upserts the listing ids a scan produced, valid for `ttl_seconds`."""
+  values = dict(
+    query_key=query_key,
+    query=query[:512],
+    filters=filters,
+    result_ids=[str(r) for r in result_ids],
+    expires_at=func.now() + timedelta(seconds=ttl_seconds),
+  )
+  stmt = insert(ScanResult).values(id=uuid.uuid4(), **values)
+  stmt = stmt.on_conflict_do_update(
+    index_elements=[ScanResult.query_key],
+    set_={**values, "created_at": func.now()},
+  )
+  db.execute(stmt)
+  db.commit()
+
+
+def get_opportunities_by_ids(db: Session, ids: Iterable, limit: Optional[int] = None) -> List[Opportunity]:
+  """Loads listings by id in one query, keeping the order of `ids` (missing ones are skipped)."""
+  ordered = [uuid.UUID(str(i)) for i in ids]
+  if limit is not None:
+    ordered = ordered[:limit]
+  if not ordered:
+    return []
+  found = {op.id: op for op in db.scalars(select(Opportunity).where(Opportunity.id.in_(ordered)))}
+  return [found[i] for i in ordered if i in found]
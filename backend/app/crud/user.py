@@ -15,7 +15,9 @@ def create_cv_upload(
   storage_url: str,
   skills: list[str],
   roles: list[str],
-  summary: str
+  summary: str,
+  content_sha256: Optional[str] = None,
+  resume_text: Optional[str] = None,
 ) -> CvUpload:
   cv = CvUpload(
     user_id=user_id,
@@ -23,7 +25,9 @@ def create_cv_upload(
     storage_url=storage_url,
     parsed_skills=skills,
     parsed_roles=roles,
-    summary=summary
+    summary=summary,
+    content_sha256=content_sha256,
+    resume_text=resume_text,
   )
   db.add(cv)
   db.commit()
@@ -31,6 +35,16 @@ def create_cv_upload(
   return cv
 
 
+def get_cv_text(db: Session, content_sha256: str) -> Optional[str]:
+  """Extracted text of an earlier upload of the same file (by SHA-256), if any."""
+  return (
+    db.query(CvUpload.resume_text)
+    .filter(CvUpload.content_sha256 == content_sha256, CvUpload.resume_text.is_not(None))
+    .limit(1)
+    .scalar()
+  )
+
+
 def create_user(db: Session, user_in: schemas.UserCreate) -> User:
   user_data = user_in.model_dump()
   # If id is provided, use it; otherwise let DB generate (though for Supabase we always want to use provided ID)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.models.watermark import AgentWatermark
+
+
+def _key(value: Optional[str]) -> str:
+  return " ".join((value or "").lower().split())[:512]
+
+
+def get_watermark(db: Session, source: str, query: str, location: str) -> Optional[datetime]:
+  """Newest posting time stored for this scan, or None if it never completed."""
+  return db.scalar(
+    select(AgentWatermark.newest_at).where(
+      AgentWatermark.source == source,
+      AgentWatermark.query == _key(query),
+      AgentWatermark.location == _key(location),
+    )
+  )
+
+
+def advance_watermark(db: Session, source: str, query: str, location: str, newest_at: datetime) -> None:
+  """Upserts the watermark; an older `newest_at` never moves it backwards."""
+  stmt = insert(AgentWatermark).values(
+    source=source, query=_key(query), location=_key(location), newest_at=newest_at
+  )
+  stmt = stmt.on_conflict_do_update(
+    index_elements=[AgentWatermark.source, AgentWatermark.query, AgentWatermark.location],
+    set_={
+      "newest_at": func.greatest(AgentWatermark.newest_at, stmt.excluded.newest_at),
+      "updated_at": func.now(),
+    },
+  )
+  db.execute(stmt)
+  db.commit()
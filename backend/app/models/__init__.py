@@ -4,17 +4,21 @@ import uuid
 from enum import Enum
 
 from sqlalchemy import (
+  BigInteger,
   Column,
   DateTime,
   Enum as SAEnum,
+  Float,
   ForeignKey,
+  Index,
   Integer,
   Numeric,
+  SmallInteger,
   String,
   Text,
   text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -128,6 +132,9 @@ class CvUpload(Base):
   parsed_skills = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
   parsed_roles = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
   summary: Mapped[str | None] = mapped_column(Text)
+  # SHA-256 of the file and its extracted text, so repeat uploads skip PDF parsing
+  content_sha256: Mapped[str | None] = mapped_column(String(64), index=True)
+  resume_text: Mapped[str | None] = mapped_column(Text)
 
   user: Mapped[User] = relationship(back_populates="cv_uploads")
 
@@ -179,10 +186,28 @@ class Opportunity(Base):
     SAEnum(WorkMode, name="work_mode_enum"), nullable=True
   )
   location: Mapped[str | None] = mapped_column(String(255))
+  # Gazetteer id (app.services.locations) resolved from `location` at ingest
+  location_id: Mapped[str | None] = mapped_column(String(32), index=True)
   salary_min: Mapped[float | None] = mapped_column(Numeric(10, 2))
   salary_max: Mapped[float | None] = mapped_column(Numeric(10, 2))
   currency: Mapped[str | None] = mapped_column(String(8), default="INR")
-  apply_link: Mapped[str] = mapped_column(String(512), nullable=False)
+  # salary_min/max as every source normalizes them (app.services.salary): annual
+  # INR, the period the source quoted and how much to trust the figure
+  salary_annual_min: Mapped[int | None] = mapped_column(Integer)
+  salary_annual_max: Mapped[int | None] = mapped_column(Integer)
+  salary_period: Mapped[str | None] = mapped_column(String(8))
+  salary_confidence: Mapped[float | None] = mapped_column(Float)
+  # Experience asked for and seniority band (app.services.classifier), so one
+  # scrape serves every experience level and filters run at query time
+  experience_min_years: Mapped[int | None] = mapped_column(SmallInteger)
+  experience_max_years: Mapped[int | None] = mapped_column(SmallInteger)
+  seniority_band: Mapped[str | None] = mapped_column(String(16))
+  apply_link: Mapped[str] = mapped_column(String(512), nullable=False, index=True)
+  # Cross-source identity: provider-resolved link and SimHash of company/title/description
+  canonical_link: Mapped[str | None] = mapped_column(String(512), index=True)
+  simhash: Mapped[int | None] = mapped_column(BigInteger)
+  # Canonical skill ids (app.services.skills) extracted once at ingest
+  skill_ids: Mapped[list[int] | None] = mapped_column(ARRAY(Integer))
   source: Mapped[OpportunitySource] = mapped_column(
     SAEnum(OpportunitySource, name="opportunity_source_enum"),
     nullable=False,
@@ -210,6 +235,15 @@ class Opportunity(Base):
     back_populates="opportunity", cascade="all, delete-orphan"
   )
 
+  __table_args__ = (
+    # Serves skill_ids @> (requires all) and && (shares any) lookups
+    Index("ix_job_listings_skill_ids", "skill_ids", postgresql_using="gin"),
+    # Range scans for "pays at least X" (salary_annual_max >= :x)
+    Index("ix_job_listings_salary_annual", "salary_annual_max", "salary_annual_min"),
+    # experience_min_years <= :years (or unknown), minus senior-band roles for juniors
+    Index("ix_job_listings_experience", "experience_min_years", "seniority_band"),
+  )
+
 
 class UserOpportunity(Base):
   __tablename__ = "user_opportunities"
@@ -266,5 +300,7 @@ class StatusHistory(Base):
 
 
 from app.models.queue import SearchQueue, SearchStatus
+from app.models.scan_result import ScanResult
 
 
+from app.models.watermark import AgentWatermark
@@ -7,7 +7,10 @@ from sqlalchemy import (
   Column,
   DateTime,
   Enum as SAEnum,
+  Index,
+  Integer,
   String,
+  Text,
   text,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
@@ -42,6 +45,18 @@ class SearchQueue(Base):
   task_type = Column(String(50), nullable=False, server_default="SEARCH") # 'SEARCH' or 'ATS'
   payload = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb")) # Extra data like resume_text
 
+  # Claim/lease bookkeeping for parallel agent workers (see app.crud.queue)
+  locked_by = Column(String(128), nullable=True)
+  lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+  heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+  attempts = Column(Integer, nullable=False, default=0, server_default="0")
+  last_error = Column(Text, nullable=True)
+
+  # Request coalescing: identical discovery requests share one item (see app.services.query_keys)
+  dedupe_key = Column(String(64), nullable=True, index=True)
+  requesters = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
+  result_ids = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
+
   created_at: Mapped[DateTime] = mapped_column(
     DateTime(timezone=True), nullable=False, server_default=func.now()
   )
@@ -52,3 +67,13 @@ class SearchQueue(Base):
     onupdate=func.now(),
   )
 
+  __table_args__ = (
+    Index("ix_search_queue_status_created_at", "status", "created_at"),
+    # At most one active (pending/processing) item per dedupe key
+    Index(
+      "uq_search_queue_active_dedupe_key",
+      "dedupe_key",
+      unique=True,
+      postgresql_where=text("status IN ('PENDING', 'PROCESSING')"),
+    ),
+  )
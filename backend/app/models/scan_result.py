@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Column, DateTime, String, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+class ScanResult(Base):
+  """Listing ids a discovery scan produced, cached per normalized query until `expires_at`."""
+
+  __tablename__ = "scan_results"
+
+  id: Mapped[uuid.UUID] = mapped_column(
+    UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+  )
+  query_key: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+  query: Mapped[str] = mapped_column(String(512), nullable=False)
+  filters = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+  result_ids = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
+
+  created_at: Mapped[DateTime] = mapped_column(
+    DateTime(timezone=True), nullable=False, server_default=func.now()
+  )
+  expires_at: Mapped[DateTime] = mapped_column(
+    DateTime(timezone=True), nullable=False, index=True
+  )
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+class AgentWatermark(Base):
+  """Newest posting time the agent has stored per (source, query, location) scan."""
+
+  __tablename__ = "agent_watermarks"
+
+  source: Mapped[str] = mapped_column(String(32), primary_key=True)
+  query: Mapped[str] = mapped_column(String(512), primary_key=True)
+  location: Mapped[str] = mapped_column(String(512), primary_key=True)
+  newest_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
+  updated_at: Mapped[DateTime] = mapped_column(
+    DateTime(timezone=True), nullable=False, server_default=func.now()
+  )
@@ -99,11 +99,20 @@ class OpportunityBase(BaseSchema):
   salary_min: Optional[float] = None
   salary_max: Optional[float] = None
   currency: Optional[str] = "INR"
+  salary_annual_min: Optional[int] = None
+  salary_annual_max: Optional[int] = None
+  salary_period: Optional[str] = None
+  salary_confidence: Optional[float] = None
+  experience_min_years: Optional[int] = None
+  experience_max_years: Optional[int] = None
+  seniority_band: Optional[str] = None
   apply_link: str
   source: OpportunitySource = OpportunitySource.OFFICIAL
   status: OpportunityStatus = OpportunityStatus.OPEN
   status_note: Optional[str] = None
   source_metadata: dict = Field(default_factory=dict)
+  skill_ids: Optional[List[int]] = None
+  location_id: Optional[str] = None
 
 
 class Opportunity(OpportunityBase):
@@ -16,6 +16,8 @@ class SearchQueueCreate(SearchQueueBase):
 class SearchQueueResponse(SearchQueueBase):
   id: UUID
   status: SearchStatus
+  attempts: int = 0
+  last_error: Optional[str] = None
   created_at: datetime
   updated_at: datetime
 
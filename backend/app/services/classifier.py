@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import re
+from enum import Enum
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from app.models import JobType, WorkMode
+from app.services.locations import PLACES, resolve_location
+from app.services.patterns import trie_pattern
+from app.services.salary import (
+    CONFIDENCE_LPA,
+    CONFIDENCE_MONTHLY_K,
+    CONFIDENCE_RUPEES,
+    PERIODS,
+    Salary,
+    text_salary,
+)
+
+# =============================================================================
+# RULES
+# =============================================================================
+#
+# Keyword lists are the ones the agent's bouncer / job-type heuristics and
+# the discovery NLPProcessor have always used. Title keywords match as
+# substrings; description job-type keywords match as whole words. Places
+# come from the gazetteer in app.services.locations.
+
+SENIOR_TITLE_TERMS = ["senior", "lead", "principal", "manager", "architect", "head", "vp", "director"]
+JUNIOR_TITLE_TERMS = ["junior", "jr", "intern", "trainee", "entry level", "fresher", "graduate"]
+INTERN_TERMS = ["intern", "internship", "trainee", "apprentice", "students", "summer", "placement"]
+CONTRACT_TERMS = ["contract", "freelance", "temporary", "part-time", "part time"]
+WORK_MODE_TERMS = ["remote", "hybrid"]
+
+_STRICT_MIN_EXP = r"(?:minimum|required|requires|experience)\s*(?:of|:)?\s*[2-9]\s*(?:\+|plus)?\s*(?:years|yrs)"
+_LPA = r"(\d+(?:\.\d+)?)\s*(?:-|to)?\s*(\d+(?:\.\d+)?)?\s*lpa"
+_MONTHLY_K = r"(\d{2,3})\s*k"
+_RUPEES = r"(?:rs\.?|₹|inr)\s*(\d{1,3}(?:,\d{3})*(?:000|500))"
+# Any "3 years", "2+ yrs", "3-5 years" figure; only counted near an experience word.
+# The unit word is found first and the figure read from the text just before
+# it, so digits elsewhere in the description cost nothing.
+_YEAR_UNIT = r"y(?:ears?|rs?)\b"   # no leading \b: it would cost sre its literal prefix scan
+_YEARS_BEFORE = r"(\d{1,2})(?:\s*(?:-|to|–)\s*(\d{1,2}))?\s*(?:\+|plus)?\s*$"
+_YEARS_LOOKBACK = 24
+_EXPERIENCE_WORDS = ("experience", "exp.", "exp ", "minimum", "at least", "required", "requires")
+_EXPERIENCE_WINDOW = 40
+
+# Years at which a posting is banded senior; titled-senior roles are too
+SENIOR_MIN_YEARS = 5
+MID_MIN_YEARS = 2
+# A posting asking for this many years more than the candidate has still fits
+# (the fresher bouncer always let "1 year" through)
+EXPERIENCE_SLACK = 1
+
+# Display string for the discovery API ("12-18 LPA")
+_LPA_TEXT = re.compile(r"(\d+(\.\d+)?\s?-\s?\d+(\.\d+)?\s?LPA)|(\d+\s?LPA)", re.IGNORECASE)
+
+
+def _contained(terms) -> Dict[str, FrozenSet[str]]:
+    """term -> every term it contains, so one match stands for all of them."""
+    return {t: frozenset(o for o in terms if o in t) for t in terms}
+
+
+_DESC_TERMS = [t.lower() for t in INTERN_TERMS + CONTRACT_TERMS + WORK_MODE_TERMS]
+_TITLE_TERMS = [t.lower() for t in SENIOR_TITLE_TERMS + JUNIOR_TITLE_TERMS + INTERN_TERMS + CONTRACT_TERMS + WORK_MODE_TERMS]
+
+# Every keyword rule lives in one alternation per field, so the description is
+# walked once for all of them. The numeric rules (experience, salary) stay as
+# separate patterns: folded into the alternation they cost sre its fast
+# first-character skip, so they only run when their anchor text is present.
+_DESC_SCANNER = re.compile(trie_pattern(_DESC_TERMS))
+_TITLE_SCANNER = re.compile(trie_pattern(_TITLE_TERMS))
+_EXP_RE = re.compile(_STRICT_MIN_EXP)
+_YEAR_UNIT_RE = re.compile(_YEAR_UNIT)
+_YEARS_BEFORE_RE = re.compile(_YEARS_BEFORE)
+_LPA_RE = re.compile(_LPA)
+_K_RE = re.compile(_MONTHLY_K)
+_RS_RE = re.compile(_RUPEES)
+
+_DESC_CONTAINS = _contained(_DESC_TERMS)
+_TITLE_CONTAINS = _contained(_TITLE_TERMS)
+
+_SENIOR = frozenset(SENIOR_TITLE_TERMS)
+_JUNIOR = frozenset(JUNIOR_TITLE_TERMS)
+_INTERN = frozenset(INTERN_TERMS)
+_CONTRACT = frozenset(CONTRACT_TERMS)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+# =============================================================================
+# RESULT
+# =============================================================================
+
+class Classification:
+    """Everything the heuristics derive from one posting, computed in one scan."""
+
+    __slots__ = (
+        "seniority", "experience_match", "experience_min", "experience_max", "job_type", "work_mode",
+        "salary_min", "salary_max", "salary_rule", "salary_text", "location", "location_id",
+        "title_terms", "terms", "words",
+    )
+
+    def __init__(self):
+        self.seniority: Optional[str] = None          # "senior" | "junior" | None
+        self.experience_match: Optional[str] = None   # e.g. "minimum 3 years"
+        self.experience_min: Optional[int] = None     # years asked for, lowest figure
+        self.experience_max: Optional[int] = None     # upper end of a "3-5 years" range, if any
+        self.job_type: JobType = JobType.FULL_TIME
+        self.work_mode: WorkMode = WorkMode.ONSITE
+        self.salary_min: Optional[int] = None
+        self.salary_max: Optional[int] = None
+        self.salary_rule: Optional[str] = None        # "lpa" | "k" | "rupees": which rule read the salary
+        self.salary_text: Optional[str] = None        # first "x-y LPA" as written
+        self.location: Optional[str] = None           # gazetteer display name
+        self.location_id: Optional[str] = None        # gazetteer id, stored as job_listings.location_id
+        self.title_terms: Set[str] = set()
+        self.terms: Set[str] = set()                  # description keywords (substring)
+        self.words: Set[str] = set()                  # description keywords (whole word)
+
+    def is_entry_level(self, experience_years: int = 0) -> bool:
+        """The fresher bouncer: senior titles out, junior titles in, then the strict experience rule."""
+        if experience_years > 0:
+            return True
+        if self.seniority == "senior":
+            return False
+        if self.seniority == "junior":
+            return True
+        return self.experience_match is None
+
+    @property
+    def seniority_band(self) -> str:
+        """"intern" | "entry" | "mid" | "senior", from the title first, then the years asked for."""
+        if self.job_type == JobType.INTERNSHIP:
+            return "intern"
+        if self.seniority == "senior":
+            return "senior"
+        if self.seniority == "junior":
+            return "entry"
+        years = self.experience_min or 0
+        if years >= SENIOR_MIN_YEARS:
+            return "senior"
+        if years >= MID_MIN_YEARS:
+            return "mid"
+        return "entry"
+
+    @property
+    def salary(self) -> Optional[Salary]:
+        """The description salary as an annual INR range, with its period and confidence."""
+        return text_salary(self.salary_min, self.salary_max, self.salary_rule)
+
+    @property
+    def loose_job_type(self) -> JobType:
+        """Substring variant used by the discovery API ("intern" anywhere -> internship)."""
+        if "intern" in self.terms or "intern" in self.title_terms:
+            return JobType.INTERNSHIP
+        if {"contract", "freelance"} & (self.terms | self.title_terms):
+            return JobType.CONTRACT
+        return JobType.FULL_TIME
+
+    @property
+    def loose_work_mode(self) -> WorkMode:
+        """Work mode from the title and description together, as the discovery API reads it."""
+        terms = self.terms | self.title_terms
+        if "remote" in terms:
+            return WorkMode.REMOTE
+        if "hybrid" in terms:
+            return WorkMode.HYBRID
+        return WorkMode.ONSITE
+
+
+# =============================================================================
+# ENGINE
+# =============================================================================
+
+def classify(title: str, description: str, location: str = "") -> Classification:
+    """
+    Seniority, experience asked for, job type, work mode, salary and
+    location for one posting.
+
+    The description is lowercased once and walked once by the keyword
+    alternation; the experience and salary patterns only run when their
+    anchor text ("year", "lpa", "rs") is present. The (short) title gets its
+    own single scan.
+    """
+    result = Classification()
+    title_lower = (title or "").lower()
+    text = (description or "").lower()
+
+    for match in _TITLE_SCANNER.finditer(title_lower):
+        result.title_terms |= _TITLE_CONTAINS[match.group()]
+    if result.title_terms & _SENIOR:
+        result.seniority = "senior"
+    elif result.title_terms & _JUNIOR:
+        result.seniority = "junior"
+
+    for match in _DESC_SCANNER.finditer(text):
+        term = match.group()
+        result.terms |= _DESC_CONTAINS[term]
+        start, end = match.span()
+        if (start == 0 or not _is_word_char(text[start - 1])) and (end == len(text) or not _is_word_char(text[end])):
+            result.words.add(term)
+
+    if "year" in text or "yrs" in text:
+        exp = _EXP_RE.search(text)
+        result.experience_match = exp.group(0) if exp else None
+        result.experience_min, result.experience_max = _experience_years(text)
+
+    # Job type: title substring or whole word in the description; internship wins
+    if result.title_terms & _INTERN or result.words & _INTERN:
+        result.job_type = JobType.INTERNSHIP
+    elif result.title_terms & _CONTRACT or result.words & _CONTRACT:
+        result.job_type = JobType.CONTRACT
+
+    location_lower = (location or "").lower()
+    if "remote" in location_lower or "remote" in result.terms:
+        result.work_mode = WorkMode.REMOTE
+    elif "hybrid" in result.terms:
+        result.work_mode = WorkMode.HYBRID
+
+    # The structured location field wins over places named in the description
+    place = resolve_location(location, description)
+    if place is not None:
+        result.location, result.location_id = place.name, place.id
+
+    lpa = _LPA_RE.search(text) if "lpa" in text else None
+    result.salary_min, result.salary_max, result.salary_rule = _salary(text, lpa)
+    if lpa is not None:
+        # No "x LPA" text can start before the first LPA-rule match
+        text_match = _LPA_TEXT.search(description, lpa.start())
+        result.salary_text = text_match.group(0) if text_match else None
+    return result
+
+
+def _experience_years(text: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Lowest and highest years of experience asked for. Figures count only with
+    an experience word nearby, so "founded 12 years ago" is ignored.
+    """
+    lows, highs = [], []
+    for unit in _YEAR_UNIT_RE.finditer(text):
+        start, end = unit.span()
+        if start and _is_word_char(text[start - 1]):
+            continue
+        match = _YEARS_BEFORE_RE.search(text, max(0, start - _YEARS_LOOKBACK), start)
+        if match is None:
+            continue
+        window = text[max(0, match.start() - _EXPERIENCE_WINDOW):end + _EXPERIENCE_WINDOW]
+        if not any(word in window for word in _EXPERIENCE_WORDS):
+            continue
+        low = int(match.group(1))
+        high = int(match.group(2)) if match.group(2) else None
+        if high is not None and high < low:
+            low, high = high, low
+        lows.append(low)
+        if high is not None:
+            highs.append(high)
+    if not lows:
+        return None, None
+    return min(lows), max(highs) if highs else None
+
+
+def fits_experience(experience_min: Optional[int], seniority_band: Optional[str], experience_years: int) -> bool:
+    """
+    Whether a posting suits someone with `experience_years`: it asks for at
+    most EXPERIENCE_SLACK years more than that, and senior-band roles need at
+    least MID_MIN_YEARS. crud.opportunity applies the same rule in SQL.
+    """
+    if experience_min is not None and experience_min > experience_years + EXPERIENCE_SLACK:
+        return False
+    return not (seniority_band == "senior" and experience_years < MID_MIN_YEARS)
+
+
+def _salary(text: str, lpa) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+    """LPA range first, then monthly 'k' figures, then explicit rupee amounts; also names the rule."""
+    if lpa is not None:
+        low = float(lpa.group(1))
+        high = float(lpa.group(2)) if lpa.group(2) else low
+        return int(low * 100000), int(high * 100000), "lpa"
+    k_values = sorted(int(x) * 1000 for x in _K_RE.findall(text))
+    if k_values:
+        return k_values[0], k_values[-1], "k"
+    if "rs" in text or "₹" in text or "inr" in text:
+        rs_values = sorted(v for v in (int(x.replace(",", "")) for x in _RS_RE.findall(text)) if v > 1000)
+        if rs_values:
+            return rs_values[0], rs_values[-1], "rupees"
+    return None, None, None
+
+
+# =============================================================================
+# BATCH
+# =============================================================================
+
+# Bump when classify() logic changes without a rule or pattern changing;
+# RULES_VERSION then invalidates results memoized under the old rules.
+_RULES_REVISION = 1
+
+# Below this many rows a process pool costs more to start than it saves
+BATCH_POOL_MIN_ROWS = 5000
+BATCH_CHUNK_SIZE = 1000
+
+
+class BatchClassification:
+    """
+    Column-per-field results for a batch: row i of every column belongs to
+    input i. `entry_level` is the fresher bouncer (experience_years=0);
+    searches for experienced roles keep every row.
+    """
+
+    COLUMNS = (
+        "entry_level", "seniority", "experience_match", "experience_min", "experience_max",
+        "seniority_band", "job_type", "work_mode",
+        "loose_job_type", "loose_work_mode", "salary_min", "salary_max",
+        "salary_text", "location", "location_id",
+        "salary_annual_min", "salary_annual_max", "salary_period", "salary_confidence",
+    )
+
+    def __init__(self):
+        for column in self.COLUMNS:
+            setattr(self, column, [])
+
+    def __len__(self) -> int:
+        return len(self.job_type)
+
+    def append(self, facts: Classification) -> None:
+        self.entry_level.append(facts.is_entry_level())
+        self.seniority.append(facts.seniority)
+        self.experience_match.append(facts.experience_match)
+        self.experience_min.append(facts.experience_min)
+        self.experience_max.append(facts.experience_max)
+        self.seniority_band.append(facts.seniority_band)
+        self.job_type.append(facts.job_type)
+        self.work_mode.append(facts.work_mode)
+        self.loose_job_type.append(facts.loose_job_type)
+        self.loose_work_mode.append(facts.loose_work_mode)
+        self.salary_min.append(facts.salary_min)
+        self.salary_max.append(facts.salary_max)
+        self.salary_text.append(facts.salary_text)
+        self.location.append(facts.location)
+        self.location_id.append(facts.location_id)
+        salary = facts.salary
+        self.salary_annual_min.append(salary.annual_min if salary else None)
+        self.salary_annual_max.append(salary.annual_max if salary else None)
+        self.salary_period.append(salary.period if salary else None)
+        self.salary_confidence.append(salary.confidence if salary else None)
+
+    def extend(self, other: "BatchClassification") -> None:
+        for column in self.COLUMNS:
+            getattr(self, column).extend(getattr(other, column))
+
+    def salary(self, i: int) -> Optional[Salary]:
+        """Row i's description salary as a Salary, or None."""
+        if self.salary_annual_min[i] is None:
+            return None
+        return Salary(
+            self.salary_annual_min[i], self.salary_annual_max[i], self.salary_period[i], self.salary_confidence[i]
+        )
+
+    def row(self, i: int) -> list:
+        """Row i in COLUMNS order, JSON-safe (enums as their values)."""
+        values = (getattr(self, column)[i] for column in self.COLUMNS)
+        return [v.value if isinstance(v, Enum) else v for v in values]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[list]) -> "BatchClassification":
+        """Inverse of row(): rebuilds the columns from stored rows."""
+        result = cls()
+        for values in rows:
+            for column, value in zip(cls.COLUMNS, values):
+                enum_type = _ENUM_COLUMNS.get(column)
+                getattr(result, column).append(enum_type(value) if enum_type and value is not None else value)
+        return result
+
+
+_ENUM_COLUMNS = {
+    "job_type": JobType, "work_mode": WorkMode,
+    "loose_job_type": JobType, "loose_work_mode": WorkMode,
+}
+
+
+def _text(value) -> str:
+    # DataFrame columns carry NaN/None for missing cells
+    return value if isinstance(value, str) else ""
+
+
+def _classify_rows(rows: List[Tuple[str, str, str]]) -> BatchClassification:
+    result = BatchClassification()
+    for title, description, location in rows:
+        result.append(classify(title, description, location))
+    return result
+
+
+def classify_batch(
+    titles: Iterable,
+    descriptions: Iterable,
+    locations: Optional[Iterable] = None,
+    workers: int = 0,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> BatchClassification:
+    """
+    Classifies a whole result set, columns in and columns out.
+
+    Takes parallel title / description / location columns (lists or
+    DataFrame Series). With `workers` > 1 and at least BATCH_POOL_MIN_ROWS
+    rows (backfills), chunks of `chunk_size` rows are classified on a
+    process pool; otherwise the batch runs in-process.
+    """
+    titles = [_text(t) for t in titles]
+    descriptions = [_text(d) for d in descriptions]
+    locations = [_text(loc) for loc in locations] if locations is not None else [""] * len(titles)
+    if not len(titles) == len(descriptions) == len(locations):
+        raise ValueError("classify_batch columns must have the same length")
+    rows = list(zip(titles, descriptions, locations))
+
+    if workers <= 1 or len(rows) < BATCH_POOL_MIN_ROWS:
+        return _classify_rows(rows)
+
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    result = BatchClassification()
+    # spawn, not fork: callers run threads and hold DB connections
+    with multiprocessing.get_context("spawn").Pool(processes=workers) as pool:
+        for part in pool.imap(_classify_rows, chunks):
+            result.extend(part)
+    return result
+
+
+RULES_VERSION = hashlib.sha1(repr((
+    _RULES_REVISION, SENIOR_TITLE_TERMS, JUNIOR_TITLE_TERMS, INTERN_TERMS, CONTRACT_TERMS,
+    WORK_MODE_TERMS, tuple(PLACES.values()), _STRICT_MIN_EXP, _LPA, _MONTHLY_K, _RUPEES, _LPA_TEXT.pattern,
+    _YEAR_UNIT, _YEARS_BEFORE, _YEARS_LOOKBACK, _EXPERIENCE_WORDS, _EXPERIENCE_WINDOW, SENIOR_MIN_YEARS, MID_MIN_YEARS, PERIODS, CONFIDENCE_LPA, CONFIDENCE_MONTHLY_K, CONFIDENCE_RUPEES, BatchClassification.COLUMNS,
+)).encode("utf-8")).hexdigest()[:12]
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from collections import defaultdict
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Opportunity
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# URL CANONICALIZATION
+# =============================================================================
+
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "refid", "referrer",
+    "src", "source", "trk", "trkinfo", "trackingid", "tracking_id",
+    "gh_src", "lever-source", "lever-origin",
+}
+
+_LINKEDIN_JOB_RE = re.compile(r"/jobs/view/(?:[^/]*-)?(\d+)")
+_GREENHOUSE_JOB_RE = re.compile(r"/jobs/(\d+)")
+_LEVER_JOB_RE = re.compile(r"^/[^/]+/([0-9a-f-]{36})")
+_ASHBY_JOB_RE = re.compile(r"^/[^/]+/([0-9a-f-]{36})")
+_WORKDAY_JOB_RE = re.compile(r"/job/.*_([A-Za-z0-9-]+)$")
+_ADZUNA_AD_RE = re.compile(r"/(?:land/ad|details)/(\d+)")
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name.startswith("utm_") or name in TRACKING_PARAMS
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduces an apply link to a stable identity string.
+
+    Known ATS and aggregator hosts resolve to `<provider>:<posting id>` so the
+    same posting matches regardless of which board linked to it. Anything else
+    becomes host + path with tracking parameters stripped and the rest sorted.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    params = parse_qsl(parts.query, keep_blank_values=False)
+    query = {k.lower(): v for k, v in params}
+
+    if "greenhouse.io" in host or "gh_jid" in query:
+        if "gh_jid" in query:
+            return f"greenhouse:{query['gh_jid']}"
+        m = _GREENHOUSE_JOB_RE.search(path)
+        if m:
+            return f"greenhouse:{m.group(1)}"
+    if host.endswith("lever.co"):
+        m = _LEVER_JOB_RE.search(path)
+        if m:
+            return f"lever:{m.group(1)}"
+    if host.endswith("ashbyhq.com"):
+        m = _ASHBY_JOB_RE.search(path)
+        if m:
+            return f"ashby:{m.group(1)}"
+    if "myworkdayjobs.com" in host:
+        m = _WORKDAY_JOB_RE.search(path)
+        if m:
+            return f"workday:{host.split('.')[0]}/{m.group(1).lower()}"
+    if "linkedin.com" in host:
+        m = _LINKEDIN_JOB_RE.search(path)
+        if m:
+            return f"linkedin:{m.group(1)}"
+        if "currentjobid" in query:
+            return f"linkedin:{query['currentjobid']}"
+    if "indeed." in host and "jk" in query:
+        return f"indeed:{query['jk']}"
+    if "adzuna." in host:
+        m = _ADZUNA_AD_RE.search(path)
+        if m:
+            return f"adzuna:{m.group(1)}"
+
+    kept = sorted((k, v) for k, v in params if not _is_tracking_param(k))
+    canonical = f"{host}{path}"
+    if kept:
+        canonical += "?" + urlencode(kept)
+    return canonical
+
+
+# =============================================================================
+# SIMHASH
+# =============================================================================
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+COMPANY_SUFFIXES = {
+    "pvt", "private", "ltd", "limited", "llp", "llc", "inc", "corp", "corporation",
+    "co", "company", "india", "the",
+}
+DESCRIPTION_TOKENS = 80   # Adzuna only returns a snippet, so compare the opening
+NEAR_DUPLICATE_DISTANCE = 3
+_BANDS = 4                # 4 x 16-bit bands: distance <= 3 shares at least one band
+_BAND_BITS = 64 // _BANDS
+_MASK64 = (1 << 64) - 1
+
+
+def _tokens(value: str) -> List[str]:
+    return _TOKEN_RE.findall((value or "").lower())
+
+
+def normalize_company(name: str) -> str:
+    return " ".join(t for t in _tokens(name) if t not in COMPANY_SUFFIXES)
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(features: Iterable[Tuple[str, int]]) -> int:
+    """64-bit SimHash over weighted string features."""
+    weights = [0] * 64
+    for feature, weight in features:
+        h = _feature_hash(feature)
+        for bit in range(64):
+            weights[bit] += weight if (h >> bit) & 1 else -weight
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def simhash_posting(company: str, title: str, description: str) -> int:
+    """SimHash of the normalized company, title and opening of the description."""
+    company_key = normalize_company(company)
+    title_tokens = _tokens(title)
+    desc_tokens = _tokens(description)[:DESCRIPTION_TOKENS]
+
+    features: List[Tuple[str, int]] = [(f"c:{company_key}", 8), (f"t:{' '.join(title_tokens)}", 8)]
+    features += [(f"tw:{t}", 2) for t in title_tokens]
+    features += [
+        (f"d:{' '.join(desc_tokens[i:i + 3])}", 1)
+        for i in range(max(1, len(desc_tokens) - 2))
+    ]
+    return simhash(features)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK64).count("1")
+
+
+def to_signed64(value: int) -> int:
+    """Maps an unsigned 64-bit hash onto Postgres BIGINT."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def from_signed64(value: int) -> int:
+    return value & _MASK64
+
+
+# =============================================================================
+# LSH INDEX
+# =============================================================================
+
+class FingerprintIndex:
+    """
+    Lookup table over listing fingerprints.
+
+    Exact canonical-link matches win; otherwise the SimHash is split into bands
+    and only listings sharing a band are compared by Hamming distance.
+    `ref` is whatever the caller uses to find the listing again (an id or a
+    pending ORM object).
+    """
+
+    def __init__(self, max_distance: int = NEAR_DUPLICATE_DISTANCE) -> None:
+        self.max_distance = max_distance
+        self._by_link: Dict[str, Any] = {}
+        self._bands: Dict[Tuple[int, int], List[Tuple[int, Any]]] = defaultdict(list)
+        self._pending: Dict[Any, Tuple[str, Optional[int]]] = {}   # added, not yet seen stored
+        self._loaded = False
+        self._lock = Lock()
+
+    @staticmethod
+    def _band_keys(value: int) -> List[Tuple[int, int]]:
+        mask = (1 << _BAND_BITS) - 1
+        return [(i, (value >> (i * _BAND_BITS)) & mask) for i in range(_BANDS)]
+
+    def _insert(self, ref: Any, canonical_link: str, fingerprint: Optional[int]) -> None:
+        if canonical_link:
+            self._by_link.setdefault(canonical_link, ref)
+        if fingerprint is not None:
+            for key in self._band_keys(fingerprint):
+                self._bands[key].append((fingerprint, ref))
+
+    def add(self, ref: Any, canonical_link: str, fingerprint: Optional[int]) -> None:
+        """Indexes a listing queued for insert; it stays pending until a reload sees it."""
+        with self._lock:
+            self._insert(ref, canonical_link, fingerprint)
+            self._pending[ref] = (canonical_link, fingerprint)
+
+    def discard(self, ref: Any, canonical_link: str, fingerprint: Optional[int]) -> None:
+        """Drops what `add` recorded for `ref` (its insert was rolled back)."""
+        with self._lock:
+            self._pending.pop(ref, None)
+            if canonical_link and self._by_link.get(canonical_link) == ref:
+                del self._by_link[canonical_link]
+            if fingerprint is not None:
+                for key in self._band_keys(fingerprint):
+                    if key in self._bands:
+                        self._bands[key] = [entry for entry in self._bands[key] if entry[1] != ref]
+
+    def match(self, canonical_link: str, fingerprint: Optional[int]) -> Optional[Any]:
+        with self._lock:
+            if canonical_link and canonical_link in self._by_link:
+                return self._by_link[canonical_link]
+            if fingerprint is None:
+                return None
+            best, best_distance = None, self.max_distance + 1
+            for key in self._band_keys(fingerprint):
+                for other, ref in self._bands.get(key, ()):
+                    distance = hamming(fingerprint, other)
+                    if distance < best_distance:
+                        best, best_distance = ref, distance
+            return best
+
+    def load(self, db: Session) -> int:
+        """(Re)indexes every stored listing that has a fingerprint, keyed by id."""
+        fresh = FingerprintIndex(self.max_distance)
+        stmt = select(Opportunity.id, Opportunity.canonical_link, Opportunity.simhash).execution_options(yield_per=5000)
+        count, stored = 0, set()
+        for op_id, canonical_link, fingerprint in db.execute(stmt):
+            stored.add(op_id)
+            if canonical_link or fingerprint is not None:
+                fresh._insert(op_id, canonical_link or "", None if fingerprint is None else from_signed64(fingerprint))
+                count += 1
+        with self._lock:
+            # Listings other threads added but have not committed yet stay indexed
+            self._pending = {ref: entry for ref, entry in self._pending.items() if ref not in stored}
+            for ref, (canonical_link, fingerprint) in self._pending.items():
+                fresh._insert(ref, canonical_link, fingerprint)
+            self._by_link, self._bands = fresh._by_link, fresh._bands
+            self._loaded = True
+        logger.info(f"🧬 Fingerprint index loaded: {count} listings")
+        return count
+
+    def ensure_loaded(self, db: Session) -> None:
+        if not self._loaded:
+            self.load(db)
+
+
+# =============================================================================
+# MERGING
+# =============================================================================
+
+def _source_entry(op: Opportunity) -> dict:
+    meta = op.source_metadata or {}
+    return {
+        "origin": meta.get("origin"),
+        "site": meta.get("site"),
+        "apply_link": op.apply_link,
+        "source": op.source.value if op.source else None,
+    }
+
+
+def merge_sources(existing: Opportunity, incoming: Opportunity) -> bool:
+    """
+    Folds a near-duplicate into an existing listing.
+
+    The incoming link is appended to `source_metadata["sources"]`, missing
+    salary data is filled in and skill ids are unioned. Returns False if the
+    link was already recorded. The normalized annual salary is taken from
+    whichever source reports it with more confidence.
+    """
+    meta = dict(existing.source_metadata or {})
+    sources = list(meta.get("sources") or [_source_entry(existing)])
+    if any(s.get("apply_link") == incoming.apply_link for s in sources):
+        return False
+
+    sources.append(_source_entry(incoming))
+    meta["sources"] = sources
+    existing.source_metadata = meta  # reassign so the JSONB change is tracked
+
+    if existing.salary_min is None and incoming.salary_min is not None:
+        existing.salary_min = incoming.salary_min
+        existing.salary_max = incoming.salary_max
+    if incoming.salary_annual_max is not None and (incoming.salary_confidence or 0) > (existing.salary_confidence or 0):
+        existing.salary_annual_min = incoming.salary_annual_min
+        existing.salary_annual_max = incoming.salary_annual_max
+        existing.salary_period = incoming.salary_period
+        existing.salary_confidence = incoming.salary_confidence
+    if incoming.skill_ids:
+        existing.skill_ids = sorted(set(existing.skill_ids or ()) | set(incoming.skill_ids))
+    return True
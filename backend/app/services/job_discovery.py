@@ -11,6 +11,11 @@ from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.crud import opportunity as opportunity_crud
+from app.crud import scan_result as scan_crud
+from app.services.classifier import classify_batch
+from app.services.query_keys import scan_key
+from app.services.salary import CONFIDENCE_ASSUMED, CONFIDENCE_PREDICTED, normalize_salary, parse_salary_floor
+from app.services.skills import resolve_skill_ids, skill_vector
 
 logger = logging.getLogger(__name__)
 
@@ -46,13 +51,17 @@ def _check_rate_limit(identifier: str) -> bool:
         _RATE_LIMIT_STORE[key] = now
         return True
 
+# Scan results are reused for this long before the same query hits Adzuna again
+SCAN_CACHE_TTL = int(os.getenv("DISCOVER_CACHE_TTL", "1800"))
+
 # =============================================================================
-# NLP PROCESSOR (Preserved)
+# TEXT CLEANUP
 # =============================================================================
 
 class NLPProcessor:
     """
-    A lightweight rule-based NLP processor to clean and structure job data.
+    Whitespace cleanup for listing text. Location, salary, job type and work
+    mode come from the compiled classifier in app.services.classifier.
     """
     @staticmethod
     def clean_text(text: str) -> str:
@@ -60,40 +69,6 @@ class NLPProcessor:
             return ""
         return text.strip().replace("\n", " ").replace("  ", " ")
 
-    @staticmethod
-    def extract_location(snippet: str, default: str) -> str:
-        cities = ["Bangalore", "Bengaluru", "Mumbai", "Delhi", "Hyderabad", "Pune", "Chennai", "Gurgaon", "Noida", "Remote"]
-        for city in cities:
-            if city.lower() in snippet.lower():
-                return city
-        return default
-
-    @staticmethod
-    def extract_salary(snippet: str) -> str:
-        import re
-        match = re.search(r'(\d+(\.\d+)?\s?-\s?\d+(\.\d+)?\s?LPA)|(\d+\s?LPA)', snippet, re.IGNORECASE)
-        if match:
-            return match.group(0)
-        return "Not Disclosed"
-
-    @staticmethod
-    def extract_job_type(snippet: str) -> models.JobType:
-        snippet_lower = snippet.lower()
-        if "intern" in snippet_lower:
-            return models.JobType.INTERNSHIP
-        if "contract" in snippet_lower or "freelance" in snippet_lower:
-            return models.JobType.CONTRACT
-        return models.JobType.FULL_TIME
-
-    @staticmethod
-    def extract_work_mode(snippet: str) -> models.WorkMode:
-        snippet_lower = snippet.lower()
-        if "remote" in snippet_lower:
-            return models.WorkMode.REMOTE
-        if "hybrid" in snippet_lower:
-            return models.WorkMode.HYBRID
-        return models.WorkMode.ONSITE
-
 
 # =============================================================================
 # ADZUNA API FETCHER
@@ -101,12 +76,16 @@ class NLPProcessor:
 
 _nlp = NLPProcessor()
 
-def _fetch_adzuna_jobs(query: str, location: str = "India", limit: int = 10) -> List[dict]:
+def _fetch_adzuna_jobs(
+    query: str, location: str = "India", limit: int = 10, salary_min: Optional[int] = None
+) -> List[dict]:
     """
     Calls Adzuna API and returns a normalized list of job dicts.
     
     Each dict has: role, company, link, snippet, source,
-                   extracted_location, extracted_type, extracted_mode, extracted_salary
+                   extracted_location, location_id, extracted_type, extracted_mode, extracted_salary,
+                   salary (app.services.salary.Salary or None),
+                   experience_min_years, experience_max_years, seniority_band
     """
     if not ADZUNA_APP_ID or not ADZUNA_APP_KEY:
         logger.error("❌ Adzuna credentials not configured (ADZUNA_APP_ID / ADZUNA_APP_KEY)")
@@ -120,6 +99,8 @@ def _fetch_adzuna_jobs(query: str, location: str = "India", limit: int = 10) ->
         "where": location,
         "content-type": "application/json",
     }
+    if salary_min:
+        params["salary_min"] = salary_min
 
     logger.info(f"🌍 Fetching Adzuna: '{query}' in {location}")
 
@@ -131,29 +112,31 @@ def _fetch_adzuna_jobs(query: str, location: str = "India", limit: int = 10) ->
             return []
 
         data = response.json()
-        results = data.get("results", [])
+        results = [job for job in data.get("results", []) if job.get("redirect_url")]
+        titles = [job.get("title", "Unknown Role") for job in results]
+        descriptions = [job.get("description", "") for job in results]
+        locs = [job.get("location", {}).get("display_name", location) for job in results]
+        facts = classify_batch(titles, descriptions, locs)
 
         normalized = []
-        for job in results:
-            redirect_url = job.get("redirect_url")
-            if not redirect_url:
-                continue
-
-            description = job.get("description", "")
-            title = job.get("title", "Unknown Role")
-            company = job.get("company", {}).get("display_name", "Unknown")
-            loc = job.get("location", {}).get("display_name", location)
-
+        for i, job in enumerate(results):
+            loc = locs[i]
             normalized.append({
-                "role": title,
-                "company": company,
-                "link": redirect_url,
-                "snippet": _nlp.clean_text(description),
+                "role": titles[i],
+                "company": job.get("company", {}).get("display_name", "Unknown"),
+                "link": job["redirect_url"],
+                "snippet": _nlp.clean_text(descriptions[i]),
                 "source": "Adzuna",
-                "extracted_location": _nlp.extract_location(description, loc),
-                "extracted_salary": _nlp.extract_salary(description),
-                "extracted_type": _nlp.extract_job_type(f"{title} {description}"),
-                "extracted_mode": _nlp.extract_work_mode(f"{title} {description}"),
+                "extracted_location": facts.location[i] or loc,
+                "location_id": facts.location_id[i],
+                "extracted_salary": facts.salary_text[i] or "Not Disclosed",
+                "extracted_type": facts.loose_job_type[i],
+                "extracted_mode": facts.loose_work_mode[i],
+                "skill_ids": skill_vector(titles[i], descriptions[i]),
+                "salary": _adzuna_salary(job) or facts.salary(i),
+                "experience_min_years": facts.experience_min[i],
+                "experience_max_years": facts.experience_max[i],
+                "seniority_band": facts.seniority_band[i],
             })
 
         logger.info(f"📊 Adzuna returned {len(normalized)} jobs")
@@ -167,6 +150,36 @@ def _fetch_adzuna_jobs(query: str, location: str = "India", limit: int = 10) ->
         return []
 
 
+def _adzuna_salary(job: dict):
+    """Adzuna's India endpoint reports annual INR; predicted figures are its own estimates."""
+    predicted = str(job.get("salary_is_predicted", "0")) == "1"
+    return normalize_salary(
+        job.get("salary_min"), job.get("salary_max"), "year",
+        confidence=CONFIDENCE_PREDICTED if predicted else CONFIDENCE_ASSUMED,
+    )
+
+
+def _salary_fields(salary) -> dict:
+    if salary is None:
+        return {}
+    return {
+        "salary_annual_min": salary.annual_min,
+        "salary_annual_max": salary.annual_max,
+        "salary_period": salary.period,
+        "salary_confidence": salary.confidence,
+    }
+
+
+def _db_fallback(
+    db: Session, skills: List[str], location: Optional[str], limit: int, salary_min: Optional[int] = None
+) -> List[models.Opportunity]:
+    """Stored listings for the skills: skill-id overlap when they are in the taxonomy, else title search."""
+    ids, _ = resolve_skill_ids(skills)
+    if ids:
+        return opportunity_crud.match_opportunities(db, ids, location, limit=limit, salary_min=salary_min)
+    return opportunity_crud.search_opportunities(db, skills[:3], location, limit=limit, salary_min=salary_min)
+
+
 # =============================================================================
 # MAIN ENTRY POINT
 # =============================================================================
@@ -181,8 +194,12 @@ def discover_jobs(
 ) -> List[models.Opportunity]:
     """
     Discover jobs based on skills, location, and salary.
-    Uses Adzuna API with per-user rate limiting.
-    Falls back to existing DB results when rate-limited.
+
+    Scans are cached per normalized (skills, location, salary_min) query for
+    SCAN_CACHE_TTL seconds: a repeat request is answered from the listing ids
+    the last scan produced, without calling Adzuna. Uses Adzuna API with
+    per-user rate limiting; rate-limited requests get the last (possibly
+    expired) scan for the query, or DB listings matching the skills.
     """
     # Construct a smart query
     query_parts = skills[:3]
@@ -190,23 +207,41 @@ def discover_jobs(
         query_parts.append(location)
 
     query = " ".join(query_parts)
+    cache_key = scan_key(skills[:3], location, salary_min)
+    # "12 LPA" / "1200000" -> annual INR, applied to Adzuna and the DB fallback
+    salary_floor = parse_salary_floor(salary_min)
+
+    cached = scan_crud.get_scan(db, cache_key)
+    if cached is not None:
+        logger.info(f"📦 Scan cache hit for '{query}' ({len(cached.result_ids)} listings)")
+        return scan_crud.get_opportunities_by_ids(db, cached.result_ids, limit=limit)
 
     # Rate limit check (keyed on identifier + query)
     rate_key = f"{identifier or 'global'}:{query}"
     if not _check_rate_limit(rate_key):
-        logger.info("📦 Rate limited — returning existing DB results as fallback")
-        existing_opps, _ = opportunity_crud.list_opportunities(db, limit=limit)
-        return existing_opps
+        stale = scan_crud.get_scan(db, cache_key, include_expired=True)
+        if stale is not None:
+            logger.info("📦 Rate limited — returning the last scan for this query")
+            return scan_crud.get_opportunities_by_ids(db, stale.result_ids, limit=limit)
+        logger.info("📦 Rate limited — returning matching DB results as fallback")
+        return _db_fallback(db, skills, location, limit, salary_floor)
 
     logger.info(f"Agent searching for jobs with query: {query}")
-    raw_jobs = _fetch_adzuna_jobs(query, location=location or "India", limit=limit)
+    raw_jobs = _fetch_adzuna_jobs(query, location=location or "India", limit=limit, salary_min=salary_floor)
 
+    # Resolve duplicates for the whole result page in a single round-trip
+    existing_ids = opportunity_crud.get_existing_links(db, [job["link"] for job in raw_jobs])
+    known_links = set(existing_ids)
+
+    # Listing ids in Adzuna's order: already-known ones are part of the scan result too
+    result_ids = []
     saved_opportunities = []
     for job in raw_jobs:
-        # Check if link already exists to avoid duplicates
-        existing = opportunity_crud.get_opportunity_by_link(db, job["link"])
-        if existing:
+        if job["link"] in known_links:
+            if job["link"] in existing_ids:
+                result_ids.append(existing_ids.pop(job["link"]))
             continue
+        known_links.add(job["link"])
 
         # Source is always Adzuna now
         source_enum = models.OpportunitySource.OTHER
@@ -224,6 +259,12 @@ def discover_jobs(
             apply_link=job["link"],
             source=source_enum,
             status=models.OpportunityStatus.OPEN,
+            skill_ids=job.get("skill_ids"),
+            location_id=job.get("location_id"),
+            **_salary_fields(job.get("salary")),
+            experience_min_years=job.get("experience_min_years"),
+            experience_max_years=job.get("experience_max_years"),
+            seniority_band=job.get("seniority_band"),
             source_metadata={
                 "snippet": job["snippet"],
                 "origin": "adzuna_discover",
@@ -235,7 +276,17 @@ def discover_jobs(
         try:
             new_op = opportunity_crud.create_opportunity(db, opportunity_in)
             saved_opportunities.append(new_op)
+            result_ids.append(new_op.id)
         except Exception as e:
             logger.error(f"Failed to save opportunity: {e}")
 
-    return saved_opportunities
+    if raw_jobs:
+        # An empty page usually means an API failure; don't cache it
+        scan_crud.record_scan(
+            db, cache_key, query,
+            {"skills": skills[:3], "location": location, "salary_min": salary_min},
+            result_ids, SCAN_CACHE_TTL,
+        )
+
+    logger.info(f"💾 Saved {len(saved_opportunities)} new listings; scan matched {len(result_ids)}")
+    return scan_crud.get_opportunities_by_ids(db, result_ids, limit=limit)
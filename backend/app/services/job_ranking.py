@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+from scipy.sparse import vstack
+
+from app.services.skills import SKILLS
+from app.services.text_vectors import hashed_vectors, missing_terms, term_vector
+
+# =============================================================================
+# JOB VECTORS
+# =============================================================================
+#
+# A job's text is its title, the names of its taxonomy skills and the
+# description the agent kept in source_metadata (Adzuna and JobSpy listings
+# have one; portal listings may not). Hashed rows are cached per listing and reused until
+# the listing's updated_at changes; HASHER is stateless, so a cached row stays
+# valid across restarts of the vectorizer and never needs refitting.
+
+JOB_VECTOR_CACHE_SIZE = int(os.getenv("JOB_VECTOR_CACHE_SIZE", "20000"))
+
+# JD terms checked against the resume for each ranked job
+RANK_KEYWORD_LIMIT = 10
+
+
+def job_text(opportunity) -> str:
+    """The text a listing is scored on: role title, skill names and stored description."""
+    names = [SKILLS[i].name for i in opportunity.skill_ids or () if i in SKILLS]
+    meta = opportunity.source_metadata or {}
+    # Listings stored by the backend's Adzuna discovery only carry a snippet
+    description = meta.get("description") or meta.get("snippet") or ""
+    return " ".join([opportunity.role_title or ""] + names + [description]).strip()
+
+
+class JobVectors:
+    """Thread-safe LRU of listing id -> (updated_at, hashed row)."""
+
+    def __init__(self, size: int = JOB_VECTOR_CACHE_SIZE):
+        self.size = size
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def matrix(self, opportunities: Sequence):
+        """One CSR row per listing, in order; uncached listings are hashed in a single batch."""
+        rows, stale = [None] * len(opportunities), []
+        with self._lock:
+            for i, op in enumerate(opportunities):
+                cached = self._rows.get(op.id)
+                if cached is not None and cached[0] == op.updated_at:
+                    self._rows.move_to_end(op.id)
+                    rows[i] = cached[1]
+                else:
+                    stale.append(i)
+
+        if stale:
+            fresh = hashed_vectors(job_text(opportunities[i]) for i in stale)
+            with self._lock:
+                for row, i in enumerate(stale):
+                    rows[i] = fresh[row]
+                    self._rows[opportunities[i].id] = (opportunities[i].updated_at, rows[i])
+                    self._rows.move_to_end(opportunities[i].id)
+                while len(self._rows) > self.size:
+                    self._rows.popitem(last=False)
+        return vstack(rows, format="csr")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+
+
+JOB_VECTORS = JobVectors()
+
+
+# =============================================================================
+# RANKING
+# =============================================================================
+
+class RankedJob(NamedTuple):
+    opportunity: object
+    score: float
+    missing_keywords: List[str]
+
+
+def rank_jobs(resume_text: str, opportunities: Sequence, limit: int, vectors: JobVectors = JOB_VECTORS) -> List[RankedJob]:
+    """
+    The `limit` listings closest to the resume: cosine similarity of hashed
+    vectors from one sparse matrix-vector product over all candidates.
+    Missing keywords are only worked out for the listings returned.
+    """
+    if not resume_text or not opportunities or limit <= 0:
+        return []
+    scores = vectors.matrix(opportunities).dot(hashed_vectors([resume_text]).T).toarray().ravel()
+    # Stable sort: equal scores keep the candidates' (newest-first) order
+    top = np.argsort(-scores, kind="stable")[:limit]
+
+    resume_vec = term_vector(resume_text)
+    ranked = []
+    for i in top:
+        op = opportunities[i]
+        missing = missing_terms(resume_vec, term_vector(job_text(op)), RANK_KEYWORD_LIMIT)
+        ranked.append(RankedJob(op, round(float(scores[i]) * 100, 2), missing))
+    return ranked
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from threading import Lock
+from typing import Iterable, List, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crud import opportunity as opportunity_crud
+from app.models import Opportunity
+
+logger = logging.getLogger(__name__)
+
+
+def _link_hash(link: str) -> int:
+    """64-bit fingerprint of an apply link (collisions are resolved by the DB)."""
+    digest = hashlib.blake2b(link.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class LinkIndex:
+    """
+    Two-step apply_link dedupe for ingestion.
+
+    1. Candidate links are checked against an in-memory set holding a hash of
+       every known apply_link, loaded once when the agent starts. A miss means
+       the link is new and costs no round-trip.
+    2. Possible hits are confirmed in bulk with one `apply_link = ANY(:links)`
+       query per batch (see `prefetch`).
+
+    Links saved during the run are tracked exactly until a reload sees them
+    stored, so unflushed rows are never re-inserted.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: Set[int] = set()
+        self._existing: Set[str] = set()   # confirmed present in the DB
+        self._resolved: Set[str] = set()   # hash hits already checked against the DB
+        self._pending: Set[str] = set()    # added during this run
+        self._loaded = False
+        self._lock = Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self, db: Session) -> int:
+        """(Re)loads the hash set from every apply_link in job_listings."""
+        stmt = select(Opportunity.apply_link).execution_options(yield_per=5000)
+        hashes = {_link_hash(link) for link in db.execute(stmt).scalars() if link}
+        with self._lock:
+            # Pending links whose hash was loaded have landed; the rest belong
+            # to writes still in flight on other threads and stay pending
+            self._pending = {l for l in self._pending if _link_hash(l) not in hashes}
+            hashes.update(_link_hash(l) for l in self._pending)
+            self._hashes = hashes
+            self._existing.clear()
+            self._resolved.clear()
+            self._loaded = True
+        logger.info(f"🔗 Link index loaded: {len(hashes)} known links")
+        return len(hashes)
+
+    def ensure_loaded(self, db: Session) -> None:
+        if not self._loaded:
+            self.load(db)
+
+    def prefetch(self, db: Session, links: Iterable[str]) -> List[str]:
+        """
+        Resolves a batch of candidate links and returns the ones that are new.
+
+        Only links whose hash is already in the index hit the database, and they
+        do so in a single query.
+        """
+        self.ensure_loaded(db)
+        candidates = list(dict.fromkeys(l for l in links if l))
+
+        with self._lock:
+            to_check = [
+                l for l in candidates
+                if l not in self._pending
+                and l not in self._resolved
+                and _link_hash(l) in self._hashes
+            ]
+
+        found = set(opportunity_crud.get_existing_links(db, to_check)) if to_check else set()
+
+        with self._lock:
+            self._resolved.update(to_check)
+            self._existing.update(found)
+            return [
+                l for l in candidates
+                if l not in self._existing and l not in self._pending
+            ]
+
+    def is_known(self, db: Session, link: str) -> bool:
+        """True if the link is already stored or was added earlier in this run."""
+        with self._lock:
+            if link in self._pending or link in self._existing:
+                return True
+            needs_check = link not in self._resolved and _link_hash(link) in self._hashes
+        if needs_check:
+            # Caller skipped `prefetch`; fall back to resolving this link alone.
+            self.prefetch(db, [link])
+            with self._lock:
+                return link in self._existing
+        return False
+
+    def add(self, link: str) -> None:
+        """Records a link that was just queued for insert."""
+        if not link:
+            return
+        with self._lock:
+            self._pending.add(link)
+            self._hashes.add(_link_hash(link))
+
+    def discard(self, link: str) -> None:
+        """Forgets a link added with `add` whose insert was rolled back."""
+        with self._lock:
+            self._pending.discard(link)
+            # Its hash may stay: a stale hash hit only costs a DB check
+            self._resolved.discard(link)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from app.services.patterns import trie_pattern
+
+# =============================================================================
+# GAZETTEER
+# =============================================================================
+#
+# One entry per place: (id, display name, kind, parent id, aliases).
+# Ids are stored in job_listings.location_id, so never rename one; add new
+# places instead. Aliases cover old names and common spellings.
+
+_GAZETTEER: List[Tuple[str, str, str, Optional[str], Tuple[str, ...]]] = [
+    ("remote", "Remote", "remote", None, ("work from home", "wfh", "anywhere", "remote-first", "fully remote")),
+    ("india", "India", "country", None, ("bharat",)),
+    # States and union territories with hiring hubs
+    ("karnataka", "Karnataka", "state", "india", ()),
+    ("maharashtra", "Maharashtra", "state", "india", ()),
+    ("telangana", "Telangana", "state", "india", ()),
+    ("tamil-nadu", "Tamil Nadu", "state", "india", ()),
+    ("haryana", "Haryana", "state", "india", ()),
+    ("uttar-pradesh", "Uttar Pradesh", "state", "india", ()),
+    ("west-bengal", "West Bengal", "state", "india", ()),
+    ("gujarat", "Gujarat", "state", "india", ()),
+    ("kerala", "Kerala", "state", "india", ()),
+    ("rajasthan", "Rajasthan", "state", "india", ()),
+    ("madhya-pradesh", "Madhya Pradesh", "state", "india", ()),
+    ("andhra-pradesh", "Andhra Pradesh", "state", "india", ()),
+    ("odisha", "Odisha", "state", "india", ("orissa",)),
+    ("delhi-ncr", "Delhi NCR", "state", "india", ("ncr", "delhi ncr", "national capital region")),
+    # Cities
+    ("bengaluru", "Bengaluru", "city", "karnataka", ("bangalore", "banglore", "blr")),
+    ("mysuru", "Mysuru", "city", "karnataka", ("mysore",)),
+    ("mumbai", "Mumbai", "city", "maharashtra", ("bombay", "navi mumbai", "thane")),
+    ("pune", "Pune", "city", "maharashtra", ()),
+    ("nagpur", "Nagpur", "city", "maharashtra", ()),
+    ("hyderabad", "Hyderabad", "city", "telangana", ("secunderabad", "hitech city")),
+    ("chennai", "Chennai", "city", "tamil-nadu", ("madras",)),
+    ("coimbatore", "Coimbatore", "city", "tamil-nadu", ()),
+    ("delhi", "Delhi", "city", "delhi-ncr", ("new delhi",)),
+    ("gurugram", "Gurugram", "city", "delhi-ncr", ("gurgaon",)),
+    ("noida", "Noida", "city", "delhi-ncr", ("greater noida",)),
+    ("kolkata", "Kolkata", "city", "west-bengal", ("calcutta",)),
+    ("ahmedabad", "Ahmedabad", "city", "gujarat", ("gandhinagar",)),
+    ("vadodara", "Vadodara", "city", "gujarat", ("baroda",)),
+    ("kochi", "Kochi", "city", "kerala", ("cochin",)),
+    ("thiruvananthapuram", "Thiruvananthapuram", "city", "kerala", ("trivandrum",)),
+    ("jaipur", "Jaipur", "city", "rajasthan", ()),
+    ("indore", "Indore", "city", "madhya-pradesh", ()),
+    ("visakhapatnam", "Visakhapatnam", "city", "andhra-pradesh", ("vizag",)),
+    ("bhubaneswar", "Bhubaneswar", "city", "odisha", ()),
+    ("chandigarh", "Chandigarh", "city", "india", ("mohali",)),
+    ("lucknow", "Lucknow", "city", "uttar-pradesh", ()),
+]
+
+# Most specific first: a listing in "Bengaluru, Karnataka, India" is in Bengaluru
+_KIND_RANK = {"city": 0, "remote": 1, "state": 2, "country": 3}
+
+
+class Place(NamedTuple):
+    id: str
+    name: str
+    kind: str
+    parent: Optional[str]
+    aliases: Tuple[str, ...]
+
+
+PLACES: Dict[str, Place] = {entry[0]: Place(*entry) for entry in _GAZETTEER}
+
+_NAMES: Dict[str, Place] = {}
+for _place in PLACES.values():
+    for _name in (_place.name, _place.id.replace("-", " ")) + _place.aliases:
+        _NAMES[_name.lower()] = _place
+
+_CHILDREN: Dict[str, List[str]] = {}
+for _place in PLACES.values():
+    if _place.parent:
+        _CHILDREN.setdefault(_place.parent, []).append(_place.id)
+
+# Matched against lowercased text: IGNORECASE would make sre twice as slow here
+_SCANNER = re.compile(r"(?<!\w)(?:" + trie_pattern(_NAMES).replace(r"\ ", r"\s+") + r")(?!\w)")
+
+
+# =============================================================================
+# LOOKUPS
+# =============================================================================
+
+def find_places(text: str) -> List[Place]:
+    """Every gazetteer place named in `text`, in order of appearance."""
+    return [_NAMES[" ".join(m.group().split())] for m in _SCANNER.finditer((text or "").lower())]
+
+
+def resolve_location(*texts: str) -> Optional[Place]:
+    """
+    The most specific place named in the first text that names one
+    (city, then remote, then state, then country), e.g. a structured location
+    field followed by the description as a fallback.
+    """
+    for text in texts:
+        places = find_places(text)
+        if places:
+            return min(places, key=lambda p: _KIND_RANK[p.kind])
+    return None
+
+
+def location_id(*texts: str) -> Optional[str]:
+    place = resolve_location(*texts)
+    return place.id if place else None
+
+
+def within(place_id: str) -> List[str]:
+    """`place_id` and every place under it (india -> all states and cities)."""
+    ids, stack = [], [place_id]
+    while stack:
+        current = stack.pop()
+        ids.append(current)
+        stack.extend(_CHILDREN.get(current, ()))
+    return ids
+
+
+def in_country(place: Place, country_id: str = "india") -> bool:
+    current: Optional[Place] = place
+    while current is not None:
+        if current.id == country_id:
+            return True
+        current = PLACES.get(current.parent) if current.parent else None
+    return False
+
+
+def mentions_india_or_remote(*texts: str) -> bool:
+    """True if any text names a place in India, or remote work."""
+    return any(p.kind == "remote" or in_country(p) for text in texts for p in find_places(text))
+
+
+def normalize_location(name: str) -> Optional[str]:
+    """Display name for a user-entered location: gazetteer name if known, else title-cased."""
+    cleaned = " ".join((name or "").split())
+    if not cleaned:
+        return None
+    place = _NAMES.get(cleaned.lower()) or resolve_location(cleaned)
+    return place.name if place else cleaned.title()
+
+
+def resolve_location_ids(names: Iterable[str]) -> Set[str]:
+    """Gazetteer ids (with everything under them) for user-entered location names."""
+    ids: Set[str] = set()
+    for name in names:
+        place = resolve_location(name)
+        if place:
+            ids.update(within(place.id))
+    return ids
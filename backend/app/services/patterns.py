@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List
+
+
+def trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Regex alternation with the terms folded into a prefix trie
+    ("intern(?:ship)?|..."), so at each position sre follows one branch per
+    character instead of trying every term in turn. Longer terms still win
+    at the same position.
+    """
+    branches: Dict[str, List[str]] = {}
+    for term in set(terms):
+        if term:
+            branches.setdefault(term[0], []).append(term[1:])
+    parts = []
+    for head in sorted(branches):
+        rests = branches[head]
+        tails = [r for r in rests if r]
+        if not tails:
+            parts.append(re.escape(head))
+        else:
+            optional = "?" if "" in rests else ""
+            parts.append(f"{re.escape(head)}(?:{trie_pattern(tails)}){optional}")
+    return "|".join(parts)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+# =============================================================================
+# PDF PROCESS POOL
+# =============================================================================
+#
+# PdfReader is pure Python and CPU-bound: run on the event loop it stalls
+# every other request while one PDF parses. Upload endpoints hand the work
+# to a small process pool instead and await the result. Admission is
+# bounded: once PDF_WORKERS jobs are running and PDF_QUEUE_LIMIT more are
+# waiting, new jobs are refused (PdfPoolBusy -> 503) rather than queued
+# without limit.
+
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+PDF_QUEUE_LIMIT = int(os.getenv("PDF_QUEUE_LIMIT", "16"))
+PDF_JOB_TIMEOUT = float(os.getenv("PDF_JOB_TIMEOUT", "30"))
+
+
+class PdfPoolBusy(Exception):
+    """Every worker is busy and the wait queue is full."""
+
+
+class PdfPool:
+    """
+    Bounded ProcessPoolExecutor for async callers. A job counts against the
+    queue depth until its process finishes it, so a job that timed out but
+    is still running keeps its slot.
+    """
+
+    def __init__(self, workers: int = PDF_WORKERS, queue_limit: int = PDF_QUEUE_LIMIT, timeout: float = PDF_JOB_TIMEOUT):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._generation = 0   # bumped when a broken executor is replaced
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _replace(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Swaps in a fresh executor for `broken` and forgets its jobs, which all
+        failed with it. Caller holds the lock; a no-op if already replaced.
+        """
+        if self._executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._generation += 1
+        self._pending = 0
+
+    def _release(self, generation: int, _future) -> None:
+        with self._lock:
+            # Jobs of a replaced executor were already written off
+            if generation == self._generation:
+                self._pending -= 1
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None):
+        """
+        fn(*args) in a worker process. Raises PdfPoolBusy when the pool is
+        saturated, asyncio.TimeoutError when the job overruns `timeout` and
+        BrokenProcessPool when a worker process died under it.
+        `fn` and its arguments must be picklable (module-level functions).
+        """
+        # Normally started with the app; started here for callers outside it
+        self.start()
+        with self._lock:
+            if self._pending >= self.workers + self.queue_limit:
+                raise PdfPoolBusy(f"{self._pending} PDF jobs in flight")
+            try:
+                future = self._executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory) since the last job noticed
+                self._replace(self._executor)
+                future = self._executor.submit(fn, *args)
+            executor = self._executor
+            self._pending += 1
+            generation = self._generation
+        future.add_done_callback(functools.partial(self._release, generation))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            # Drops the job if it hasn't started; a running one finishes in the background
+            future.cancel()
+            raise
+        except BrokenProcessPool:
+            # Replace the pool now rather than failing the next submit too
+            with self._lock:
+                self._replace(executor)
+            raise
+
+
+PDF_POOL = PdfPool()
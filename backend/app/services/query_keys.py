@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import Iterable, List, Optional
+
+from app.services.locations import normalize_location
+
+_SPACE = re.compile(r"\s+")
+_PUNCT = re.compile(r"[^\w\s+#./-]")
+
+
+def _normalize_term(term: str) -> str:
+    """Lowercases and collapses whitespace/punctuation ("Python  Developer!" -> "python developer")."""
+    return _SPACE.sub(" ", _PUNCT.sub(" ", term.lower())).strip()
+
+
+def _normalize_terms(terms: Optional[Iterable[str]]) -> List[str]:
+    return sorted({_normalize_term(t) for t in terms or [] if t and _normalize_term(t)})
+
+
+def _normalize_location(location: str) -> str:
+    """Gazetteer spelling, then term normalization ("Bangalore" and "bengaluru" -> "bengaluru")."""
+    return _normalize_term(normalize_location(location) or "")
+
+
+def discovery_key(
+    terms: Iterable[str],
+    locations: Iterable[str],
+    task_type: str = "SEARCH",
+    salary_min: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> str:
+    """
+    Canonical key for a discovery request.
+
+    Requests that differ only in casing, whitespace, punctuation or term order
+    ("Python Developer" in "bangalore" vs "python developer" in "Bengaluru")
+    map to the same key, so they can share a single queue item and scrape.
+    The salary floor and result limit shape the scrape, so they are part of it.
+    """
+    canonical = {
+        "task": task_type.upper(),
+        "terms": _normalize_terms(terms),
+        # "Unknown" is the placeholder for "no location given"
+        "locations": sorted({_normalize_location(l) for l in locations or [] if l} - {"", "unknown"}),
+        "salary_min": _normalize_term(str(salary_min or "")),
+        "limit": limit,
+    }
+    blob = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def scan_key(skills: Iterable[str], location: Optional[str], salary_min: Optional[str]) -> str:
+    """Canonical key for a `discover_jobs` scan of (skills, location, salary_min)."""
+    canonical = {
+        "skills": _normalize_terms(skills),
+        "location": _normalize_location(location or ""),
+        "salary_min": _normalize_term(str(salary_min or "")),
+    }
+    blob = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
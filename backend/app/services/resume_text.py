@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from pypdf import PdfReader
+from sqlalchemy.orm import Session
+
+from app.crud import user as user_crud
+from app.services.pdf_pool import PDF_POOL, PdfPool
+
+# =============================================================================
+# RESUME TEXT CACHE
+# =============================================================================
+#
+# The same PDF is uploaded again and again (every ATS check, every profile
+# refresh). Extracted text is keyed by the SHA-256 of the file bytes: an
+# in-process LRU in front, and cv_uploads.resume_text behind it, so a repeat
+# upload never reaches PdfReader. Empty text (an unreadable or image-only
+# PDF) is never cached, so a failed parse is retried on the next upload.
+
+RESUME_TEXT_CACHE_SIZE = int(os.getenv("RESUME_TEXT_CACHE_SIZE", "256"))
+
+
+def content_sha256(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes or b"").hexdigest()
+
+
+def read_pdf_text(file_bytes: bytes) -> str:
+    """Text of every page of a PDF; "" when the file can't be read."""
+    try:
+        reader = PdfReader(io.BytesIO(file_bytes))
+        text = ""
+        for page in reader.pages:
+            text += page.extract_text() + "\n"
+        return text
+    except Exception as e:
+        print(f"Error reading PDF: {e}")
+        return ""
+
+
+class ResumeTextCache:
+    """Thread-safe LRU of content hash -> extracted text."""
+
+    def __init__(self, size: int = RESUME_TEXT_CACHE_SIZE):
+        self.size = size
+        self._texts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[str]:
+        with self._lock:
+            if digest not in self._texts:
+                return None
+            self._texts.move_to_end(digest)
+            return self._texts[digest]
+
+    def put(self, digest: str, text: str) -> None:
+        with self._lock:
+            self._texts[digest] = text
+            self._texts.move_to_end(digest)
+            while len(self._texts) > self.size:
+                self._texts.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._texts.clear()
+
+
+RESUME_TEXTS = ResumeTextCache()
+
+
+def _stored_text(digest: str, db: Optional[Session]) -> Optional[str]:
+    """Non-empty text saved in cv_uploads for a content hash (when `db` is given)."""
+    if db is None or not db.bind:
+        return None
+    try:
+        return user_crud.get_cv_text(db, digest) or None
+    except Exception as e:
+        print(f"⚠️ Resume text lookup failed: {e}")
+        db.rollback()
+        return None
+
+
+def extract_resume_text(file_bytes: bytes, db: Optional[Session] = None, cache: ResumeTextCache = RESUME_TEXTS) -> str:
+    """
+    Text of an uploaded resume PDF: from the LRU, else from an earlier
+    cv_uploads row with the same content hash (when `db` is given), else
+    parsed once and remembered.
+    """
+    digest = content_sha256(file_bytes)
+    text = cache.get(digest) or _stored_text(digest, db)
+    if text is None:
+        text = read_pdf_text(file_bytes)
+    if text:
+        cache.put(digest, text)
+    return text
+
+
+async def extract_resume_text_async(
+    file_bytes: bytes, db: Optional[Session] = None, pool: PdfPool = PDF_POOL, cache: ResumeTextCache = RESUME_TEXTS
+) -> str:
+    """
+    extract_resume_text for async endpoints: the cv_uploads lookup runs on a
+    thread and a cache miss is parsed in the PDF process pool, so neither
+    blocks the event loop. Raises PdfPoolBusy or asyncio.TimeoutError from
+    the pool.
+    """
+    digest = content_sha256(file_bytes)
+    text = cache.get(digest)
+    if text is None and db is not None:
+        text = await asyncio.to_thread(_stored_text, digest, db)
+    if text is None:
+        text = await pool.run(read_pdf_text, file_bytes)
+    if text:
+        cache.put(digest, text)
+    return text
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import math
+import re
+from typing import NamedTuple, Optional
+
+# =============================================================================
+# PERIODS AND CONFIDENCE
+# =============================================================================
+#
+# Every source is normalized to annual INR. `period` records what the source
+# quoted (a "25k" stipend is monthly), `confidence` how the figure was
+# obtained, so filters can prefer provider fields over guesses from text.
+
+# period -> multiplier to an annual figure
+PERIODS = {"year": 1, "month": 12, "week": 52, "day": 260, "hour": 2080}
+
+_PERIOD_ALIASES = {
+    "year": "year", "yearly": "year", "annual": "year", "annually": "year", "yr": "year", "pa": "year",
+    "month": "month", "monthly": "month", "mo": "month", "pm": "month",
+    "week": "week", "weekly": "week", "wk": "week",
+    "day": "day", "daily": "day",
+    "hour": "hour", "hourly": "hour", "hr": "hour",
+}
+_PERIOD_WORD = re.compile(r"[a-z]+")
+
+CONFIDENCE_PROVIDER = 1.0     # provider field with an explicit period
+CONFIDENCE_ASSUMED = 0.8      # provider field, period assumed from the API's contract
+CONFIDENCE_PREDICTED = 0.5    # provider estimate (Adzuna salary_is_predicted)
+CONFIDENCE_LPA = 0.8          # "12-18 LPA" in the description
+CONFIDENCE_MONTHLY_K = 0.5    # "25k" in the description, read as monthly
+CONFIDENCE_RUPEES = 0.3       # bare "Rs 45,000", period guessed from the amount
+
+# A bare rupee amount below this is read as a monthly figure
+_MONTHLY_CEILING = 200000
+
+
+class Salary(NamedTuple):
+    annual_min: int
+    annual_max: int
+    period: str
+    confidence: float
+
+
+def parse_period(value) -> Optional[str]:
+    """Provider interval ("per-month-salary", "1 YEAR", "hourly") -> a PERIODS key."""
+    for word in _PERIOD_WORD.findall(str(value or "").lower()):
+        if word in _PERIOD_ALIASES:
+            return _PERIOD_ALIASES[word]
+    return None
+
+
+def _amount(value) -> Optional[float]:
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return None
+    # Provider payloads and DataFrame cells carry NaN for missing figures
+    if math.isnan(amount) or amount <= 0:
+        return None
+    return amount
+
+
+def normalize_salary(
+    low,
+    high=None,
+    period: Optional[str] = "year",
+    currency: Optional[str] = "INR",
+    confidence: float = CONFIDENCE_PROVIDER,
+) -> Optional[Salary]:
+    """
+    Annual INR range for amounts quoted per `period`; None when there is no
+    usable amount, the period is unknown or the currency isn't INR.
+    A single figure becomes a one-point range.
+    """
+    low, high = _amount(low), _amount(high)
+    if low is None and high is None:
+        return None
+    if currency and currency.strip().upper() not in ("INR", "₹", "RS"):
+        return None
+    factor = PERIODS.get(period or "")
+    if factor is None:
+        return None
+    low = low if low is not None else high
+    high = high if high is not None else low
+    low, high = min(low, high), max(low, high)
+    return Salary(int(round(low * factor)), int(round(high * factor)), period, confidence)
+
+
+def text_salary(low, high, rule: Optional[str]) -> Optional[Salary]:
+    """
+    Annual range for a figure the classifier read from description text;
+    `rule` is the salary rule that matched ("lpa", "k" or "rupees").
+    """
+    if rule == "lpa":
+        return normalize_salary(low, high, "year", confidence=CONFIDENCE_LPA)
+    if rule == "k":
+        return normalize_salary(low, high, "month", confidence=CONFIDENCE_MONTHLY_K)
+    if rule == "rupees":
+        period = "month" if (_amount(high) or 0) < _MONTHLY_CEILING else "year"
+        return normalize_salary(low, high, period, confidence=CONFIDENCE_RUPEES)
+    return None
+
+
+def parse_salary_floor(value) -> Optional[int]:
+    """
+    User-entered minimum salary -> annual INR: "12 LPA" / "12" (lakhs)
+    -> 1200000, "1200000" stays as is. None for blank or unreadable input.
+    """
+    text = str(value or "").strip().lower().replace(",", "")
+    match = re.match(r"(\d+(?:\.\d+)?)\s*(lpa|lakhs?|l)?$", text)
+    if not match:
+        return None
+    amount = float(match.group(1))
+    # Small bare numbers are lakhs, as in the rest of the UI
+    if match.group(2) or amount < 1000:
+        amount *= 100000
+    return int(amount) if amount > 0 else None
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from app.services.patterns import trie_pattern
+
+# =============================================================================
+# TAXONOMY
+# =============================================================================
+#
+# One entry per skill: (id, key, display name, category, synonyms).
+# Ids are stored with listings and must never be renumbered or reused; add
+# new skills with the next free id. The key is the canonical lowercase form
+# the APIs report; synonyms are extra surface forms matched in text (except
+# the ambiguous ones in _NAME_ONLY_FORMS).
+
+_TAXONOMY: List[Tuple[int, str, str, str, Tuple[str, ...]]] = [
+    # Languages
+    (1, "python", "Python", "language", ("python3",)),
+    (2, "java", "Java", "language", ()),
+    (3, "c++", "C++", "language", ("cpp",)),
+    (4, "c#", "C#", "language", ("csharp", "c sharp")),
+    (5, "javascript", "JavaScript", "language", ("js", "ecmascript", "es6")),
+    (6, "typescript", "TypeScript", "language", ()),
+    (7, "ruby", "Ruby", "language", ()),
+    (8, "php", "PHP", "language", ()),
+    (9, "swift", "Swift", "language", ("swiftui", "swift ui")),
+    (10, "kotlin", "Kotlin", "language", ()),
+    (11, "go", "Go", "language", ("golang", "go lang")),
+    (12, "rust", "Rust", "language", ("rust-lang", "rustlang")),
+    (13, "sql", "SQL", "language", ()),
+    (14, "bash", "Bash", "language", ("shell scripting", "shell script")),
+    # Frontend
+    (20, "html", "HTML", "frontend", ("html5",)),
+    (21, "css", "CSS", "frontend", ("css3",)),
+    (22, "react", "React", "frontend", ("react.js", "reactjs", "react js")),
+    (23, "angular", "Angular", "frontend", ("angularjs", "angular.js")),
+    (24, "vue", "Vue", "frontend", ("vue.js", "vuejs")),
+    (25, "next.js", "Next.js", "frontend", ("nextjs", "next js")),
+    (26, "tailwind", "Tailwind CSS", "frontend", ("tailwindcss", "tailwind css")),
+    # Backend frameworks and runtimes
+    (40, "node.js", "Node.js", "backend", ("nodejs", "node js")),
+    (41, "django", "Django", "backend", ()),
+    (42, "flask", "Flask", "backend", ()),
+    (43, "fastapi", "FastAPI", "backend", ("fast api",)),
+    (44, "spring", "Spring", "backend", ("spring boot", "springboot", "spring framework", "spring mvc")),
+    (45, "asp.net", "ASP.NET", "backend", ("asp.net core", ".net core")),
+    (46, "express.js", "Express", "backend", ("expressjs",)),
+    (47, "rest api", "REST APIs", "backend", ("rest apis", "restful api", "restful apis", "restful")),
+    (48, "graphql", "GraphQL", "backend", ()),
+    (49, "grpc", "gRPC", "backend", ()),
+    (50, "microservices", "Microservices", "backend", ("microservice",)),
+    (51, "serverless", "Serverless", "backend", ()),
+    # Databases
+    (60, "mysql", "MySQL", "database", ()),
+    (61, "postgresql", "PostgreSQL", "database", ("postgres", "psql")),
+    (62, "mongodb", "MongoDB", "database", ("mongo",)),
+    (63, "redis", "Redis", "database", ()),
+    (64, "elasticsearch", "Elasticsearch", "database", ("elastic search",)),
+    (65, "cassandra", "Cassandra", "database", ()),
+    (66, "dynamodb", "DynamoDB", "database", ("dynamo db",)),
+    # Cloud and DevOps
+    (80, "aws", "AWS", "cloud", ("amazon web services",)),
+    (81, "azure", "Azure", "cloud", ("microsoft azure",)),
+    (82, "gcp", "GCP", "cloud", ("google cloud", "google cloud platform")),
+    (83, "docker", "Docker", "devops", ()),
+    (84, "kubernetes", "Kubernetes", "devops", ("k8s",)),
+    (85, "terraform", "Terraform", "devops", ()),
+    (86, "ansible", "Ansible", "devops", ()),
+    (87, "jenkins", "Jenkins", "devops", ()),
+    (88, "gitlab ci", "GitLab CI", "devops", ("gitlab-ci",)),
+    (89, "github actions", "GitHub Actions", "devops", ()),
+    (90, "git", "Git", "devops", ()),
+    (91, "linux", "Linux", "devops", ()),
+    (92, "unix", "Unix", "devops", ()),
+    (93, "ci/cd", "CI/CD", "devops", ("ci cd", "cicd", "ci-cd")),
+    # Data and ML
+    (100, "machine learning", "Machine Learning", "data", ("ml",)),
+    (101, "deep learning", "Deep Learning", "data", ()),
+    (102, "nlp", "NLP", "data", ("natural language processing",)),
+    (103, "computer vision", "Computer Vision", "data", ()),
+    (104, "tensorflow", "TensorFlow", "data", ()),
+    (105, "pytorch", "PyTorch", "data", ()),
+    (106, "keras", "Keras", "data", ()),
+    (107, "scikit-learn", "scikit-learn", "data", ("sklearn", "scikit learn")),
+    (108, "pandas", "pandas", "data", ()),
+    (109, "numpy", "NumPy", "data", ()),
+    (110, "data science", "Data Science", "data", ()),
+    (111, "data analysis", "Data Analysis", "data", ("data analytics",)),
+    (112, "big data", "Big Data", "data", ()),
+    (113, "hadoop", "Hadoop", "data", ()),
+    (114, "spark", "Spark", "data", ("apache spark", "pyspark")),
+    (115, "kafka", "Kafka", "data", ("apache kafka",)),
+    (116, "airflow", "Airflow", "data", ("apache airflow",)),
+    # Practices and concepts
+    (130, "agile", "Agile", "practice", ()),
+    (131, "scrum", "Scrum", "practice", ()),
+    (132, "kanban", "Kanban", "practice", ()),
+    (133, "jira", "Jira", "practice", ()),
+    (134, "confluence", "Confluence", "practice", ()),
+    (135, "object oriented programming", "Object-Oriented Programming", "concept",
+     ("object-oriented programming", "oop", "oops")),
+    (136, "functional programming", "Functional Programming", "concept", ()),
+    (137, "data structures", "Data Structures", "concept", ()),
+    (138, "algorithms", "Algorithms", "concept", ()),
+    # Soft skills
+    (150, "communication", "Communication", "soft", ("communication skills",)),
+    (151, "leadership", "Leadership", "soft", ()),
+    (152, "problem solving", "Problem Solving", "soft", ("problem-solving",)),
+    (153, "teamwork", "Teamwork", "soft", ("team work", "team player")),
+    (154, "critical thinking", "Critical Thinking", "soft", ()),
+]
+
+
+class Skill(NamedTuple):
+    id: int
+    key: str
+    name: str
+    category: str
+    synonyms: Tuple[str, ...]
+
+
+class SkillHit(NamedTuple):
+    """One occurrence of a skill in a text; `start`/`end` index the original string."""
+    skill: Skill
+    start: int
+    end: int
+    text: str
+
+
+SKILLS: Dict[int, Skill] = {entry[0]: Skill(*entry) for entry in _TAXONOMY}
+SKILLS_BY_KEY: Dict[str, Skill] = {skill.key: skill for skill in SKILLS.values()}
+
+# Every surface form (key, synonyms) -> skill
+_FORMS: Dict[str, Skill] = {}
+for _skill in SKILLS.values():
+    for _form in (_skill.key,) + _skill.synonyms:
+        _FORMS[_form.lower()] = _skill
+
+# Forms that are also ordinary words ("go above and beyond", "Spring
+# internship", "rust belt", "swift delivery", "oops", "500 ml"). They still
+# resolve user-entered skill names, but text only matches the skill's
+# unambiguous forms ("golang", "spring boot", "rust-lang", ...).
+_NAME_ONLY_FORMS = {"go", "spring", "rust", "swift", "oops", "ml"}
+_TEXT_FORMS = {form: skill for form, skill in _FORMS.items() if form not in _NAME_ONLY_FORMS}
+
+# The trie of all forms compiled into one regex. A hit must not touch another
+# word character on either side, so "java" never fires inside "javascript"
+# and "js" never fires inside "node.js"; spaces in multi-word forms match any
+# whitespace run (PDF text breaks lines mid-phrase).
+_SCANNER = re.compile(
+    r"(?<![\w.])(?:" + trie_pattern(_TEXT_FORMS).replace(r"\ ", r"\s+") + r")(?![\w+#])",
+    re.IGNORECASE,
+)
+
+
+# =============================================================================
+# MATCHING
+# =============================================================================
+
+def find_skills(text: str) -> List[SkillHit]:
+    """Every skill occurrence in `text`, in order, from one pass of the compiled trie."""
+    hits = []
+    for match in _SCANNER.finditer(text or ""):
+        form = " ".join(match.group().lower().split())
+        hits.append(SkillHit(_FORMS[form], match.start(), match.end(), match.group()))
+    return hits
+
+
+def skills_in(text: str) -> List[Skill]:
+    """Distinct skills in `text`, in order of first appearance."""
+    seen: Dict[int, Skill] = {}
+    for hit in find_skills(text):
+        seen.setdefault(hit.skill.id, hit.skill)
+    return list(seen.values())
+
+
+def skill_ids(text: str) -> Set[int]:
+    return {hit.skill.id for hit in find_skills(text)}
+
+
+def skill_vector(*texts: str) -> List[int]:
+    """Sorted distinct skill ids across `texts`: the value stored in job_listings.skill_ids."""
+    ids: Set[int] = set()
+    for text in texts:
+        ids |= skill_ids(text)
+    return sorted(ids)
+
+
+def resolve_skill_ids(names: Iterable[str]) -> Tuple[List[int], List[str]]:
+    """Ids for user-entered skill names, plus the names the taxonomy doesn't know."""
+    ids, unknown = [], []
+    for name in names:
+        skill = canonical_skill(name)
+        if skill is None:
+            unknown.append(name)
+        elif skill.id not in ids:
+            ids.append(skill.id)
+    return ids, unknown
+
+
+def canonical_skill(name: str) -> Optional[Skill]:
+    """The taxonomy entry for a user-entered skill name ("NodeJS" -> node.js), if any."""
+    return _FORMS.get(" ".join((name or "").lower().split()))
+
+
+def canonical_keys(names: Iterable[str]) -> Set[str]:
+    """Canonical keys for a list of skill names; unknown names are kept lowercased."""
+    keys = set()
+    for name in names:
+        skill = canonical_skill(name)
+        keys.add(skill.key if skill else " ".join((name or "").lower().split()))
+    return keys
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Iterable, List
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer
+
+# =============================================================================
+# TOKENIZER
+# =============================================================================
+#
+# CountVectorizer's default analyzer (lowercase, runs of 2+ word characters),
+# shared by the per-request scorer and the hashed job vectors so both see the
+# same terms. Scores match the old fit-per-request CountVectorizer exactly.
+
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+_TOKEN = re.compile(TOKEN_PATTERN)
+
+# Stateless: no vocabulary to fit or load, safe to share across threads
+HASHED_FEATURES = 2 ** 20
+HASHER = HashingVectorizer(
+    token_pattern=TOKEN_PATTERN, n_features=HASHED_FEATURES, alternate_sign=False, norm="l2",
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall((text or "").lower())
+
+
+def term_vector(text: str) -> Counter:
+    """Sparse term-count vector of `text`."""
+    return Counter(tokenize(text))
+
+
+def hashed_vectors(texts: Iterable[str]):
+    """L2-normalized hashed rows (scipy CSR), for scoring one text against many."""
+    return HASHER.transform([text or "" for text in texts])
+
+
+# =============================================================================
+# SCORING
+# =============================================================================
+
+def cosine(a: Counter, b: Counter) -> float:
+    """Cosine similarity of two term vectors from a sparse dot product."""
+    if not a or not b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(count * b[term] for term, count in a.items() if term in b)
+    if not dot:
+        return 0.0
+    return dot / math.sqrt(sum(c * c for c in a.values()) * sum(c * c for c in b.values()))
+
+
+def match_score(resume: Counter, jd: Counter) -> float:
+    """Resume/JD match as a percentage, to two decimals."""
+    return round(cosine(resume, jd) * 100, 2)
+
+
+def top_terms(vector: Counter, limit: int) -> List[str]:
+    """
+    The `limit` most frequent non-stop-word terms, alphabetically (what
+    CountVectorizer(stop_words="english", max_features=limit) kept).
+    """
+    ranked = sorted(
+        (term for term in vector if term not in ENGLISH_STOP_WORDS), key=lambda term: (-vector[term], term)
+    )
+    return sorted(ranked[:limit])
+
+
+def missing_terms(resume: Counter, jd: Counter, limit: int) -> List[str]:
+    """Top JD terms (see top_terms) that never occur in the resume."""
+    return [term for term in top_terms(jd, limit) if term not in resume]
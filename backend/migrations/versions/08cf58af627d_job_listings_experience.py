@@ -0,0 +1,34 @@
+"""job_listings experience and seniority
+
+Revision ID: 08cf58af627d
+Revises: d415637e5a4d
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '08cf58af627d'
+down_revision: Union[str, Sequence[str], None] = 'd415637e5a4d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_listings', sa.Column('experience_min_years', sa.SmallInteger(), nullable=True))
+    op.add_column('job_listings', sa.Column('experience_max_years', sa.SmallInteger(), nullable=True))
+    op.add_column('job_listings', sa.Column('seniority_band', sa.String(length=16), nullable=True))
+    op.create_index('ix_job_listings_experience', 'job_listings', ['experience_min_years', 'seniority_band'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_listings_experience', table_name='job_listings')
+    op.drop_column('job_listings', 'seniority_band')
+    op.drop_column('job_listings', 'experience_max_years')
+    op.drop_column('job_listings', 'experience_min_years')
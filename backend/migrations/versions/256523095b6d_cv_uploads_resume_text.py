@@ -0,0 +1,32 @@
+"""cv_uploads content hash and text
+
+Revision ID: 256523095b6d
+Revises: 08cf58af627d
+Create Date: 2026-10-19 09:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '256523095b6d'
+down_revision: Union[str, Sequence[str], None] = '08cf58af627d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cv_uploads', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+    op.add_column('cv_uploads', sa.Column('resume_text', sa.Text(), nullable=True))
+    op.create_index(op.f('ix_cv_uploads_content_sha256'), 'cv_uploads', ['content_sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_cv_uploads_content_sha256'), table_name='cv_uploads')
+    op.drop_column('cv_uploads', 'resume_text')
+    op.drop_column('cv_uploads', 'content_sha256')
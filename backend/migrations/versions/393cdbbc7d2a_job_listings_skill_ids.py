@@ -0,0 +1,30 @@
+"""job_listings skill_ids
+
+Revision ID: 393cdbbc7d2a
+Revises: b3c3a3cca8c3
+Create Date: 2026-10-19 09:25:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '393cdbbc7d2a'
+down_revision: Union[str, Sequence[str], None] = 'b3c3a3cca8c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_listings', sa.Column('skill_ids', postgresql.ARRAY(sa.Integer()), nullable=True))
+    op.create_index('ix_job_listings_skill_ids', 'job_listings', ['skill_ids'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_listings_skill_ids', table_name='job_listings', postgresql_using='gin')
+    op.drop_column('job_listings', 'skill_ids')
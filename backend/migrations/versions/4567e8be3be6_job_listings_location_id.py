@@ -0,0 +1,30 @@
+"""job_listings location_id
+
+Revision ID: 4567e8be3be6
+Revises: 393cdbbc7d2a
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4567e8be3be6'
+down_revision: Union[str, Sequence[str], None] = '393cdbbc7d2a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_listings', sa.Column('location_id', sa.String(length=32), nullable=True))
+    op.create_index(op.f('ix_job_listings_location_id'), 'job_listings', ['location_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_listings_location_id'), table_name='job_listings')
+    op.drop_column('job_listings', 'location_id')
@@ -0,0 +1,35 @@
+"""agent_watermarks table
+
+Revision ID: 5c1e7a2d9f04
+Revises: 256523095b6d
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a2d9f04'
+down_revision: Union[str, Sequence[str], None] = '256523095b6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('agent_watermarks',
+    sa.Column('source', sa.String(length=32), nullable=False),
+    sa.Column('query', sa.String(length=512), nullable=False),
+    sa.Column('location', sa.String(length=512), nullable=False),
+    sa.Column('newest_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('source', 'query', 'location')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('agent_watermarks')
@@ -0,0 +1,38 @@
+"""search_queue claim leases
+
+Revision ID: a51a90e3bf3d
+Revises: b8a90ec50f30
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a51a90e3bf3d'
+down_revision: Union[str, Sequence[str], None] = 'b8a90ec50f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('search_queue', sa.Column('locked_by', sa.String(length=128), nullable=True))
+    op.add_column('search_queue', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('search_queue', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('search_queue', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('search_queue', sa.Column('last_error', sa.Text(), nullable=True))
+    op.create_index('ix_search_queue_status_created_at', 'search_queue', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_search_queue_status_created_at', table_name='search_queue')
+    op.drop_column('search_queue', 'last_error')
+    op.drop_column('search_queue', 'attempts')
+    op.drop_column('search_queue', 'heartbeat_at')
+    op.drop_column('search_queue', 'lease_expires_at')
+    op.drop_column('search_queue', 'locked_by')
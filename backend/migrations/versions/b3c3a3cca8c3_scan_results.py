@@ -0,0 +1,40 @@
+"""scan_results table
+
+Revision ID: b3c3a3cca8c3
+Revises: f958ffc04dbf
+Create Date: 2026-10-19 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c3a3cca8c3'
+down_revision: Union[str, Sequence[str], None] = 'f958ffc04dbf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('scan_results',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('query_key', sa.String(length=64), nullable=False),
+    sa.Column('query', sa.String(length=512), nullable=False),
+    sa.Column('filters', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+    sa.Column('result_ids', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'[]'::jsonb"), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('query_key')
+    )
+    op.create_index(op.f('ix_scan_results_expires_at'), 'scan_results', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_scan_results_expires_at'), table_name='scan_results')
+    op.drop_table('scan_results')
@@ -0,0 +1,32 @@
+"""job_listings canonical_link and simhash
+
+Revision ID: b8a90ec50f30
+Revises: c0bc1654ba8b
+Create Date: 2026-10-19 09:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8a90ec50f30'
+down_revision: Union[str, Sequence[str], None] = 'c0bc1654ba8b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_listings', sa.Column('canonical_link', sa.String(length=512), nullable=True))
+    op.add_column('job_listings', sa.Column('simhash', sa.BigInteger(), nullable=True))
+    op.create_index(op.f('ix_job_listings_canonical_link'), 'job_listings', ['canonical_link'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_listings_canonical_link'), table_name='job_listings')
+    op.drop_column('job_listings', 'simhash')
+    op.drop_column('job_listings', 'canonical_link')
@@ -0,0 +1,28 @@
+"""index job_listings.apply_link
+
+Revision ID: c0bc1654ba8b
+Revises: 3a5d90345b1b
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0bc1654ba8b'
+down_revision: Union[str, Sequence[str], None] = '3a5d90345b1b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_job_listings_apply_link'), 'job_listings', ['apply_link'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_listings_apply_link'), table_name='job_listings')
@@ -0,0 +1,36 @@
+"""job_listings normalized salary
+
+Revision ID: d415637e5a4d
+Revises: 4567e8be3be6
+Create Date: 2026-10-19 09:35:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd415637e5a4d'
+down_revision: Union[str, Sequence[str], None] = '4567e8be3be6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_listings', sa.Column('salary_annual_min', sa.Integer(), nullable=True))
+    op.add_column('job_listings', sa.Column('salary_annual_max', sa.Integer(), nullable=True))
+    op.add_column('job_listings', sa.Column('salary_period', sa.String(length=8), nullable=True))
+    op.add_column('job_listings', sa.Column('salary_confidence', sa.Float(), nullable=True))
+    op.create_index('ix_job_listings_salary_annual', 'job_listings', ['salary_annual_max', 'salary_annual_min'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_listings_salary_annual', table_name='job_listings')
+    op.drop_column('job_listings', 'salary_confidence')
+    op.drop_column('job_listings', 'salary_period')
+    op.drop_column('job_listings', 'salary_annual_max')
+    op.drop_column('job_listings', 'salary_annual_min')
@@ -0,0 +1,40 @@
+"""search_queue request coalescing
+
+Revision ID: f958ffc04dbf
+Revises: a51a90e3bf3d
+Create Date: 2026-10-19 09:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f958ffc04dbf'
+down_revision: Union[str, Sequence[str], None] = 'a51a90e3bf3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('search_queue', sa.Column('dedupe_key', sa.String(length=64), nullable=True))
+    op.add_column('search_queue', sa.Column('requesters', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'[]'::jsonb"), nullable=False))
+    op.add_column('search_queue', sa.Column('result_ids', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'[]'::jsonb"), nullable=False))
+    op.create_index(op.f('ix_search_queue_dedupe_key'), 'search_queue', ['dedupe_key'], unique=False)
+    # At most one active (pending/processing) item per dedupe key
+    op.create_index(
+        'uq_search_queue_active_dedupe_key', 'search_queue', ['dedupe_key'], unique=True,
+        postgresql_where=sa.text("status IN ('PENDING', 'PROCESSING')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_search_queue_active_dedupe_key', table_name='search_queue')
+    op.drop_index(op.f('ix_search_queue_dedupe_key'), table_name='search_queue')
+    op.drop_column('search_queue', 'result_ids')
+    op.drop_column('search_queue', 'requesters')
+    op.drop_column('search_queue', 'dedupe_key')
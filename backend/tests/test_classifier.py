@@ -0,0 +1,104 @@
+import json
+
+from app.models import JobType, WorkMode
+from app.services import classifier
+from app.services.classifier import BatchClassification, classify, classify_batch, fits_experience
+
+
+def test_title_seniority_drives_the_bouncer():
+    assert not classify("Senior Backend Engineer", "").is_entry_level()
+    assert classify("Junior Developer", "Minimum 3 years of experience required.").is_entry_level()
+    assert classify("Senior Backend Engineer", "").is_entry_level(experience_years=4)
+
+
+def test_strict_experience_rule_bounces_untitled_roles():
+    facts = classify("Software Engineer", "Requires 5 years building data pipelines.")
+    assert facts.experience_match == "requires 5 years"
+    assert not facts.is_entry_level()
+    assert classify("Software Engineer", "Experience with 1 year of Python is a plus.").is_entry_level()
+
+
+def test_job_type_uses_whole_words_in_the_description():
+    assert classify("Data Analyst", "Summer internship for students.").job_type == JobType.INTERNSHIP
+    assert classify("QA Engineer", "This is a part-time role.").job_type == JobType.CONTRACT
+    # "international" contains "intern" but is not the word
+    facts = classify("Sales Associate", "Join our international team.")
+    assert facts.job_type == JobType.FULL_TIME
+    assert facts.loose_job_type == JobType.INTERNSHIP
+
+
+def test_work_mode_and_location():
+    facts = classify("Engineer", "Hybrid working from our Bengaluru office; Pune optional.")
+    assert facts.work_mode == WorkMode.HYBRID
+    assert (facts.location, facts.location_id) == ("Bengaluru", "bengaluru")
+    # The structured location field wins over the description
+    assert classify("Engineer", "Offices in Mumbai and Pune.", location="Gurgaon, Haryana").location_id == "gurugram"
+    assert classify("Engineer", "", location="Remote, India").work_mode == WorkMode.REMOTE
+    assert classify("Remote Engineer", "").loose_work_mode == WorkMode.REMOTE
+
+
+def test_salary_rules_in_priority_order():
+    facts = classify("Engineer", "Compensation: 12-18 LPA. Stipend 25k.")
+    assert (facts.salary_min, facts.salary_max) == (1200000, 1800000)
+    assert facts.salary_text == "12-18 LPA"
+
+    facts = classify("Engineer", "Stipend of 25k - 30k per month.")
+    assert (facts.salary_min, facts.salary_max) == (25000, 30000)
+    assert facts.salary_text is None
+
+    facts = classify("Engineer", "Salary INR 45000 per month.")
+    assert (facts.salary_min, facts.salary_max) == (45000, 45000)
+    assert (classify("Engineer", "").salary_min, classify("Engineer", "").salary_max) == (None, None)
+
+
+def test_batch_columns_match_single_classification():
+    titles = ["Senior Engineer", "Data Analyst Intern", None, "Engineer"]
+    descriptions = ["Remote role, 12-18 LPA.", "Stipend 25k in Pune.", "Hybrid, Mumbai.", float("nan")]
+    batch = classify_batch(titles, descriptions, ["", "", "Remote", None])
+
+    assert len(batch) == 4
+    assert batch.entry_level == [False, True, True, True]
+    assert batch.job_type == [JobType.FULL_TIME, JobType.INTERNSHIP, JobType.FULL_TIME, JobType.FULL_TIME]
+    assert batch.work_mode == [WorkMode.REMOTE, WorkMode.ONSITE, WorkMode.REMOTE, WorkMode.ONSITE]
+    assert batch.salary_min == [1200000, 25000, None, None]
+    assert batch.location == ["Remote", "Pune", "Remote", None]
+    assert batch.location_id == ["remote", "pune", "remote", None]
+
+
+def test_batch_pool_path_keeps_row_order(monkeypatch):
+    monkeypatch.setattr(classifier, "BATCH_POOL_MIN_ROWS", 4)
+    descriptions = [f"Compensation {n} LPA" for n in range(1, 9)]
+    batch = classify_batch(["Engineer"] * 8, descriptions, workers=2, chunk_size=3)
+    assert batch.salary_min == [n * 100000 for n in range(1, 9)]
+
+
+def test_rows_round_trip_through_json():
+    batch = classify_batch(["Data Analyst Intern"], ["Hybrid role in Pune, 4-6 LPA."])
+    row = batch.row(0)
+    assert json.loads(json.dumps(row)) == row
+
+    restored = BatchClassification.from_rows([row])
+    assert restored.job_type == [JobType.INTERNSHIP]
+    assert restored.work_mode == [WorkMode.HYBRID]
+    assert restored.salary_min == batch.salary_min
+    assert restored.row(0) == row
+
+
+def test_experience_years_and_band():
+    facts = classify("Backend Engineer", "3-5 years of experience with Python. Founded 12 years ago.")
+    assert (facts.experience_min, facts.experience_max) == (3, 5)
+    assert facts.seniority_band == "mid"
+    assert classify("Engineer", "Minimum 6+ yrs in Java.").seniority_band == "senior"
+    assert classify("Senior Engineer", "").seniority_band == "senior"
+    assert classify("Data Analyst Intern", "").seniority_band == "intern"
+    facts = classify("Engineer", "We have been around for 20 years.")
+    assert (facts.experience_min, facts.seniority_band) == (None, "entry")
+
+
+def test_fits_experience_replaces_the_bouncer():
+    assert fits_experience(None, "entry", 0)
+    assert fits_experience(1, "entry", 0)        # the bouncer let one year through
+    assert not fits_experience(3, "mid", 0)
+    assert not fits_experience(None, "senior", 0)
+    assert fits_experience(3, "mid", 2)
+    assert fits_experience(6, "senior", 5)
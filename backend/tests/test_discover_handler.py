@@ -9,7 +9,10 @@ client = TestClient(app)
 # Mock DB Session
 @pytest.fixture
 def mock_db():
-    return MagicMock()
+    db = MagicMock()
+    # No identical request to coalesce with
+    db.scalars.return_value.first.return_value = None
+    return db
 
 @pytest.fixture
 def override_get_db(mock_db):
@@ -102,3 +105,9 @@ def test_default_location_fallback(override_get_db, mock_db):
     assert queue_item.resolved_locations_source == "default"
     assert queue_item.filters["resolved_locations"] == ["Unknown"]
 
+
+def test_invalid_user_id_is_rejected(override_get_db, mock_db):
+    response = client.post("/opportunities/discover?user_id=not-a-uuid", json={"skills": ["Python"], "location": "Pune"})
+
+    assert response.status_code == 422
+    mock_db.add.assert_not_called()
@@ -0,0 +1,96 @@
+from unittest.mock import MagicMock
+
+from app.models import Opportunity, OpportunitySource
+from app.services.fingerprint import (
+    FingerprintIndex,
+    canonicalize_url,
+    from_signed64,
+    merge_sources,
+    simhash_posting,
+    to_signed64,
+)
+
+DESCRIPTION = (
+    "We are looking for a Backend Engineer to build payment APIs in Python and FastAPI. "
+    "You will work with PostgreSQL, Redis and AWS, own services end to end, and "
+    "collaborate with product and design on a fast moving fintech team in Bengaluru."
+)
+
+
+def test_canonicalize_strips_tracking_and_resolves_ats_hosts():
+    assert canonicalize_url("https://boards.greenhouse.io/acme/jobs/4012345?gh_src=abc") == "greenhouse:4012345"
+    assert canonicalize_url("https://acme.com/careers?gh_jid=4012345&utm_source=x") == "greenhouse:4012345"
+    assert (
+        canonicalize_url("https://jobs.lever.co/acme/0f1e2d3c-4b5a-6978-8695-a4b3c2d1e0f9/apply?lever-source=LinkedIn")
+        == "lever:0f1e2d3c-4b5a-6978-8695-a4b3c2d1e0f9"
+    )
+    assert canonicalize_url("https://in.linkedin.com/jobs/view/backend-engineer-at-acme-3812345678?trk=abc") == "linkedin:3812345678"
+    assert canonicalize_url("https://www.example.com/jobs/42/?utm_campaign=x&b=2&a=1") == "example.com/jobs/42?a=1&b=2"
+
+
+def test_near_duplicates_share_a_fingerprint_bucket():
+    index = FingerprintIndex()
+    original = simhash_posting("Acme Technologies Pvt Ltd", "Backend Engineer", DESCRIPTION)
+    index.add("listing-1", "adzuna:123", original)
+
+    # Same posting from another board: company suffix and trailing text differ
+    clone = simhash_posting("Acme Technologies", "Backend Engineer", DESCRIPTION + " Apply now!")
+    assert index.match("linkedin:999", clone) == "listing-1"
+
+    other = simhash_posting("Globex", "Data Analyst", "Own dashboards and reporting in SQL and Tableau.")
+    assert index.match("linkedin:1000", other) is None
+
+
+def test_discard_removes_a_rolled_back_listing():
+    index = FingerprintIndex()
+    fingerprint = simhash_posting("Acme", "Backend Engineer", DESCRIPTION)
+    index.add("listing-1", "adzuna:123", fingerprint)
+    index.add("listing-2", "adzuna:456", fingerprint)
+    index.discard("listing-1", "adzuna:123", fingerprint)
+
+    assert index.match("adzuna:123", fingerprint) == "listing-2"
+    index.discard("listing-2", "adzuna:456", fingerprint)
+    assert index.match("adzuna:123", fingerprint) is None
+
+
+def test_reload_keeps_listings_still_being_written():
+    index = FingerprintIndex()
+    fingerprint = simhash_posting("Acme", "Backend Engineer", DESCRIPTION)
+    index.add("listing-1", "adzuna:123", fingerprint)
+
+    db = MagicMock()
+    db.execute.return_value = iter([])
+    index.load(db)
+    assert index.match("adzuna:123", None) == "listing-1"
+
+    # Once the reload sees it stored it is no longer tracked as pending
+    db.execute.return_value = iter([("listing-1", "adzuna:123", to_signed64(fingerprint))])
+    index.load(db)
+    assert index._pending == {}
+    assert index.match("adzuna:123", None) == "listing-1"
+
+
+def test_signed_round_trip():
+    value = simhash_posting("Acme", "Backend Engineer", DESCRIPTION) | (1 << 63)
+    assert from_signed64(to_signed64(value)) == value
+
+
+def test_merge_sources_keeps_every_link_once():
+    existing = Opportunity(
+        company_name="Acme", role_title="Backend Engineer", apply_link="https://adzuna.in/land/ad/1",
+        source=OpportunitySource.OTHER, source_metadata={"origin": "adzuna"}, skill_ids=[1, 41],
+    )
+    incoming = Opportunity(
+        company_name="Acme", role_title="Backend Engineer", apply_link="https://linkedin.com/jobs/view/2",
+        source=OpportunitySource.OTHER, source_metadata={"origin": "JobSpy", "site": "linkedin"},
+        salary_min=600000, salary_max=900000, skill_ids=[1, 83],
+        salary_annual_min=600000, salary_annual_max=900000, salary_period="year", salary_confidence=1.0,
+    )
+
+    assert merge_sources(existing, incoming)
+    assert not merge_sources(existing, incoming)
+    links = [s["apply_link"] for s in existing.source_metadata["sources"]]
+    assert links == ["https://adzuna.in/land/ad/1", "https://linkedin.com/jobs/view/2"]
+    assert existing.salary_min == 600000
+    assert existing.skill_ids == [1, 41, 83]
+    assert (existing.salary_annual_max, existing.salary_confidence) == (900000, 1.0)
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.services import job_ranking
+from app.services.job_ranking import JobVectors, job_text, rank_jobs
+from app.services.skills import canonical_skill
+
+RESUME = "Backend developer: Python, FastAPI, PostgreSQL and Docker. Built REST services."
+
+
+def _listing(id, title, skills, updated_at=1, description=None):
+    ids = [canonical_skill(name).id for name in skills]
+    meta = {"description": description} if description else {}
+    return SimpleNamespace(id=id, role_title=title, skill_ids=ids, updated_at=updated_at, source_metadata=meta)
+
+
+def test_job_text_is_title_skill_names_and_description():
+    assert job_text(_listing("a", "Backend Engineer", ["python", "nodejs"])) == "Backend Engineer Python Node.js"
+    job = _listing("a", "Backend Engineer", ["python"], description="Own our Kafka pipelines")
+    assert job_text(job) == "Backend Engineer Python Own our Kafka pipelines"
+    job.source_metadata = {"snippet": "Adzuna teaser about Kafka"}
+    assert job_text(job) == "Backend Engineer Python Adzuna teaser about Kafka"
+
+
+def test_rank_orders_by_similarity_with_missing_keywords():
+    jobs = [
+        _listing("design", "Product Designer", ["communication"]),
+        _listing("backend", "Backend Developer", ["python", "fastapi", "docker"]),
+        _listing("java", "Backend Engineer", ["java", "spring boot", "postgresql"]),
+    ]
+    ranked = rank_jobs(RESUME, jobs, limit=2)
+
+    assert [r.opportunity.id for r in ranked] == ["backend", "java"]
+    assert ranked[0].score > ranked[1].score > 0
+    assert "java" in ranked[1].missing_keywords and "postgresql" not in ranked[1].missing_keywords
+    assert rank_jobs("", jobs, limit=2) == [] and rank_jobs(RESUME, [], limit=2) == []
+
+
+def test_job_vectors_are_reused_until_the_listing_changes():
+    vectors = JobVectors(size=2)
+    job = _listing("a", "Backend Developer", ["python"])
+    with patch.object(job_ranking, "hashed_vectors", wraps=job_ranking.hashed_vectors) as hashed:
+        first = vectors.matrix([job])
+        assert (vectors.matrix([job]) != first).nnz == 0
+        assert hashed.call_count == 1
+
+        changed = _listing("a", "Frontend Developer", ["react"], updated_at=2)
+        assert (vectors.matrix([changed]) != first).nnz > 0
+        assert hashed.call_count == 2
+
+    vectors.matrix([_listing("b", "Tester", []), _listing("c", "Analyst", [])])
+    assert list(vectors._rows) == ["b", "c"]
+
+
+def test_description_terms_count_towards_the_score():
+    plain = _listing("plain", "Engineer", [])
+    described = _listing("described", "Engineer", [], description="Python services on FastAPI with PostgreSQL")
+    assert [r.opportunity.id for r in rank_jobs(RESUME, [plain, described], limit=2)][0] == "described"
@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock, patch
+
+from app.services.link_index import LinkIndex
+
+
+def _db_with_links(links):
+    db = MagicMock()
+    db.execute.return_value.scalars.return_value = iter(links)
+    return db
+
+
+def test_prefetch_only_queries_possible_hits():
+    db = _db_with_links(["https://a.example/1", "https://a.example/2"])
+    index = LinkIndex()
+    index.load(db)
+
+    with patch(
+        "app.services.link_index.opportunity_crud.get_existing_links",
+        return_value={"https://a.example/1": "id-1"},
+    ) as lookup:
+        fresh = index.prefetch(db, ["https://a.example/1", "https://b.example/new", "https://a.example/1"])
+
+    # Only the hash hit goes to the DB, in one call
+    lookup.assert_called_once_with(db, ["https://a.example/1"])
+    assert fresh == ["https://b.example/new"]
+
+
+def test_added_links_are_known_without_db():
+    db = _db_with_links([])
+    index = LinkIndex()
+    index.load(db)
+    index.add("https://c.example/job")
+
+    with patch("app.services.link_index.opportunity_crud.get_existing_links") as lookup:
+        assert index.is_known(db, "https://c.example/job")
+        assert not index.is_known(db, "https://d.example/job")
+        assert index.prefetch(db, ["https://c.example/job"]) == []
+
+    lookup.assert_not_called()
+
+
+def test_reload_keeps_links_still_being_written():
+    index = LinkIndex()
+    index.load(_db_with_links([]))
+    index.add("https://e.example/rolled-back")
+    index.add("https://e.example/unflushed")
+    index.add("https://e.example/committed")
+    index.discard("https://e.example/rolled-back")
+
+    db = _db_with_links([])
+    with patch("app.services.link_index.opportunity_crud.get_existing_links", return_value={}):
+        assert not index.is_known(db, "https://e.example/rolled-back")
+        index.load(_db_with_links(["https://e.example/committed"]))
+        # Another thread's unflushed insert survives the reload
+        assert index.prefetch(db, ["https://e.example/unflushed"]) == []
+
+    assert index._pending == {"https://e.example/unflushed"}
@@ -0,0 +1,46 @@
+from app.services.locations import (
+    location_id,
+    mentions_india_or_remote,
+    normalize_location,
+    resolve_location,
+    resolve_location_ids,
+)
+
+
+def test_aliases_resolve_to_one_id():
+    assert location_id("Bangalore") == location_id("Bengaluru, Karnataka") == "bengaluru"
+    assert location_id("Gurgaon") == location_id("gurugram") == "gurugram"
+    assert location_id("Work from home") == location_id("REMOTE") == "remote"
+    assert location_id("Springfield") is None
+
+
+def test_most_specific_place_wins():
+    assert location_id("Karnataka, India") == "karnataka"
+    assert location_id("Remote - India") == "remote"
+    assert resolve_location("Hyderabad, Telangana, India").name == "Hyderabad"
+    # First text that names a place: structured field, then the description
+    assert location_id("", "Based in our Pune office") == "pune"
+    assert location_id("Chennai", "Teams in Pune") == "chennai"
+
+
+def test_whole_words_only():
+    assert location_id("Punekar Ltd") is None
+    assert location_id("New  Delhi") == "delhi"
+
+
+def test_country_and_state_filters_cover_their_cities():
+    ids = resolve_location_ids(["India"])
+    assert {"india", "karnataka", "bengaluru", "gurugram"} <= ids
+    assert "remote" not in ids
+    assert resolve_location_ids(["Delhi NCR"]) == {"delhi-ncr", "delhi", "gurugram", "noida"}
+    assert resolve_location_ids(["Atlantis"]) == set()
+
+
+def test_portal_filter_and_display_names():
+    assert mentions_india_or_remote("Hiring engineers in Hyderabad")
+    assert mentions_india_or_remote("London", "Fully remote across EMEA")
+    assert not mentions_india_or_remote("Berlin, Germany")
+    assert normalize_location(" bangalore ") == "Bengaluru"
+    assert normalize_location("kolkata") == "Kolkata"
+    assert normalize_location("springfield") == "Springfield"
+    assert normalize_location("  ") is None
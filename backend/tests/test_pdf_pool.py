@@ -0,0 +1,61 @@
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services.pdf_pool import PdfPool, PdfPoolBusy
+
+
+def test_jobs_run_in_worker_processes():
+    pool = PdfPool(workers=1, queue_limit=1)
+    try:
+        assert asyncio.run(pool.run(len, b"%PDF-1.4")) == 8
+    finally:
+        pool.shutdown()
+
+
+def test_saturated_pool_refuses_new_jobs():
+    pool = PdfPool(workers=1, queue_limit=1, timeout=5)
+
+    async def burst():
+        jobs = [asyncio.ensure_future(pool.run(time.sleep, 0.5)) for _ in range(3)]
+        return await asyncio.gather(*jobs, return_exceptions=True)
+
+    try:
+        results = asyncio.run(burst())
+    finally:
+        pool.shutdown()
+    assert results[:2] == [None, None]
+    assert isinstance(results[2], PdfPoolBusy)
+
+
+def test_overrunning_job_times_out_but_keeps_its_slot():
+    pool = PdfPool(workers=1, queue_limit=0)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(pool.run(time.sleep, 1, timeout=0.1))
+        # Still running in the worker, so the pool is still full
+        assert pool.pending == 1
+        with pytest.raises(PdfPoolBusy):
+            asyncio.run(pool.run(len, b""))
+    finally:
+        pool.shutdown()
+
+
+def test_broken_pool_is_replaced():
+    pool = PdfPool(workers=1, queue_limit=1, timeout=10)
+    try:
+        # A worker dying mid-job breaks the executor and fails that job
+        pool.start()
+        broken = pool._executor
+        with pytest.raises(BrokenProcessPool):
+            asyncio.run(pool.run(os._exit, 1))
+
+        # Replaced as soon as the failure surfaced, not on the next submit
+        assert pool._executor is not broken
+        assert pool.pending == 0
+        assert asyncio.run(pool.run(len, b"%PDF")) == 4
+    finally:
+        pool.shutdown()
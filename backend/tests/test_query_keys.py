@@ -0,0 +1,25 @@
+from app.services.query_keys import discovery_key, scan_key
+
+
+def test_equivalent_requests_share_a_key():
+    a = discovery_key(["Python Developer", "Backend Engineer"], ["Bengaluru"])
+    b = discovery_key(["backend  engineer", "python developer!"], ["bengaluru"])
+    assert a == b
+
+
+def test_location_aliases_share_a_key():
+    assert discovery_key(["Python Developer"], ["Bangalore"]) == discovery_key(["Python Developer"], ["Bengaluru"])
+    assert scan_key(["python"], "Gurgaon", None) == scan_key(["python"], "gurugram", None)
+
+
+def test_unknown_location_is_ignored():
+    assert discovery_key(["Python Developer"], ["Unknown"]) == discovery_key(["Python Developer"], [])
+
+
+def test_different_queries_get_different_keys():
+    base = discovery_key(["Python Developer"], ["Bengaluru"])
+    assert base != discovery_key(["Python Developer"], ["Pune"])
+    assert base != discovery_key(["Java Developer"], ["Bengaluru"])
+    assert base != discovery_key(["Python Developer"], ["Bengaluru"], task_type="ATS")
+    assert base != discovery_key(["Python Developer"], ["Bengaluru"], salary_min="1200000")
+    assert base != discovery_key(["Python Developer"], ["Bengaluru"], limit=20)
@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud import queue as queue_crud
+from app.models.queue import SearchStatus
+
+
+def _item(**kwargs):
+    defaults = dict(status=SearchStatus.PENDING, attempts=0, locked_by=None, lease_expires_at=None, last_error=None)
+    return SimpleNamespace(**{**defaults, **kwargs})
+
+
+def test_claim_uses_skip_locked_and_leases_items():
+    fresh = _item()
+    db = MagicMock()
+    db.scalars.return_value.all.return_value = [fresh]
+
+    claimed = queue_crud.claim_pending(db, "host:1", limit=4)
+
+    sql = str(db.scalars.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "LIMIT" in sql
+    assert claimed == [fresh]
+    assert fresh.status == SearchStatus.PROCESSING
+    assert fresh.locked_by == "host:1"
+    assert fresh.attempts == 1
+    db.commit.assert_called_once()
+
+
+def test_expired_item_out_of_attempts_is_failed_not_reclaimed():
+    stale = _item(status=SearchStatus.PROCESSING, attempts=queue_crud.MAX_ATTEMPTS, locked_by="dead:7")
+    db = MagicMock()
+    db.scalars.return_value.all.return_value = [stale]
+
+    assert queue_crud.claim_pending(db, "host:1") == []
+    assert stale.status == SearchStatus.FAILED
+    assert "dead:7" in stale.last_error
+
+
+def test_mark_failed_requeues_until_attempts_exhausted():
+    item = _item(status=SearchStatus.PROCESSING, attempts=1, locked_by="host:1")
+    db = MagicMock()
+    db.get.return_value = item
+
+    queue_crud.mark_failed(db, "id", error="boom", worker_id="host:1")
+    assert item.status == SearchStatus.PENDING
+    assert item.last_error == "boom"
+
+    item.attempts, item.locked_by = queue_crud.MAX_ATTEMPTS, "host:1"
+    queue_crud.mark_failed(db, "id", error="boom", worker_id="host:1")
+    assert item.status == SearchStatus.FAILED
+
+
+def test_stale_worker_cannot_complete_reclaimed_item():
+    item = _item(status=SearchStatus.PROCESSING, attempts=2, locked_by="host:2")
+    db = MagicMock()
+    db.get.return_value = item
+
+    assert queue_crud.mark_completed(db, "id", worker_id="host:1") is None
+    assert item.status == SearchStatus.PROCESSING
+
+
+def test_fan_out_skips_listings_users_already_track():
+    import uuid
+
+    u1, u2 = str(uuid.uuid4()), str(uuid.uuid4())
+    o1, o2 = uuid.uuid4(), uuid.uuid4()
+    item = _item(query="python developer", requesters=[u1, u2])
+    db = MagicMock()
+    db.execute.return_value.all.return_value = [(uuid.UUID(u1), o1)]
+
+    assert queue_crud.fan_out_results(db, item, [o1, o2]) == 3
+    added = {(r.user_id, r.opportunity_id) for r in db.add_all.call_args[0][0]}
+    assert (uuid.UUID(u1), o1) not in added
+
+
+def test_late_requester_gets_completed_results_immediately():
+    import uuid
+
+    late = str(uuid.uuid4())
+    item = _item(status=SearchStatus.COMPLETED, query="q", requesters=[], result_ids=[str(uuid.uuid4())])
+    db = MagicMock()
+    db.execute.return_value.all.return_value = []
+
+    queue_crud.attach_requester(db, item, late)
+
+    assert item.requesters == [late]
+    rows = db.add_all.call_args[0][0]
+    assert [str(r.user_id) for r in rows] == [late]
+
+
+def test_fan_out_skips_requesters_that_are_not_uuids():
+    import uuid
+
+    good = str(uuid.uuid4())
+    item = _item(query="q", requesters=["legacy-user", good])
+    db = MagicMock()
+    db.execute.return_value.all.return_value = []
+
+    assert queue_crud.fan_out_results(db, item, [uuid.uuid4()]) == 1
+    assert [str(r.user_id) for r in db.add_all.call_args[0][0]] == [good]
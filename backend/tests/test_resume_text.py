@@ -0,0 +1,59 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services import resume_text
+from app.services.resume_text import ResumeTextCache, content_sha256, extract_resume_text, extract_resume_text_async
+
+PDF = b"%PDF-1.4 resume bytes"
+
+
+def test_repeat_upload_skips_pdf_parsing():
+    cache = ResumeTextCache()
+    with patch.object(resume_text, "read_pdf_text", return_value="Python developer") as read:
+        assert extract_resume_text(PDF, cache=cache) == "Python developer"
+        assert extract_resume_text(PDF, cache=cache) == "Python developer"
+        extract_resume_text(PDF + b" edited", cache=cache)
+    assert read.call_count == 2
+
+
+def test_stored_upload_text_is_reused():
+    cache, db = ResumeTextCache(), MagicMock()
+    with patch.object(resume_text.user_crud, "get_cv_text", return_value="Stored text") as stored, \
+         patch.object(resume_text, "read_pdf_text") as read:
+        assert extract_resume_text(PDF, db, cache=cache) == "Stored text"
+        assert extract_resume_text(PDF, db, cache=cache) == "Stored text"
+    stored.assert_called_once_with(db, content_sha256(PDF))
+    read.assert_not_called()
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResumeTextCache(size=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+    assert cache.get("b") is None and cache.get("a") == "A" and cache.get("c") == "C"
+
+
+def test_unreadable_pdf_gives_empty_text_and_is_not_cached():
+    cache = ResumeTextCache()
+    assert extract_resume_text(b"not a pdf", cache=cache) == ""
+    assert cache.get(content_sha256(b"not a pdf")) is None
+
+
+def test_async_extraction_parses_misses_in_the_pool():
+    cache, pool = ResumeTextCache(), MagicMock()
+    pool.run = AsyncMock(return_value="Parsed in a worker")
+    assert asyncio.run(extract_resume_text_async(PDF, pool=pool, cache=cache)) == "Parsed in a worker"
+    assert asyncio.run(extract_resume_text_async(PDF, pool=pool, cache=cache)) == "Parsed in a worker"
+    pool.run.assert_awaited_once_with(resume_text.read_pdf_text, PDF)
+
+
+def test_async_extraction_looks_up_stored_text_off_the_loop():
+    cache, db, pool = ResumeTextCache(), MagicMock(), MagicMock()
+    pool.run = AsyncMock()
+    with patch.object(resume_text.user_crud, "get_cv_text", return_value="Stored text"), \
+         patch.object(resume_text.asyncio, "to_thread", wraps=asyncio.to_thread) as to_thread:
+        assert asyncio.run(extract_resume_text_async(PDF, db, pool=pool, cache=cache)) == "Stored text"
+    to_thread.assert_called_once_with(resume_text._stored_text, content_sha256(PDF), db)
+    pool.run.assert_not_awaited()
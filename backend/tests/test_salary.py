@@ -0,0 +1,38 @@
+from app.services.classifier import classify, classify_batch
+from app.services.salary import Salary, normalize_salary, parse_period, parse_salary_floor
+
+
+def test_provider_periods_are_annualized():
+    assert parse_period("per-month-salary") == "month"
+    assert parse_period("1 YEAR") == "year"
+    assert parse_period("hourly") == "hour"
+    assert parse_period("per-fortnight") is None
+    assert normalize_salary(150000, 200000, "month") == Salary(1800000, 2400000, "month", 1.0)
+    assert normalize_salary(None, 900000) == Salary(900000, 900000, "year", 1.0)
+
+
+def test_unusable_figures_are_dropped():
+    assert normalize_salary(None, None) is None
+    assert normalize_salary(float("nan"), 0) is None
+    assert normalize_salary(100000, 150000, "year", currency="USD") is None
+    assert normalize_salary(1000, 2000, None) is None
+
+
+def test_description_salary_carries_rule_period_and_confidence():
+    assert classify("Engineer", "Compensation: 12-18 LPA.").salary == Salary(1200000, 1800000, "year", 0.8)
+    assert classify("Intern", "Stipend 25k per month.").salary == Salary(300000, 300000, "month", 0.5)
+    assert classify("Engineer", "Salary INR 45000.").salary.period == "month"
+    assert classify("Engineer", "Salary INR 900000.").salary.annual_max == 900000
+
+    batch = classify_batch(["Engineer", "Engineer"], ["4-6 LPA", "No figures here"])
+    assert batch.salary_annual_max == [600000, None]
+    assert batch.salary(0) == Salary(400000, 600000, "year", 0.8)
+    assert batch.salary(1) is None
+
+
+def test_user_salary_floor():
+    assert parse_salary_floor("12 LPA") == 1200000
+    assert parse_salary_floor("12") == 1200000
+    assert parse_salary_floor("1,200,000") == 1200000
+    assert parse_salary_floor("") is None
+    assert parse_salary_floor("lots") is None
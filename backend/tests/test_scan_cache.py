@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from app.services import job_discovery
+from app.services.query_keys import scan_key
+from app.services.skills import canonical_skill
+
+
+def test_scan_key_normalizes_query():
+    assert scan_key(["Python", "FastAPI"], "Bengaluru", None) == scan_key(["fastapi", " python "], "bengaluru", "")
+    assert scan_key(["Python"], "Bengaluru", None) != scan_key(["Python"], "Bengaluru", "10 LPA")
+
+
+def test_cache_hit_skips_adzuna():
+    db = MagicMock()
+    cached = SimpleNamespace(result_ids=["id-1", "id-2"])
+    with patch.object(job_discovery.scan_crud, "get_scan", return_value=cached), \
+         patch.object(job_discovery.scan_crud, "get_opportunities_by_ids", return_value=["op-1", "op-2"]) as load, \
+         patch.object(job_discovery, "_fetch_adzuna_jobs") as fetch:
+        result = job_discovery.discover_jobs(db, ["Python"], "Pune", limit=5, identifier="u-cache-hit")
+
+    fetch.assert_not_called()
+    load.assert_called_once_with(db, ["id-1", "id-2"], limit=5)
+    assert result == ["op-1", "op-2"]
+
+
+def test_rate_limited_without_cache_matches_stored_skill_ids():
+    db = MagicMock()
+    with patch.object(job_discovery.scan_crud, "get_scan", return_value=None), \
+         patch.object(job_discovery, "_check_rate_limit", return_value=False), \
+         patch.object(job_discovery.opportunity_crud, "match_opportunities", return_value=["match"]) as match, \
+         patch.object(job_discovery.opportunity_crud, "list_opportunities") as unfiltered:
+        result = job_discovery.discover_jobs(db, ["Python", "NodeJS"], "Pune", limit=5, identifier="u-limited")
+
+    match.assert_called_once_with(
+        db, [canonical_skill("python").id, canonical_skill("node.js").id], "Pune", limit=5, salary_min=None
+    )
+    unfiltered.assert_not_called()
+    assert result == ["match"]
+
+
+def test_rate_limited_unknown_skills_fall_back_to_title_search():
+    db = MagicMock()
+    with patch.object(job_discovery.scan_crud, "get_scan", return_value=None), \
+         patch.object(job_discovery, "_check_rate_limit", return_value=False), \
+         patch.object(job_discovery.opportunity_crud, "search_opportunities", return_value=["match"]) as search, \
+         patch.object(job_discovery.opportunity_crud, "list_opportunities") as unfiltered:
+        result = job_discovery.discover_jobs(db, ["Salesforce Admin"], "Pune", limit=5, identifier="u-limited-2")
+
+    search.assert_called_once_with(db, ["Salesforce Admin"], "Pune", limit=5, salary_min=None)
+    unfiltered.assert_not_called()
+    assert result == ["match"]
+
+
+def test_salary_floor_is_normalized_to_annual_inr():
+    db = MagicMock()
+    with patch.object(job_discovery.scan_crud, "get_scan", return_value=None), \
+         patch.object(job_discovery, "_check_rate_limit", return_value=False), \
+         patch.object(job_discovery.opportunity_crud, "match_opportunities", return_value=[]) as match:
+        job_discovery.discover_jobs(db, ["Python"], None, salary_min="12 LPA", identifier="u-salary")
+
+    assert match.call_args.kwargs["salary_min"] == 1200000
+
+
+def test_live_scan_records_new_and_known_listing_ids():
+    db = MagicMock()
+    jobs = [
+        {"role": "Python Dev", "company": "A", "link": "https://a/1", "snippet": "", "source": "Adzuna"},
+        {"role": "Python Dev", "company": "B", "link": "https://b/2", "snippet": "", "source": "Adzuna"},
+    ]
+    with patch.object(job_discovery.scan_crud, "get_scan", return_value=None), \
+         patch.object(job_discovery, "_check_rate_limit", return_value=True), \
+         patch.object(job_discovery, "_fetch_adzuna_jobs", return_value=jobs), \
+         patch.object(job_discovery.opportunity_crud, "get_existing_links", return_value={"https://a/1": "known"}), \
+         patch.object(job_discovery.opportunity_crud, "create_opportunity", return_value=SimpleNamespace(id="new")), \
+         patch.object(job_discovery.scan_crud, "record_scan") as record, \
+         patch.object(job_discovery.scan_crud, "get_opportunities_by_ids", return_value=[]):
+        job_discovery.discover_jobs(db, ["Python"], "Pune", identifier="u-live")
+
+    assert record.call_args[0][4] == ["known", "new"]
@@ -0,0 +1,62 @@
+from app.services.skills import (
+    SKILLS, canonical_keys, canonical_skill, find_skills, resolve_skill_ids, skill_ids, skill_vector, skills_in,
+)
+
+
+def test_ids_keys_and_forms_are_unique():
+    keys = [skill.key for skill in SKILLS.values()]
+    assert len(keys) == len(set(keys))
+    forms = [f.lower() for skill in SKILLS.values() for f in (skill.key,) + skill.synonyms]
+    assert len(forms) == len(set(forms))
+
+
+def test_hits_respect_word_boundaries():
+    text = "JavaScript and TypeScript, some Java; C++ and C# too."
+    assert [(h.skill.key, h.text) for h in find_skills(text)] == [
+        ("javascript", "JavaScript"), ("typescript", "TypeScript"), ("java", "Java"), ("c++", "C++"), ("c#", "C#"),
+    ]
+    assert "js" not in [h.text.lower() for h in find_skills("Built with Node.js and Next.js")]
+
+
+def test_synonyms_resolve_to_one_canonical_skill():
+    hits = find_skills("NodeJS, node.js and Node JS; postgres / PostgreSQL; k8s")
+    assert [h.skill.key for h in hits] == ["node.js"] * 3 + ["postgresql"] * 2 + ["kubernetes"]
+    assert [s.key for s in skills_in("NodeJS, node.js and Node JS")] == ["node.js"]
+
+
+def test_positions_index_the_original_text():
+    text = "Experience with Machine\nLearning and AWS"
+    hit = find_skills(text)[0]
+    assert hit.skill.key == "machine learning"
+    assert text[hit.start:hit.end] == hit.text == "Machine\nLearning"
+    assert skill_ids(text) == {canonical_skill("ML").id, canonical_skill("aws").id}
+
+
+def test_user_entered_names_map_to_keys():
+    assert canonical_skill("ReactJS").key == "react"
+    assert canonical_skill("Underwater Basket Weaving") is None
+    assert canonical_keys(["Golang", "  Problem   Solving ", "COBOL"]) == {"go", "problem solving", "cobol"}
+
+
+def test_skill_vector_is_sorted_and_distinct_across_texts():
+    python, django, aws = (canonical_skill(k).id for k in ("python", "django", "aws"))
+    assert skill_vector("Python Developer", "Django, python3 and AWS") == sorted({python, django, aws})
+    assert skill_vector("", None) == []
+
+
+def test_resolve_skill_ids_reports_unknown_names():
+    ids, unknown = resolve_skill_ids(["ReactJS", "react", "COBOL"])
+    assert ids == [canonical_skill("react").id]
+    assert unknown == ["COBOL"]
+
+
+def test_ambiguous_words_are_not_skills_in_text():
+    text = "Go above and beyond in this Spring internship; oops, no rust belt or swift delivery, just 500 ml."
+    assert find_skills(text) == []
+    assert [h.skill.key for h in find_skills("Golang, Spring Boot, rust-lang and SwiftUI")] == [
+        "go", "spring", "rust", "swift",
+    ]
+    # Users typing the short names still get the skill
+    assert canonical_keys(["Go", "Spring", "ML", "OOPS"]) == {
+        "go", "spring", "machine learning", "object oriented programming",
+    }
@@ -0,0 +1,39 @@
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.services.ats_logic import ATSAnalyzer
+from app.services.text_vectors import hashed_vectors, match_score, missing_terms, term_vector, tokenize
+
+RESUME = "Python developer. Built FastAPI services on AWS with Docker; some JavaScript and SQL."
+JD = "We need a Java engineer: Java, Spring, SQL and AWS. Python is a plus. Java Java."
+
+
+def test_score_matches_count_vectorizer_cosine():
+    matrix = CountVectorizer().fit_transform([RESUME, JD])
+    expected = round(cosine_similarity(matrix)[0][1] * 100, 2)
+    assert match_score(term_vector(RESUME), term_vector(JD)) == expected
+    assert ATSAnalyzer().calculate_score(RESUME, JD) == expected
+
+
+def test_missing_terms_are_whole_words():
+    missing = missing_terms(term_vector(RESUME), term_vector(JD), 20)
+    # "java" is not found inside "javascript"; stop words never count
+    assert "java" in missing and "spring" in missing
+    assert "python" not in missing and "sql" not in missing
+    assert "need" in missing and "we" not in missing
+    assert missing == sorted(missing)
+    assert missing_terms(term_vector(RESUME), term_vector(JD), 1) == ["java"]
+
+
+def test_empty_texts_score_zero():
+    assert tokenize(None) == []
+    assert match_score(term_vector(""), term_vector(JD)) == 0
+    assert ATSAnalyzer().calculate_score("", JD) == 0
+    assert ATSAnalyzer().get_missing_keywords(RESUME, "") == []
+
+
+def test_hashed_vectors_score_one_against_many():
+    jobs = hashed_vectors([JD, RESUME, ""])
+    scores = jobs.dot(hashed_vectors([RESUME]).T).toarray().ravel()
+    assert round(scores[0] * 100, 2) == match_score(term_vector(RESUME), term_vector(JD))
+    assert round(scores[1], 6) == 1.0 and scores[2] == 0
@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud import watermark as watermark_crud
+
+
+def test_advance_normalizes_keys_and_never_moves_backwards():
+    db = MagicMock()
+    newest = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+    watermark_crud.advance_watermark(db, "adzuna", "Python  Developer", " India", newest)
+
+    stmt = db.execute.call_args[0][0]
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (source, query, location) DO UPDATE" in sql
+    assert "greatest(agent_watermarks.newest_at, excluded.newest_at)" in sql
+    assert (params["query"], params["location"]) == ("python developer", "india")
+    db.commit.assert_called_once()
+
+
+def test_get_looks_up_the_normalized_key():
+    db = MagicMock()
+    db.scalar.return_value = None
+
+    assert watermark_crud.get_watermark(db, "jobspy", "Data  Analyst", "Pune") is None
+    params = db.scalar.call_args[0][0].compile(dialect=postgresql.dialect()).params
+    assert params == {"source_1": "jobspy", "query_1": "data analyst", "location_1": "pune"}
@@ -1,742 +1,1451 @@
-import os
-import sys
-import requests
-import json
-import re
-import io
-import pandas as pd
-from datetime import datetime
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-from jobspy import scrape_jobs
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from pypdf import PdfReader
-
-# Add backend to path to import models
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
-
-from app.models import Opportunity, OpportunitySource, JobType, WorkMode, OpportunityStatus
-
-# =============================================================================
-# CONFIGURATION & SETUP
-# =============================================================================
-
-# Load Environment Variables
-env_path = os.path.join(os.path.dirname(__file__), '..', 'backend', '.env')
-load_dotenv(env_path)
-
-# Adzuna Credentials
-ADZUNA_APP_ID = os.getenv("ADZUNA_APP_ID", "232e9909")
-ADZUNA_APP_KEY = os.getenv("ADZUNA_APP_KEY", "8684c36be9f52ee7718e33d523f96845")
-
-# Database Setup
-DATABASE_URL = os.getenv("DATABASE_URL")
-if DATABASE_URL and DATABASE_URL.startswith("postgresql://"):
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
-
-engine = create_engine(DATABASE_URL, pool_size=1, max_overflow=0)
-SessionLocal = sessionmaker(bind=engine)
-
-# =============================================================================
-# CONSTANTS & UTILITIES
-# =============================================================================
-
-# Common Tech Keywords for ATS Filtering
-TECH_KEYWORDS = {
-    "python", "java", "c++", "c#", "javascript", "typescript", "ruby", "php", "swift", "kotlin", "go", "rust",
-    "html", "css", "react", "angular", "vue", "nextjs", "node.js", "django", "flask", "fastapi", "spring", "asp.net",
-    "sql", "mysql", "postgresql", "mongodb", "redis", "elasticsearch", "cassandra", "dynamodb",
-    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ansible", "jenkins", "gitlab ci", "github actions",
-    "git", "linux", "unix", "bash", "shell scripting",
-    "machine learning", "deep learning", "nlp", "computer vision", "tensorflow", "pytorch", "keras", "scikit-learn", "pandas", "numpy",
-    "data science", "data analysis", "big data", "hadoop", "spark", "kafka", "airflow",
-    "agile", "scrum", "kanban", "jira", "confluence",
-    "rest api", "graphql", "grpc", "microservices", "serverless",
-    "object oriented programming", "functional programming", "data structures", "algorithms",
-    "communication", "leadership", "problem solving", "teamwork", "critical thinking"
-}
-
-class ATSAnalyzer:
-    """Helper class to analyze resume vs job description."""
-    
-    def calculate_score(self, resume_text, jd_text):
-        if not resume_text or not jd_text:
-            return 0
-        text_list = [resume_text, jd_text]
-        cv = CountVectorizer()
-        count_matrix = cv.fit_transform(text_list)
-        match_percentage = cosine_similarity(count_matrix)[0][1] * 100
-        return round(match_percentage, 2)
-
-    def get_missing_keywords(self, resume_text, jd_text):
-        if not jd_text:
-            return []
-            
-        # 1. Extract potential keywords from JD
-        cv = CountVectorizer(stop_words='english', max_features=100)
-        try:
-            cv.fit([jd_text])
-            jd_keywords = cv.get_feature_names_out()
-        except ValueError:
-            return []
-        
-        resume_lower = resume_text.lower()
-        missing_candidates = []
-        
-        # 2. Identify missing keywords
-        for keyword in jd_keywords:
-            if not re.search(r'\b' + re.escape(keyword) + r'\b', resume_lower):
-                missing_candidates.append(keyword)
-                
-        # 3. Filter against known tech keywords
-        clean_missing = [word for word in missing_candidates if word in TECH_KEYWORDS]
-        
-        # 4. Fallback if no specific tech keywords found
-        if not clean_missing:
-             return missing_candidates[:5]
-             
-        return clean_missing[:10]
-
-def is_entry_level(title, description, experience_years=0):
-    """
-    Returns True if the job matches the experience level requirements.
-    Acts as a 'Strict Bouncer' for freshers.
-    """
-    if experience_years > 0:
-        return True # Handled by query logic for experienced roles
-        
-    title_lower = title.lower()
-    desc_lower = description.lower()
-    
-    senior_titles = ["senior", "lead", "principal", "manager", "architect", "head", "vp", "director"]
-    junior_titles = ["junior", "jr", "intern", "trainee", "entry level", "fresher", "graduate"]
-
-    # 1. Block Senior Titles
-    if any(t in title_lower for t in senior_titles):
-        print(f"   🚫 Bounced by Title: {title}")
-        return False
-        
-    # 2. Allow Junior Titles (Bypass desc check)
-    if any(t in title_lower for t in junior_titles):
-        return True
-
-    # 3. Check Description for Experience Requirements
-    # Matches "Minimum 2+ years", "Requires 3 years"
-    strict_min_exp_pattern = r"(minimum|required|requires|experience)\s*(?:of|:)?\s*[2-9]\s*(?:\+|plus)?\s*(?:years|yrs)"
-    
-    match = re.search(strict_min_exp_pattern, desc_lower)
-    if match:
-        print(f"   🚫 Bounced by Desc (Strict Exp): {title} | Matched: '{match.group(0)}'")
-        return False
-        
-    return True
-
-def detect_job_type(title, description):
-    """Determines JobType based on keywords."""
-    t_lower = title.lower()
-    d_lower = description.lower()
-    
-    def has_word(text, word):
-        return re.search(r'\b' + re.escape(word) + r'\b', text) is not None
-
-    intern_keywords = ['intern', 'internship', 'trainee', 'apprentice', 'students', 'summer', 'placement']
-    if any(k in t_lower for k in intern_keywords) or any(has_word(d_lower, k) for k in intern_keywords):
-        return JobType.INTERNSHIP
-
-    contract_keywords = ['contract', 'freelance', 'temporary', 'part-time', 'part time']
-    if any(k in t_lower for k in contract_keywords) or any(has_word(d_lower, k) for k in contract_keywords):
-        return JobType.CONTRACT
-
-    return JobType.FULL_TIME
-
-def extract_salary(description):
-    """Extracts salary from description using Regex."""
-    if not description: return None, None
-    desc = description.lower()
-    
-    # Pattern 1: LPA
-    lpa_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:-|to)?\s*(\d+(?:\.\d+)?)?\s*lpa', desc)
-    if lpa_match:
-        try:
-            min_lpa = float(lpa_match.group(1))
-            max_lpa = float(lpa_match.group(2)) if lpa_match.group(2) else min_lpa
-            return int(min_lpa * 100000), int(max_lpa * 100000)
-        except: pass
-
-    # Pattern 2: Monthly 'k'
-    k_matches = re.findall(r'(\d{2,3})\s*k', desc)
-    if k_matches:
-        try:
-            vals = [int(x) * 1000 for x in k_matches]
-            vals.sort()
-            if len(vals) >= 2: return vals[0], vals[-1]
-            return vals[0], vals[0]
-        except: pass
-
-    # Pattern 3: Explicit Rupees
-    rs_matches = re.findall(r'(?:rs\.?|₹|inr)\s*(\d{1,3}(?:,\d{3})*(?:000|500))', desc)
-    if rs_matches:
-        try:
-            vals = [int(x.replace(',', '')) for x in rs_matches]
-            vals.sort()
-            clean_vals = [v for v in vals if v > 1000]
-            if clean_vals:
-                if len(clean_vals) >= 2: return clean_vals[0], clean_vals[-1]
-                return clean_vals[0], clean_vals[0]
-        except: pass
-
-    return None, None
-
-# =============================================================================
-# DATA PROCESSING HELPERS
-# =============================================================================
-
-def _process_adzuna_job(job_data, db, location, query, experience_years):
-    """Parses and saves a single Adzuna job result."""
-    apply_link = job_data.get("redirect_url")
-    if not apply_link: return False
-    
-    if db.query(Opportunity).filter(Opportunity.apply_link == apply_link).first():
-        return False
-
-    description = job_data.get("description", "")
-    role_title = job_data.get("title")
-    
-    if not is_entry_level(role_title, description, experience_years):
-        print(f"🚫 Adzuna Bouncer Skipped: {role_title}")
-        return False
-
-    # Smart Parsing
-    job_type = detect_job_type(role_title, description)
-    
-    work_mode = WorkMode.ONSITE
-    if "remote" in location.lower() or "remote" in description.lower():
-        work_mode = WorkMode.REMOTE
-    elif "hybrid" in description.lower():
-        work_mode = WorkMode.HYBRID
-    
-    salary_min = job_data.get("salary_min")
-    salary_max = job_data.get("salary_max")
-    
-    if not salary_min:
-        salary_min, salary_max = extract_salary(description)
-        if salary_min: print(f"   💰 Extracted Salary: ₹{salary_min}")
-
-    op = Opportunity(
-        company_name=job_data.get("company", {}).get("display_name", "Unknown"),
-        role_title=role_title,
-        apply_link=apply_link,
-        location=job_data.get("location", {}).get("display_name", location),
-        source=OpportunitySource.OTHER, 
-        status=OpportunityStatus.OPEN,
-        job_type=job_type,
-        work_mode=work_mode,
-        salary_min=salary_min,
-        salary_max=salary_max,
-        source_metadata={
-            "origin": "adzuna", 
-            "query": query,
-            "description": description,
-            "adzuna_id": job_data.get("id")
-        }
-    )
-    db.add(op)
-    return True
-
-def _process_jobspy_row(row, db, location, experience_years):
-    """Parses and saves a single JobSpy result row."""
-    job_url = row.get('job_url')
-    if not job_url or pd.isna(job_url): return False
-    
-    def safe_get(key, default=""):
-        val = row.get(key)
-        if pd.isna(val): return default
-        return str(val)
-
-    description = safe_get('description')
-    role_title = safe_get('title', 'Unknown Role')
-    
-    if not description: return False
-    
-    if not is_entry_level(role_title, description, experience_years):
-        print(f"🚫 JobSpy Bouncer Skipped: {role_title}")
-        return False
-        
-    if db.query(Opportunity).filter(Opportunity.apply_link == job_url).first():
-        return False
-    
-    source = OpportunitySource.OTHER
-    if any(d in job_url for d in ['greenhouse', 'workday', 'lever']):
-        source = OpportunitySource.OFFICIAL
-    
-    job_type = detect_job_type(role_title, description)
-    
-    work_mode = WorkMode.ONSITE
-    loc_val = safe_get('location', location)
-    if "remote" in loc_val.lower() or "remote" in description.lower():
-        work_mode = WorkMode.REMOTE
-    elif "hybrid" in description.lower():
-        work_mode = WorkMode.HYBRID
-
-    s_min = row.get('min_amount')
-    s_max = row.get('max_amount')
-    if pd.isna(s_min): s_min = None
-    if pd.isna(s_max): s_max = None
-    
-    if not s_min:
-        s_min, s_max = extract_salary(description)
-        if s_min: print(f"   💰 Extracted Salary: ₹{s_min}")
-
-    op = Opportunity(
-        company_name=safe_get('company', 'Unknown'),
-        role_title=role_title,
-        apply_link=job_url,
-        location=loc_val,
-        source=source,
-        status=OpportunityStatus.OPEN,
-        job_type=job_type,
-        work_mode=work_mode,
-        salary_min=s_min,
-        salary_max=s_max,
-        source_metadata={
-            "origin": "JobSpy",
-            "site": safe_get('site'),
-            "description": description[:500]
-        }
-    )
-    db.add(op)
-    return True
-
-def _scan_company_portal(company, portal_link, role_filters, db):
-    """
-    Crawls a single company career page.
-    Returns number of jobs saved.
-    """
-    try:
-        resp = requests.get(portal_link, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-        if resp.status_code != 200:
-            return 0, resp.status_code
-        
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        links = soup.find_all('a', href=True)
-        
-        # Static Link Detection
-        job_links = set()
-        trusted_domains = ["greenhouse.io", "lever.co", "workday.com", "myworkdayjobs.com", "smartrecruiters.com", "ashbyhq.com"]
-        path_keywords = ["/job/", "/careers/", "/position/", "/opening/", "/role/"]
-        
-        for link in links:
-            href = link['href']
-            full_url = urljoin(portal_link, href)
-            
-            is_ats = any(d in full_url for d in trusted_domains)
-            is_internal = any(k in full_url for k in path_keywords) and len(full_url) > len(portal_link) + 5
-            
-            if is_ats or is_internal:
-                job_links.add(full_url)
-
-        if not job_links:
-            return 0, "NO_LINKS"
-
-        # Limit to avoid hanging on massive sites
-        job_links = list(job_links)[:8]
-        saved_count = 0
-        
-        for j_url in job_links:
-            if db.query(Opportunity).filter(Opportunity.apply_link == j_url).first():
-                continue
-            
-            try:
-                j_resp = requests.get(j_url, timeout=6, headers={"User-Agent": "Mozilla/5.0"})
-                j_soup = BeautifulSoup(j_resp.text, 'html.parser')
-                
-                title = ""
-                if j_soup.h1: title = j_soup.h1.get_text().strip()
-                elif j_soup.title: title = j_soup.title.get_text().strip()
-                
-                if not title: continue
-                
-                # Check against ALL desired roles
-                title_match = any(r.lower() in title.lower() for r in role_filters)
-                if not title_match: continue
-
-                description = j_soup.get_text()
-                if not is_entry_level(title, description, 0): continue
-                
-                desc_lower = description.lower()
-                if "india" not in desc_lower and "bangalore" not in desc_lower and "remote" not in desc_lower:
-                    continue
-
-                op = Opportunity(
-                    company_name=company,
-                    role_title=title,
-                    apply_link=j_url,
-                    location="India (Official)",
-                    source=OpportunitySource.OFFICIAL, 
-                    status=OpportunityStatus.OPEN,
-                    job_type=detect_job_type(title, description),
-                    work_mode=WorkMode.ONSITE,
-                    source_metadata={"origin": "kb_trusted_crawl", "portal": portal_link}
-                )
-                db.add(op)
-                saved_count += 1
-                
-            except Exception: continue
-            
-        return saved_count, "OK"
-        
-    except Exception as e:
-        return 0, str(e)
-
-# =============================================================================
-# MAIN FETCHERS (Direct Parameter API)
-# =============================================================================
-
-def fetch_adzuna(query, location, filters, db):
-    """Fetches jobs from Adzuna API.
-    
-    Args:
-        query: Search query string (e.g. "Software Engineer")
-        location: Location string (e.g. "India", "Remote")
-        filters: Dict with optional keys: experience_years, is_internship, is_remote
-        db: SQLAlchemy session
-    """
-    print(f"🕵️ Adzuna Search: '{query}' in {location}")
-    
-    try: experience_years = int(filters.get("experience_years", 0))
-    except: experience_years = 0
-    print(f"   🎓 Experience Level: {experience_years} Years")
-
-    # Construct excluded keywords logic
-    excluded_keywords = ""
-    if experience_years == 0:
-        excluded_keywords = "Senior Lead Principal Manager Architect Head VP Director"
-    elif 1 <= experience_years <= 3:
-        excluded_keywords = "Principal Director VP Head Architect"
-
-    query_extras = " Internship" if filters.get("is_internship") else ""
-    
-    sub_queries = [q.strip() for q in query.split(" OR ")] if " OR " in query else [query]
-    sub_queries = sub_queries[:3] # Rate limit protection
-    
-    total_saved = 0
-    
-    for q in sub_queries:
-        if not q: continue
-        full_query = q + query_extras
-        
-        params = {
-            "app_id": ADZUNA_APP_ID,
-            "app_key": ADZUNA_APP_KEY,
-            "results_per_page": 20,
-            "what": full_query, 
-            "what_exclude": excluded_keywords,
-            "where": location,
-            "content-type": "application/json"
-        }
-        
-        print(f"🌍 Fetching Adzuna (FAST): '{full_query}' in {location}")
-        
-        try:
-            url = "https://api.adzuna.com/v1/api/jobs/in/search/1"
-            response = requests.get(url, params=params)
-            data = response.json() if response.status_code == 200 else {}
-            results = data.get("results", [])
-            
-            for job in results:
-                if _process_adzuna_job(job, db, location, q, experience_years):
-                    total_saved += 1
-                    
-        except Exception as e:
-            print(f"❌ Adzuna Error for '{q}': {e}")
-            continue
-            
-    print(f"💾 Adzuna Saved Total: {total_saved}")
-    return total_saved
-
-def fetch_jobspy(query, location, filters, db):
-    """Fetches jobs using JobSpy scraper (Deep Scan).
-    
-    Args:
-        query: Search query string
-        location: Location string
-        filters: Dict with optional keys: experience_years, is_internship
-        db: SQLAlchemy session
-    """
-    try: experience_years = int(filters.get("experience_years", 0))
-    except: experience_years = 0
-        
-    print(f"🕵️ JobSpy Deep Scan: '{query}' in {location}, Exp: {experience_years}")
-    
-    try:
-        job_type_param = "internship" if filters.get("is_internship") else "fulltime"
-        
-        jobs: pd.DataFrame = scrape_jobs(
-            site_name=["indeed", "linkedin", "glassdoor", "google", "zip_recruiter"],
-            search_term=query,
-            location=location,
-            results_wanted=20,
-            job_type=job_type_param,
-            country_indeed='India'
-        )
-        
-        if not jobs.empty:
-            print(f"📊 JobSpy Results by Site:\n{jobs['site'].value_counts()}")
-        else:
-            print("⚠️ JobSpy returned 0 results.")
-
-        spy_count = 0
-        for index, row in jobs.iterrows():
-            if _process_jobspy_row(row, db, location, experience_years):
-                spy_count += 1
-                
-        print(f"💾 JobSpy Saved: {spy_count}")
-        return spy_count
-    except Exception as e:
-        print(f"❌ JobSpy Failed: {e}")
-        return 0
-
-def fetch_knowledge_base_career_pages(db, role_filters):
-    """
-    Crawls official career pages using 'career_page_status.json'.
-    Self-optimizes by skipping known 'NON-WORKING' sites.
-    """
-    base_dir = os.path.dirname(__file__)
-    kb_path = os.path.join(base_dir, 'career_page_status.json')
-
-    if not os.path.exists(kb_path):
-        print("⚠️ career_page_status.json not found. Skipping Official Layer.")
-        return 0
-
-    try:
-        with open(kb_path, 'r') as f:
-            company_status = json.load(f)
-    except Exception:
-        print("⚠️ Failed to load Knowledge Base JSON.")
-        return 0
-    
-    # Identify Working Candidates
-    scan_queue = []
-    skipped_count = 0
-    for company, data in company_status.items():
-        if data.get('status') == 'NON-WORKING':
-            skipped_count += 1
-            continue
-        if not data.get('portal'): continue
-        scan_queue.append({"company": company, "portal": data.get('portal')})
-
-    print(f"📉 Optimization: Skipped {skipped_count} known non-working companies.")
-    print(f"🔍 Deep Scan started for {len(scan_queue)} optimized companies...")
-
-    saved_count = 0
-    total_companies = len(scan_queue)
-    
-    for idx, item in enumerate(scan_queue):
-        company = item["company"]
-        portal = item["portal"]
-        prefix = f"[{idx+1}/{total_companies}] 🏢 {company}"
-        
-        # Scan
-        count, status = _scan_company_portal(company, portal, role_filters, db)
-        
-        # Logging & Learning
-        if status == "NO_LINKS":
-            print(f"{prefix} → NON-WORKING (JS-rendered/No links)")
-            company_status[company] = {
-                "status": "NON-WORKING", 
-                "reason": "No static links",
-                "last_checked": str(datetime.now())
-            }
-        elif isinstance(status, int) and status != 200:
-             print(f"{prefix} → ⚠️ Unreachable ({status})")
-             if status in [403, 404]:
-                 company_status[company] = {
-                    "status": "NON-WORKING",
-                    "reason": f"HTTP {status}",
-                    "last_checked": str(datetime.now())
-                }
-        elif status == "OK":
-             print(f"{prefix} → WORKING ({count} saved)")
-             saved_count += count
-             company_status[company]['last_checked'] = str(datetime.now())
-             company_status[company]['status'] = 'WORKING'
-        else:
-             print(f"{prefix} → ERROR ({status})")
-
-    # Persist Knowledge Base
-    try:
-        with open(kb_path, 'w') as f:
-            json.dump(company_status, f, indent=2)
-    except Exception as e:
-        print(f"⚠️ Failed to save KB cache: {e}")
-
-    if saved_count > 0:
-        db.commit()
-    
-    print(f"💎 Knowledge Base Scan Saved Total: {saved_count}")
-    return saved_count
-
-# =============================================================================
-# HANDLERS (Direct Parameter API)
-# =============================================================================
-
-def run_search(skills, location="India", job_type=None, limit=20, scan_mode="FAST", experience_years=0, db=None):
-    """Orchestrates job search with direct parameters.
-    
-    Args:
-        skills: List of skill/role strings to search for
-        location: Location string (default "India")
-        job_type: Optional "internship" or "fulltime"
-        limit: Max results per query (default 20)
-        scan_mode: "FAST" (Adzuna) or "DEEP" (JobSpy)
-        experience_years: Years of experience (default 0)
-        db: SQLAlchemy session
-    """
-    if not skills:
-        print("❌ No skills/roles provided. Aborting.")
-        return
-
-    search_roles = skills if isinstance(skills, list) else [skills]
-    search_roles = list(set([r for r in search_roles if r]))
-    
-    print(f"🔎 Searching for roles: {search_roles}")
-    print(f"   📍 Location: {location} | Mode: {scan_mode} | Exp: {experience_years}y")
-
-    filters = {
-        "experience_years": experience_years,
-        "is_internship": job_type == "internship",
-        "is_remote": location.lower() == "remote",
-    }
-
-    for role in search_roles:
-        print(f"🔎 Hunting for Role: {role}")
-        
-        if scan_mode == "DEEP":
-            fetch_jobspy(role, location, filters, db)
-        else:
-            saved_count = fetch_adzuna(role, location, filters, db)
-            if saved_count < 3:
-                 print(f"⚠️ Low results for '{role}'. Auto-triggering Deep Scan...")
-                 fetch_jobspy(role, location, filters, db)
-
-    db.commit()
-    print("✅ Search completed.")
-
-def handle_ats_task(resume_text, job_description, user_id, job_id=None, resume_url=None, db=None):
-    """Analyzes a resume against a job description.
-    
-    Args:
-        resume_text: Raw resume text
-        job_description: Raw job description text
-        user_id: User ID for storing results
-        job_id: Optional job ID
-        resume_url: Optional URL to download PDF resume from
-        db: SQLAlchemy session
-    """
-    print(f"📄 Processing ATS analysis for user: {user_id}")
-
-    if resume_url:
-        print(f"   📥 Downloading Resume: {resume_url}")
-        try:
-            response = requests.get(resume_url)
-            if response.status_code == 200:
-                with io.BytesIO(response.content) as f:
-                    reader = PdfReader(f)
-                    extracted = ""
-                    for page in reader.pages: extracted += page.extract_text() + "\n"
-                    
-                    if extracted.strip():
-                        resume_text = extracted
-                        print(f"   ✅ Extracted {len(resume_text)} chars")
-            else:
-                print(f"   ❌ Failed to download PDF: {response.status_code}")
-        except Exception as e:
-            print(f"   ❌ PDF Error: {e}")
-
-    analyzer = ATSAnalyzer()
-    score = analyzer.calculate_score(resume_text, job_description)
-    missing = analyzer.get_missing_keywords(resume_text, job_description)
-    
-    recommendations = []
-    if missing: recommendations.append(f"Missing keywords: {', '.join(missing[:5])}")
-    if score < 50: recommendations.append("Low match score. Tailor your resume.")
-    
-    try:
-        stmt = text("""
-            INSERT INTO resume_scores (user_id, job_id, score, missing_keywords, recommendations)
-            VALUES (:user_id, :job_id, :score, :missing, :recs)
-        """)
-        db.execute(stmt, {
-            "user_id": user_id, "job_id": job_id, "score": score,
-            "missing": json.dumps(missing), "recs": json.dumps(recommendations)
-        })
-        print(f"✅ ATS Score Saved: {score}")
-    except Exception as e:
-        print(f"❌ Failed to save ATS score: {e}")
-    db.commit()
-
-# =============================================================================
-# MAIN — On-Demand CLI Entry Point
-# =============================================================================
-
-def main():
-    import argparse
-
-    parser = argparse.ArgumentParser(description="KaryaSync Job Agent — On-Demand Execution")
-    parser.add_argument("--skills", type=str, required=True, help="Comma-separated skills/roles to search (e.g. 'React Developer,Python Engineer')")
-    parser.add_argument("--location", type=str, default="India", help="Location to search in (default: India)")
-    parser.add_argument("--job_type", type=str, default=None, choices=["fulltime", "internship"], help="Job type filter")
-    parser.add_argument("--limit", type=int, default=20, help="Max results per query (default: 20)")
-    parser.add_argument("--mode", type=str, default="FAST", choices=["FAST", "DEEP"], help="Scan mode: FAST (Adzuna) or DEEP (JobSpy)")
-    parser.add_argument("--experience", type=int, default=0, help="Years of experience (default: 0)")
-    
-    args = parser.parse_args()
-
-    print("🚀 Agent Started (On-Demand Mode)")
-    print(f"   Skills: {args.skills}")
-    print(f"   Location: {args.location} | Mode: {args.mode} | Type: {args.job_type or 'any'}")
-
-    # Connect to database
-    try:
-        db = SessionLocal()
-        print("✅ Database Connected")
-    except Exception as e:
-        print(f"❌ Fatal Error: DB Connection Failed: {e}")
-        sys.exit(1)
-
-    try:
-        skills_list = [s.strip() for s in args.skills.split(",") if s.strip()]
-        
-        run_search(
-            skills=skills_list,
-            location=args.location,
-            job_type=args.job_type,
-            limit=args.limit,
-            scan_mode=args.mode,
-            experience_years=args.experience,
-            db=db
-        )
-
-    except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-        try:
-            db.rollback()
-        except Exception:
-            pass
-
-    finally:
-        try:
-            db.close()
-            print("🔌 DB Connection Closed.")
-        except Exception:
-            pass
-
-    print("🏁 Agent exiting.")
-
-if __name__ == "__main__":
-    main()
-
\ No newline at end of file
+import os
+import sys
+import json
+import uuid
+import functools
+import math
+import time
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urljoin
+from jobspy import scrape_jobs
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session, sessionmaker
+from dotenv import load_dotenv
+
+# Add backend to path to import models
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.models import Opportunity, OpportunitySource, OpportunityStatus
+from app.crud import queue as queue_crud
+from app.crud import watermark as watermark_crud
+from app.models.queue import SearchQueue, SearchStatus
+from app.services.classifier import RULES_VERSION, BatchClassification, classify_batch, fits_experience
+from app.services.link_index import LinkIndex
+from app.services.locations import location_id, mentions_india_or_remote
+from app.services.salary import (
+    CONFIDENCE_ASSUMED,
+    CONFIDENCE_PREDICTED,
+    CONFIDENCE_PROVIDER,
+    normalize_salary,
+    parse_period,
+)
+from app.services.resume_text import extract_resume_text
+from app.services.skills import skill_ids, skill_vector, skills_in
+from app.services.text_vectors import match_score, missing_terms, term_vector
+from app.services.fingerprint import (
+    FingerprintIndex, canonicalize_url, merge_sources, simhash_posting, to_signed64,
+)
+from pipeline import Pipeline, Stage
+from throttle import call_with_retry, http_get
+from extract import extract as extract_page, fetch_capped
+from boards import detect_board, detect_board_in_links, fetch_board
+from discovery import discover_posting_urls, job_postings
+from fanout import JOBSPY_SITES, iter_site_results
+from memo import ResultMemo, content_key
+from state import as_utc, get_state
+
+# =============================================================================
+# CONFIGURATION & SETUP
+# =============================================================================
+
+# Load Environment Variables
+env_path = os.path.join(os.path.dirname(__file__), '..', 'backend', '.env')
+load_dotenv(env_path)
+
+# Adzuna Credentials
+ADZUNA_APP_ID = os.getenv("ADZUNA_APP_ID", "232e9909")
+ADZUNA_APP_KEY = os.getenv("ADZUNA_APP_KEY", "8684c36be9f52ee7718e33d523f96845")
+
+# Database Setup
+DATABASE_URL = os.getenv("DATABASE_URL")
+if DATABASE_URL and DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
+
+# Sessions one search holds at once: the writer, the pipeline's and the portal
+# scan's read sessions, and in worker mode the queue item's lease heartbeat
+SESSIONS_PER_SEARCH = 4
+
+def _create_engine(concurrency=1):
+    """Pool for `concurrency` searches plus the session of the loop driving them."""
+    return create_engine(
+        DATABASE_URL,
+        pool_size=1 + SESSIONS_PER_SEARCH * concurrency,
+        # Headroom for the short watermark reads/writes fetch threads make
+        max_overflow=concurrency,
+    )
+
+engine = _create_engine()
+SessionLocal = sessionmaker(bind=engine)
+
+# Known apply_links and listing fingerprints, loaded once per process
+link_index = LinkIndex()
+fingerprint_index = FingerprintIndex()
+# Classifier rows per content hash, in memory and in the agent's SQLite state
+classification_memo = ResultMemo()
+
+# =============================================================================
+# CONSTANTS & UTILITIES
+# =============================================================================
+
+class ATSAnalyzer:
+    """Helper class to analyze resume vs job description."""
+    
+    def calculate_score(self, resume_text, jd_text):
+        if not resume_text or not jd_text:
+            return 0
+        return match_score(term_vector(resume_text), term_vector(jd_text))
+
+    def get_missing_keywords(self, resume_text, jd_text):
+        if not jd_text:
+            return []
+            
+        # 1-2. Top JD terms (shared tokenizer) the resume never uses
+        missing_candidates = missing_terms(term_vector(resume_text), term_vector(jd_text), 100)
+                
+        # 3. Prefer skills from the shared taxonomy: JD skills the resume lacks
+        resume_skills = skill_ids(resume_text)
+        clean_missing = [s.key for s in skills_in(jd_text) if s.id not in resume_skills]
+        
+        # 4. Fallback if no specific tech keywords found
+        if not clean_missing:
+             return missing_candidates[:5]
+             
+        return clean_missing[:10]
+
+# =============================================================================
+# PIPELINE STAGES: PARSE → CLASSIFY → DEDUPE → WRITE
+# =============================================================================
+#
+# Fetchers yield raw records {"source", "data", "context"}. The parse stage
+# turns them into posting dicts, classify applies the heuristics, dedupe
+# resolves links and fingerprints in batches, and the writer commits batches.
+
+AGENT_FETCH_WORKERS = int(os.getenv("AGENT_FETCH_WORKERS", "2"))
+AGENT_QUEUE_SIZE = int(os.getenv("AGENT_QUEUE_SIZE", "100"))
+AGENT_BATCH_SIZE = int(os.getenv("AGENT_BATCH_SIZE", "50"))
+
+# JobSpy worker-pool mode: 0 keeps the single in-process scrape per role
+AGENT_JOBSPY_WORKERS = int(os.getenv("AGENT_JOBSPY_WORKERS", "0"))
+AGENT_SITE_TIMEOUT = float(os.getenv("AGENT_SITE_TIMEOUT", "90"))
+
+
+def _raw(source, data, **context):
+    return {"source": source, "data": data, "context": context}
+
+
+def _provider_salary(low, high, currency, interval):
+    """Provider salary fields -> annual INR; a missing interval is read as yearly."""
+    period = parse_period(interval)
+    if interval and period is None:
+        return None
+    return normalize_salary(
+        low, high, period or "year", currency or "INR",
+        confidence=CONFIDENCE_PROVIDER if period else CONFIDENCE_ASSUMED,
+    )
+
+def _parse_adzuna_job(job_data, ctx):
+    """Normalizes a single Adzuna result."""
+    apply_link = job_data.get("redirect_url")
+    if not apply_link: return None
+
+    description = job_data.get("description", "")
+    return {
+        "company_name": job_data.get("company", {}).get("display_name", "Unknown"),
+        "role_title": job_data.get("title") or "Unknown Role",
+        "apply_link": apply_link,
+        "location": job_data.get("location", {}).get("display_name", ctx["location"]),
+        "description": description,
+        "source": OpportunitySource.OTHER,
+        "salary_min": job_data.get("salary_min"),
+        "salary_max": job_data.get("salary_max"),
+        # The India endpoint reports annual INR; predicted figures are Adzuna's estimates
+        "salary": normalize_salary(
+            job_data.get("salary_min"), job_data.get("salary_max"), "year",
+            confidence=CONFIDENCE_PREDICTED if str(job_data.get("salary_is_predicted", "0")) == "1" else CONFIDENCE_ASSUMED,
+        ),
+        "source_metadata": {
+            "origin": "adzuna",
+            "query": ctx["query"],
+            "description": description,
+            "adzuna_id": job_data.get("id")
+        },
+    }
+
+def _parse_jobspy_row(row, ctx):
+    """Normalizes a single JobSpy result row."""
+    job_url = row.get('job_url')
+    if not job_url or pd.isna(job_url): return None
+
+    def safe_get(key, default=""):
+        val = row.get(key)
+        if val is None or pd.isna(val): return default
+        return str(val)
+
+    description = safe_get('description')
+    if not description: return None
+
+    source = OpportunitySource.OTHER
+    if any(d in job_url for d in ['greenhouse', 'workday', 'lever']):
+        source = OpportunitySource.OFFICIAL
+
+    s_min = row.get('min_amount')
+    s_max = row.get('max_amount')
+    if s_min is not None and pd.isna(s_min): s_min = None
+    if s_max is not None and pd.isna(s_max): s_max = None
+
+    return {
+        "company_name": safe_get('company', 'Unknown'),
+        "role_title": safe_get('title', 'Unknown Role'),
+        "apply_link": job_url,
+        "location": safe_get('location', ctx["location"]),
+        "description": description,
+        "source": source,
+        "salary_min": s_min,
+        "salary_max": s_max,
+        "salary": _provider_salary(s_min, s_max, safe_get('currency', None), safe_get('interval', None)),
+        "source_metadata": {
+            "origin": "JobSpy",
+            "site": safe_get('site'),
+            "description": description[:500]
+        },
+    }
+
+def _parse_portal_page(page, ctx):
+    """Extracts a posting from a downloaded career-portal job page."""
+    posting = _portal_posting(page, ctx)
+    if posting is None and ctx.get("page_scan"):
+        # Keep rejected pages out of this scan's window (see _scan_company_portal)
+        get_state().mark_pages_checked(ctx["page_scan"], [page["url"]])
+    return posting
+
+def _portal_posting(page, ctx):
+    extracted = extract_page(page["html"])
+
+    # schema.org JobPosting markup beats guessing from <h1> and page text
+    structured = job_postings(extracted.jsonld, page["url"])
+    if structured:
+        return _parse_board_posting(structured[0], ctx)
+
+    title = extracted.heading
+    if not title: return None
+
+    # Check against ALL desired roles
+    if not any(r.lower() in title.lower() for r in ctx["role_filters"]):
+        return None
+
+    description = extracted.text
+    if not mentions_india_or_remote(description):
+        return None
+
+    return {
+        "company_name": ctx["company"],
+        "role_title": title,
+        "apply_link": page["url"],
+        "location": "India (Official)",
+        "description": description,
+        "source": OpportunitySource.OFFICIAL,
+        "salary_min": None,
+        "salary_max": None,
+        "salary": None,
+        "source_metadata": {"origin": "kb_trusted_crawl", "portal": ctx["portal"]},
+    }
+
+def _parse_board_posting(job, ctx):
+    """Normalizes a posting from a Greenhouse/Lever/Ashby JSON board (see boards.py)."""
+    title = job["title"]
+    if not any(r.lower() in title.lower() for r in ctx["role_filters"]):
+        return None
+
+    description = job["description"]
+    if not mentions_india_or_remote(job["location"] or "", description):
+        return None
+
+    return {
+        "company_name": ctx["company"],
+        "role_title": title,
+        "apply_link": job["url"],
+        "location": job["location"] or "India (Official)",
+        "description": description,
+        "source": OpportunitySource.OFFICIAL,
+        "salary_min": job["salary_min"],
+        "salary_max": job["salary_max"],
+        "salary": _provider_salary(job["salary_min"], job["salary_max"], job["salary_currency"], job["salary_interval"]),
+        "source_metadata": {
+            "origin": "ats_board",
+            "provider": job["provider"],
+            "board_id": job["external_id"],
+            "portal": ctx["portal"],
+            "employment_type": job["employment_type"],
+            "posted_at": job["posted_at"].isoformat() if job["posted_at"] else None,
+        },
+    }
+
+PARSERS = {
+    "adzuna": _parse_adzuna_job,
+    "jobspy": _parse_jobspy_row,
+    "portal": _parse_portal_page,
+    "board": _parse_board_posting,
+}
+
+def parse_stage(record):
+    posting = PARSERS[record["source"]](record["data"], record["context"])
+    if posting is None:
+        return None
+    posting["context"] = record["context"]
+    return [posting]
+
+class ClassifyStage:
+    """
+    Fills job type, work mode, salary, experience asked for, seniority band,
+    the listing's skill ids and its gazetteer location id for a batch of
+    postings. Every posting is kept so one scrape serves all experience
+    levels; `fits` records whether it suits the experience this search asked
+    for. Text classified before (this run, an earlier batch or a previous
+    run) is served from the memo; only the rest goes through classify_batch.
+    Hits and misses are counted per run.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = 100.0 * self.hits / total if total else 0.0
+        return f"🧠 Classification cache: {self.hits}/{total} hits ({rate:.0f}%)"
+
+    def __call__(self, batch):
+        titles = [p["role_title"] for p in batch]
+        descriptions = [p["description"] for p in batch]
+        locations = [f"{p['context'].get('location', '')} {p['location']}" for p in batch]
+        keys = [content_key(RULES_VERSION, *text) for text in zip(titles, descriptions, locations)]
+
+        rows = classification_memo.get_many(keys)
+        missing = [i for i, key in enumerate(keys) if key not in rows]
+        if missing:
+            fresh = classify_batch(
+                [titles[i] for i in missing], [descriptions[i] for i in missing], [locations[i] for i in missing]
+            )
+            fresh_rows = {keys[i]: fresh.row(j) for j, i in enumerate(missing)}
+            classification_memo.put_many(fresh_rows)
+            rows.update(fresh_rows)
+        self.hits += len(batch) - len(missing)
+        self.misses += len(missing)
+
+        facts = BatchClassification.from_rows(rows[key] for key in keys)
+        for i, posting in enumerate(batch):
+            ctx = posting["context"]
+            title = posting["role_title"]
+            posting["experience_min_years"] = facts.experience_min[i]
+            posting["experience_max_years"] = facts.experience_max[i]
+            posting["seniority_band"] = facts.seniority_band[i]
+            posting["fits"] = fits_experience(
+                facts.experience_min[i], facts.seniority_band[i], ctx.get("experience_years", 0)
+            )
+            if not posting["fits"]:
+                print(f"   📦 Stored, outside this search's experience ({facts.seniority_band[i]}): {title}")
+
+            posting["job_type"] = facts.job_type[i]
+            posting["work_mode"] = facts.work_mode[i]
+            posting["skill_ids"] = skill_vector(title, posting["description"])
+            posting["location_id"] = facts.location_id[i]
+
+            if not posting["salary_min"]:
+                posting["salary_min"], posting["salary_max"] = facts.salary_min[i], facts.salary_max[i]
+                if posting["salary_min"]: print(f"   💰 Extracted Salary: ₹{posting['salary_min']}")
+            if posting["salary"] is None:
+                posting["salary"] = facts.salary(i)
+            yield posting
+
+class DedupeStage:
+    """
+    Batch dedupe: one link lookup per batch, then near-duplicate fingerprinting.
+    Duplicates of listings we already have are routed to the writer as merges.
+    Uses its own read session so it never shares the writer's connection.
+    """
+
+    def __init__(self, read_db):
+        self.read_db = read_db
+
+    def __call__(self, batch):
+        fresh = set(link_index.prefetch(self.read_db, [p["apply_link"] for p in batch]))
+        for posting in batch:
+            link = posting["apply_link"]
+            if link not in fresh:
+                continue
+            fresh.discard(link)
+
+            posting["canonical_link"] = canonicalize_url(link)
+            posting["fingerprint"] = simhash_posting(
+                posting["company_name"], posting["role_title"], posting["description"]
+            )
+            ref = fingerprint_index.match(posting["canonical_link"], posting["fingerprint"])
+            if ref is not None:
+                posting["merge_into"] = ref
+            else:
+                _index_new_posting(posting)
+            # Added last, so a posting that fails above is not left marked as known
+            link_index.add(link)
+            yield posting
+
+def _index_new_posting(posting):
+    """Gives a posting its own listing id and makes it a merge target for later ones."""
+    posting.pop("merge_into", None)
+    posting["id"] = uuid.uuid4()
+    posting["simhash"] = to_signed64(posting["fingerprint"])
+    fingerprint_index.add(posting["id"], posting["canonical_link"], posting["fingerprint"])
+
+def _unindex_batch(batch):
+    """Undoes the dedupe stage's index entries for a batch that was rolled back."""
+    for posting in batch:
+        link_index.discard(posting["apply_link"])
+        if posting.get("id") is not None:
+            fingerprint_index.discard(posting["id"], posting["canonical_link"], posting["fingerprint"])
+
+def _build_opportunity(posting):
+    salary = posting.get("salary")
+    return Opportunity(
+        id=posting.get("id"),
+        company_name=posting["company_name"],
+        role_title=posting["role_title"],
+        apply_link=posting["apply_link"],
+        canonical_link=posting.get("canonical_link"),
+        simhash=posting.get("simhash"),
+        skill_ids=posting.get("skill_ids"),
+        location=posting["location"],
+        location_id=posting.get("location_id"),
+        source=posting["source"],
+        status=OpportunityStatus.OPEN,
+        job_type=posting["job_type"],
+        work_mode=posting["work_mode"],
+        salary_min=posting["salary_min"],
+        salary_max=posting["salary_max"],
+        salary_annual_min=salary.annual_min if salary else None,
+        salary_annual_max=salary.annual_max if salary else None,
+        salary_period=salary.period if salary else None,
+        salary_confidence=salary.confidence if salary else None,
+        experience_min_years=posting.get("experience_min_years"),
+        experience_max_years=posting.get("experience_max_years"),
+        seniority_band=posting.get("seniority_band"),
+        source_metadata=posting["source_metadata"],
+    )
+
+class BatchWriter:
+    """Final stage: inserts new listings and merges duplicates, one commit per batch."""
+
+    def __init__(self, db, ledger=None):
+        self.db = db
+        self.ledger = ledger
+        self.saved_by_tag = Counter()
+        self.saved_total = 0
+        self.merged_total = 0
+        self.result_ids = set()   # listings this run inserted or merged into that fit its search
+
+    def _stage(self, batch):
+        """Adds the batch's inserts and merges to the session; returns what to count on commit."""
+        new_ops = {}
+        merged, merged_ids = 0, set()
+        for posting in batch:
+            ref = posting.get("merge_into")
+            existing = None
+            if ref is not None:
+                existing = new_ops[ref][0] if ref in new_ops else self.db.get(Opportunity, ref)
+                if existing is None:
+                    # Its match was never stored (that batch failed): insert this one instead
+                    _index_new_posting(posting)
+            op = _build_opportunity(posting)
+            fits = posting.get("fits", True)
+            if existing is None:
+                self.db.add(op)
+                new_ops[op.id] = (op, posting["context"].get("tag"), fits)
+                continue
+            if merge_sources(existing, op):
+                print(f"   🔁 Merged duplicate: {op.role_title} @ {op.company_name}")
+                merged += 1
+                if fits:
+                    merged_ids.add(existing.id)
+        return new_ops, merged, merged_ids
+
+    def __call__(self, batch):
+        try:
+            new_ops, merged, merged_ids = self._stage(batch)
+            self.db.commit()
+        except Exception as e:
+            print(f"❌ Batch write failed ({len(batch)} postings): {e}")
+            self.db.rollback()
+            # Nothing here was stored, so later batches and runs must not treat it as known
+            _unindex_batch(batch)
+            if self.ledger is not None:
+                self.ledger.fail(batch)
+            return None
+
+        for op, tag, fits in new_ops.values():
+            self.saved_by_tag[tag] += 1
+            if fits:
+                self.result_ids.add(op.id)
+        self.saved_total += len(new_ops)
+        self.merged_total += merged
+        self.result_ids.update(merged_ids)
+        return None
+
+def run_pipeline(fetch_tasks, db):
+    """
+    Runs fetch tasks through the ingestion pipeline and returns the writer.
+
+    Each task is a zero-argument callable yielding raw records. Stage timings
+    are printed at the end so slow stages can be spotted and scaled. Watermark
+    checkpoints carried by the records are saved once the run is over, unless
+    a batch holding their postings was lost.
+    """
+    link_index.ensure_loaded(db)
+    fingerprint_index.ensure_loaded(db)
+
+    read_db = Session(bind=db.get_bind())
+    ledger = WatermarkLedger()
+    writer = BatchWriter(db, ledger)
+    classifier = ClassifyStage()
+    pipeline = Pipeline([
+        Stage("fetch", lambda task: map(ledger.track, task()), workers=AGENT_FETCH_WORKERS),
+        Stage("parse", parse_stage),
+        Stage("classify", classifier, batch_size=AGENT_BATCH_SIZE),
+        Stage("dedupe", DedupeStage(read_db), batch_size=AGENT_BATCH_SIZE),
+        Stage("write", writer, batch_size=AGENT_BATCH_SIZE),
+    ], queue_size=AGENT_QUEUE_SIZE)
+
+    try:
+        stats = pipeline.run(fetch_tasks)
+    finally:
+        read_db.close()
+
+    # A failed stage drops its batch without saying which fetches it came from
+    lost = sum(s.errors for s in stats[1:])
+    if lost:
+        print(f"⚠️ Watermarks held back: {lost} pipeline errors")
+    else:
+        ledger.commit()
+
+    print(f"📈 Pipeline: {writer.saved_total} saved, {writer.merged_total} merged")
+    print(classifier.summary())
+    for s in stats:
+        print(f"   {s.summary()}")
+    return writer
+
+# =============================================================================
+# MAIN FETCHERS (Direct Parameter API)
+# =============================================================================
+
+def _watermark_query(query, filters):
+    return query + (" Internship" if filters.get("is_internship") else "")
+
+def _load_watermark(source, query, location, filters):
+    """Newest posting time seen for this query, or None for a full scan."""
+    if not filters.get("incremental", True):
+        return None
+    with SessionLocal() as db:
+        watermark = watermark_crud.get_watermark(db, source, _watermark_query(query, filters), location)
+    if watermark:
+        print(f"   ⏩ Incremental [{source}]: only postings after {watermark:%Y-%m-%d %H:%M}")
+    return watermark
+
+def _save_watermark(source, query, location, filters, newest, previous):
+    if newest and filters.get("incremental", True) and (previous is None or newest > previous):
+        with SessionLocal() as db:
+            watermark_crud.advance_watermark(db, source, _watermark_query(query, filters), location, newest)
+
+class WatermarkCheckpoint:
+    """
+    A fetch's watermark advance, held until its postings are stored.
+
+    The fetcher tags each record it yields, `observe`s posting dates and calls
+    `finish` once it has read everything. A checkpoint without records is
+    saved right away; otherwise `run_pipeline` saves it after the write.
+    """
+
+    def __init__(self, source, query, location, filters, previous):
+        self.source = source
+        self.query = query
+        self.location = location
+        self.filters = filters
+        self.previous = previous
+        self.newest = None
+        self.oldest = None
+        self.truncated = False
+        self.records = 0
+        self.complete = False
+
+    def tag(self, record):
+        record["context"]["checkpoint"] = self
+        self.records += 1
+        return record
+
+    def observe(self, posted):
+        if posted and (self.newest is None or posted > self.newest):
+            self.newest = posted
+        if posted and (self.oldest is None or posted < self.oldest):
+            self.oldest = posted
+
+    def truncate(self):
+        """
+        Marks that the source had more postings than were read (a full page).
+        Unread ones may sit anywhere above the previous watermark, so that one
+        holds; a first scan starts from the oldest posting read.
+        """
+        self.truncated = True
+
+    def finish(self):
+        self.complete = True
+        if not self.records:
+            self.save()
+
+    def save(self):
+        newest = self.newest
+        if self.truncated:
+            newest = self.oldest if self.previous is None else None
+        _save_watermark(self.source, self.query, self.location, self.filters, newest, self.previous)
+
+class WatermarkLedger:
+    """Checkpoints seen in one pipeline run, and those whose postings failed to commit."""
+
+    def __init__(self):
+        self._seen = {}
+        self._failed = set()
+        self._lock = threading.Lock()
+
+    def track(self, record):
+        checkpoint = record["context"].get("checkpoint")
+        if checkpoint is not None:
+            with self._lock:
+                self._seen[id(checkpoint)] = checkpoint
+        return record
+
+    def fail(self, postings):
+        with self._lock:
+            for posting in postings:
+                checkpoint = posting["context"].get("checkpoint")
+                if checkpoint is not None:
+                    self._failed.add(id(checkpoint))
+
+    def commit(self):
+        """Saves every finished checkpoint whose postings all reached the DB."""
+        with self._lock:
+            ready = [cp for key, cp in self._seen.items() if cp.complete and key not in self._failed]
+        for checkpoint in ready:
+            checkpoint.save()
+        return len(ready)
+
+def _hours_since(watermark):
+    # +1h of slack for postings that get indexed late
+    return max(1, math.ceil((datetime.now(timezone.utc) - watermark).total_seconds() / 3600) + 1)
+
+def _posted_at(value):
+    """Parses an API/JobSpy posting date into aware UTC, or None."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    try:
+        if isinstance(value, str):
+            return as_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        return as_utc(value)
+    except (TypeError, ValueError):
+        return None
+
+def _is_newer(posted, watermark):
+    """JobSpy dates are day-granular, so same-day postings are kept (dedupe drops repeats)."""
+    if watermark is None or posted is None:
+        return True
+    if posted.time() == datetime.min.time():
+        return posted.date() >= watermark.date()
+    return posted > watermark
+
+def _scan_board(company, portal_link, role_filters, board):
+    """Reads every posting of a hosted ATS board with one JSON request."""
+    jobs, status = fetch_board(*board)
+    if status != "OK":
+        return [], status
+    context = {"company": company, "portal": portal_link, "role_filters": role_filters,
+               "experience_years": 0, "location": "", "label": "Portal", "tag": company}
+    return [_raw("board", job, **context) for job in jobs], "OK"
+
+PORTAL_MAX_PAGES = 8
+# Pages a scan rejected are skipped for this long, so each run reaches new ones
+PORTAL_RECHECK_DAYS = int(os.getenv("AGENT_PORTAL_RECHECK_DAYS", "14"))
+
+def _portal_query(company, role_filters):
+    # Role filters decide what a scan keeps, so each filter set gets its own watermark
+    return f"{company}|{','.join(sorted(r.lower() for r in role_filters))}"
+
+def _checked_pages(scan):
+    """Pages `scan` read and rejected within PORTAL_RECHECK_DAYS."""
+    return get_state().get_checked_pages(scan, datetime.now(timezone.utc) - timedelta(days=PORTAL_RECHECK_DAYS))
+
+def _fetch_portal_pages(urls, scan, context):
+    """Downloads job pages as raw records; pages that fail to load are marked checked."""
+    records, failed = [], []
+    for j_url in urls:
+        try:
+            _, j_html = fetch_capped(j_url, "portal", timeout=6, headers={"User-Agent": "Mozilla/5.0"})
+            records.append(_raw("portal", {"url": j_url, "html": j_html}, page_scan=scan, **context))
+        except Exception:
+            failed.append(j_url)
+    if failed:
+        get_state().mark_pages_checked(scan, failed)
+    return records, failed
+
+def _scan_company_portal(company, portal_link, role_filters, read_db):
+    """
+    Crawls a single company career page.
+    Greenhouse/Lever/Ashby boards (hosted, or linked from the company page) are
+    read through their JSON APIs instead of page by page. Other sites are
+    discovered through JobPosting JSON-LD, sitemaps and job feeds, falling
+    back to guessing job links from the page's anchors.
+    Returns (raw job-page records, status).
+    """
+    try:
+        board = detect_board(portal_link)
+        if board:
+            return _scan_board(company, portal_link, role_filters, board)
+
+        status, html = fetch_capped(portal_link, "portal", timeout=10, headers={"User-Agent": "Mozilla/5.0"})
+        if status != 200:
+            return [], status
+        
+        page = extract_page(html, want_text=False)
+        links = page.links
+        board = detect_board_in_links(urljoin(portal_link, href) for href in links)
+        if board:
+            return _scan_board(company, portal_link, role_filters, board)
+
+        context = {"company": company, "portal": portal_link, "role_filters": role_filters,
+                   "experience_years": 0, "location": "", "label": "Portal", "tag": company}
+        wm_query = _portal_query(company, role_filters)
+        watermark = _load_watermark("portal", wm_query, portal_link, {})
+        checkpoint = WatermarkCheckpoint("portal", wm_query, portal_link, {}, watermark)
+
+        # 1. JobPostings embedded in the listing page itself
+        listed = job_postings(page.jsonld, portal_link)
+        records = [_raw("board", job, **context) for job in listed if _is_newer(job["posted_at"], watermark)]
+        listed_urls = {job["url"] for job in listed}
+
+        # 2. Sitemaps / job feeds: URLs with last-modified dates
+        dated = {url: lastmod for url, lastmod in discover_posting_urls(portal_link, page.feeds).items()
+                 if url not in listed_urls}
+        dates = [job["posted_at"] for job in listed] + list(dated.values())
+        newest = max((d for d in dates if d), default=None)
+
+        if dated:
+            checked = _checked_pages(wm_query)
+            fresh = {url: lastmod for url, lastmod in dated.items()
+                     if _is_newer(lastmod, watermark) and url not in checked}
+            candidates = link_index.prefetch(read_db, sorted(fresh))
+            # Newest first, undated last: a capped run reads the latest postings, and
+            # the held cutoff below keeps the watermark under the older ones it skips
+            candidates.sort(key=lambda u: fresh[u] or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
+            pages, failed = _fetch_portal_pages(candidates[:PORTAL_MAX_PAGES], wm_query, context)
+            records += pages
+            # Dated pages left for a later run (unread or failed) must stay above the watermark
+            held = [fresh[u] for u in candidates[PORTAL_MAX_PAGES:] + failed if fresh[u]]
+            if held:
+                cutoff = min(held)
+                newest = max((d for d in dates if d and d < cutoff), default=None)
+            checkpoint.observe(newest)
+            records = [checkpoint.tag(r) for r in records]
+            checkpoint.finish()
+            return records, "OK"
+
+        if listed:
+            checkpoint.observe(newest)
+            records = [checkpoint.tag(r) for r in records]
+            checkpoint.finish()
+            return records, "OK"
+
+        # 3. Static Link Detection
+        job_links = set()
+        trusted_domains = ["greenhouse.io", "lever.co", "workday.com", "myworkdayjobs.com", "smartrecruiters.com", "ashbyhq.com"]
+        path_keywords = ["/job/", "/careers/", "/position/", "/opening/", "/role/"]
+        
+        for href in links:
+            full_url = urljoin(portal_link, href)
+            
+            is_ats = any(d in full_url for d in trusted_domains)
+            is_internal = any(k in full_url for k in path_keywords) and len(full_url) > len(portal_link) + 5
+            
+            if is_ats or is_internal:
+                job_links.add(full_url)
+
+        if not job_links:
+            return [], "NO_LINKS"
+
+        # Drop known links in one batch, and pages this scan recently read and
+        # rejected, then limit to avoid hanging on massive sites. Stored and
+        # rejected pages both leave the window, so each run reaches further.
+        checked = _checked_pages(wm_query)
+        job_links = [u for u in link_index.prefetch(read_db, sorted(job_links)) if u not in checked]
+        pages, _ = _fetch_portal_pages(job_links[:PORTAL_MAX_PAGES], wm_query, context)
+        records += pages
+            
+        return records, "OK"
+        
+    except Exception as e:
+        return [], str(e)
+
+ADZUNA_PAGE_SIZE = 20
+# Pages read per incremental Adzuna query before the watermark is held back
+ADZUNA_MAX_PAGES = int(os.getenv("AGENT_ADZUNA_MAX_PAGES", "3"))
+JOBSPY_RESULTS_WANTED = 20
+
+def fetch_adzuna(query, location, filters):
+    """Fetches jobs from Adzuna API and yields raw result records.
+    
+    Args:
+        query: Search query string (e.g. "Software Engineer")
+        location: Location string (e.g. "India", "Remote")
+        filters: Dict with optional keys: experience_years, is_internship, is_remote, incremental
+    """
+    print(f"🕵️ Adzuna Search: '{query}' in {location}")
+    
+    try: experience_years = int(filters.get("experience_years", 0))
+    except: experience_years = 0
+    print(f"   🎓 Experience Level: {experience_years} Years")
+
+    query_extras = " Internship" if filters.get("is_internship") else ""
+    
+    sub_queries = [q.strip() for q in query.split(" OR ")] if " OR " in query else [query]
+    sub_queries = sub_queries[:3] # Rate limit protection
+    
+    for q in sub_queries:
+        if not q: continue
+        full_query = q + query_extras
+        
+        params = {
+            "app_id": ADZUNA_APP_ID,
+            "app_key": ADZUNA_APP_KEY,
+            "results_per_page": ADZUNA_PAGE_SIZE,
+            "what": full_query, 
+            "where": location,
+            "content-type": "application/json"
+        }
+        
+        watermark = _load_watermark("adzuna", q, location, filters)
+        if watermark:
+            days = math.ceil((datetime.now(timezone.utc) - watermark).total_seconds() / 86400)
+            params["max_days_old"] = max(1, days)
+            params["sort_by"] = "date"
+
+        print(f"🌍 Fetching Adzuna (FAST): '{full_query}' in {location}")
+
+        # Date-sorted pages are read until one reaches the watermark; the first
+        # scan of a query reads a single page
+        checkpoint = WatermarkCheckpoint("adzuna", q, location, filters, watermark)
+        pages = ADZUNA_MAX_PAGES if watermark else 1
+        for page in range(1, pages + 1):
+            try:
+                url = f"https://api.adzuna.com/v1/api/jobs/in/search/{page}"
+                response = http_get(url, "adzuna", params=params)
+                data = response.json() if response.status_code == 200 else {}
+                results = data.get("results", [])
+            except Exception as e:
+                print(f"❌ Adzuna Error for '{q}': {e}")
+                break
+
+            reached = False
+            for job in results:
+                posted = _posted_at(job.get("created"))
+                if not _is_newer(posted, watermark):
+                    reached = True
+                    continue
+                checkpoint.observe(posted)
+                yield checkpoint.tag(_raw("adzuna", job, query=q, location=location,
+                                          experience_years=experience_years, label="Adzuna", tag=query))
+
+            if reached or len(results) < ADZUNA_PAGE_SIZE:
+                checkpoint.finish()
+                break
+        else:
+            # Every page came back full without reaching the watermark
+            checkpoint.truncate()
+            checkpoint.finish()
+
+def fetch_jobspy(query, location, filters):
+    """Fetches jobs using JobSpy scraper (Deep Scan) and yields raw rows.
+    
+    Args:
+        query: Search query string
+        location: Location string
+        filters: Dict with optional keys: experience_years, is_internship, incremental
+    """
+    try: experience_years = int(filters.get("experience_years", 0))
+    except: experience_years = 0
+        
+    print(f"🕵️ JobSpy Deep Scan: '{query}' in {location}, Exp: {experience_years}")
+    watermark = _load_watermark("jobspy", query, location, filters)
+    
+    try:
+        job_type_param = "internship" if filters.get("is_internship") else "fulltime"
+        
+        jobs: pd.DataFrame = call_with_retry(
+            lambda: scrape_jobs(
+                site_name=JOBSPY_SITES,
+                search_term=query,
+                location=location,
+                results_wanted=JOBSPY_RESULTS_WANTED,
+                job_type=job_type_param,
+                hours_old=_hours_since(watermark) if watermark else None,
+                country_indeed='India'
+            ),
+            "jobspy", retries=2, retry_on=(Exception,)
+        )
+    except Exception as e:
+        print(f"❌ JobSpy Failed: {e}")
+        return
+
+    if not jobs.empty:
+        print(f"📊 JobSpy Results by Site:\n{jobs['site'].value_counts()}")
+    else:
+        print("⚠️ JobSpy returned 0 results.")
+
+    checkpoint = WatermarkCheckpoint("jobspy", query, location, filters, watermark)
+    for row in jobs.to_dict("records"):
+        posted = _posted_at(row.get("date_posted"))
+        if not _is_newer(posted, watermark):
+            continue
+        checkpoint.observe(posted)
+        yield checkpoint.tag(_raw("jobspy", row, location=location, experience_years=experience_years,
+                                  label="JobSpy", tag=query))
+
+    # results_wanted caps each site; a site that hit it may have more
+    if not jobs.empty and jobs["site"].value_counts().max() >= JOBSPY_RESULTS_WANTED:
+        checkpoint.truncate()
+    checkpoint.finish()
+
+def fetch_jobspy_parallel(roles, location, filters, workers, site_timeout):
+    """Fans (role, site) pairs out to a process pool and yields rows as each finishes.
+    
+    Args:
+        roles: Search query strings
+        location: Location string
+        filters: Dict with optional keys: experience_years, is_internship, incremental
+        workers: Number of worker processes
+        site_timeout: Seconds before a single (role, site) scrape is abandoned
+    """
+    try: experience_years = int(filters.get("experience_years", 0))
+    except: experience_years = 0
+    job_type_param = "internship" if filters.get("is_internship") else "fulltime"
+
+    pairs = [(role, site) for role in roles for site in JOBSPY_SITES]
+    print(f"🕵️ JobSpy Worker Pool: {len(pairs)} tasks on {workers} workers (timeout {site_timeout:.0f}s/site)")
+
+    watermarks = {role: _load_watermark("jobspy", role, location, filters) for role in roles}
+    checkpoints = {role: WatermarkCheckpoint("jobspy", role, location, filters, watermarks[role]) for role in roles}
+    sites_done = Counter()
+
+    def kwargs_for(role, site):
+        watermark = watermarks[role]
+        kwargs = {"results_wanted": JOBSPY_RESULTS_WANTED}
+        if watermark:
+            kwargs["hours_old"] = _hours_since(watermark)
+        return kwargs
+
+    for role, site, rows in iter_site_results(pairs, location, job_type_param, workers, site_timeout,
+                                              kwargs_for=kwargs_for):
+        sites_done[role] += 1
+        if len(rows) >= JOBSPY_RESULTS_WANTED:
+            checkpoints[role].truncate()
+        for row in rows:
+            posted = _posted_at(row.get("date_posted"))
+            if not _is_newer(posted, watermarks[role]):
+                continue
+            checkpoints[role].observe(posted)
+            yield checkpoints[role].tag(_raw("jobspy", row, location=location,
+                                             experience_years=experience_years, label="JobSpy", tag=role))
+
+    # Only advance a role's watermark when every site answered, or postings
+    # from a timed-out site would be skipped next time
+    for role in roles:
+        if sites_done[role] == len(JOBSPY_SITES):
+            checkpoints[role].finish()
+
+def fetch_knowledge_base_career_pages(db, role_filters):
+    """
+    Crawls official career pages using 'career_page_status.json'.
+    Self-optimizes by skipping known 'NON-WORKING' sites.
+    """
+    base_dir = os.path.dirname(__file__)
+    kb_path = os.path.join(base_dir, 'career_page_status.json')
+
+    if not os.path.exists(kb_path):
+        print("⚠️ career_page_status.json not found. Skipping Official Layer.")
+        return 0
+
+    try:
+        with open(kb_path, 'r') as f:
+            company_status = json.load(f)
+    except Exception:
+        print("⚠️ Failed to load Knowledge Base JSON.")
+        return 0
+    
+    # Identify Working Candidates
+    scan_queue = []
+    skipped_count = 0
+    for company, data in company_status.items():
+        if data.get('status') == 'NON-WORKING':
+            skipped_count += 1
+            continue
+        if not data.get('portal'): continue
+        scan_queue.append({"company": company, "portal": data.get('portal')})
+
+    print(f"📉 Optimization: Skipped {skipped_count} known non-working companies.")
+    print(f"🔍 Deep Scan started for {len(scan_queue)} optimized companies...")
+
+    total_companies = len(scan_queue)
+    read_db = Session(bind=db.get_bind())
+
+    def scan(idx, item):
+        company = item["company"]
+        prefix = f"[{idx+1}/{total_companies}] 🏢 {company}"
+        
+        # Scan
+        records, status = _scan_company_portal(company, item["portal"], role_filters, read_db)
+        
+        # Logging & Learning
+        if status == "NO_LINKS":
+            print(f"{prefix} → NON-WORKING (JS-rendered/No links)")
+            company_status[company] = {
+                "status": "NON-WORKING", 
+                "reason": "No static links",
+                "last_checked": str(datetime.now())
+            }
+        elif isinstance(status, int) and status != 200:
+             print(f"{prefix} → ⚠️ Unreachable ({status})")
+             if status in [403, 404]:
+                 company_status[company] = {
+                    "status": "NON-WORKING",
+                    "reason": f"HTTP {status}",
+                    "last_checked": str(datetime.now())
+                }
+        elif status == "OK":
+             print(f"{prefix} → WORKING ({len(records)} new pages)")
+             company_status[company]['last_checked'] = str(datetime.now())
+             company_status[company]['status'] = 'WORKING'
+        else:
+             print(f"{prefix} → ERROR ({status})")
+        return records
+
+    try:
+        writer = run_pipeline(
+            [functools.partial(scan, idx, item) for idx, item in enumerate(scan_queue)], db
+        )
+    finally:
+        read_db.close()
+
+    # Persist Knowledge Base
+    try:
+        with open(kb_path, 'w') as f:
+            json.dump(company_status, f, indent=2)
+    except Exception as e:
+        print(f"⚠️ Failed to save KB cache: {e}")
+
+    print(f"💎 Knowledge Base Scan Saved Total: {writer.saved_total}")
+    return writer.saved_total
+
+# =============================================================================
+# HANDLERS (Direct Parameter API)
+# =============================================================================
+
+def run_search(skills, location="India", job_type=None, limit=20, scan_mode="FAST", experience_years=0, db=None,
+               workers=None, site_timeout=None, incremental=True):
+    """Orchestrates job search with direct parameters.
+    
+    Args:
+        skills: List of skill/role strings to search for
+        location: Location string (default "India")
+        job_type: Optional "internship" or "fulltime"
+        limit: Max results per query (default 20)
+        scan_mode: "FAST" (Adzuna) or "DEEP" (JobSpy)
+        experience_years: Years of experience (default 0)
+        db: SQLAlchemy session
+        workers: JobSpy worker processes (default AGENT_JOBSPY_WORKERS; 0 = in-process)
+        site_timeout: Per-site timeout in seconds for worker-pool mode
+        incremental: Only fetch postings newer than each query's watermark (default True)
+
+    Returns the ids of listings inserted or merged into during the search.
+    """
+    workers = AGENT_JOBSPY_WORKERS if workers is None else workers
+    site_timeout = AGENT_SITE_TIMEOUT if site_timeout is None else site_timeout
+    if not skills:
+        print("❌ No skills/roles provided. Aborting.")
+        return set()
+
+    search_roles = skills if isinstance(skills, list) else [skills]
+    search_roles = list(set([r for r in search_roles if r]))
+    
+    print(f"🔎 Searching for roles: {search_roles}")
+    print(f"   📍 Location: {location} | Mode: {scan_mode} | Exp: {experience_years}y")
+
+    filters = {
+        "experience_years": experience_years,
+        "is_internship": job_type == "internship",
+        "is_remote": location.lower() == "remote",
+        "incremental": incremental,
+    }
+
+    def jobspy_tasks(roles):
+        if workers > 0:
+            return [functools.partial(fetch_jobspy_parallel, roles, location, filters, workers, site_timeout)]
+        return [functools.partial(fetch_jobspy, role, location, filters) for role in roles]
+
+    result_ids = set()
+    if scan_mode == "DEEP":
+        result_ids |= run_pipeline(jobspy_tasks(search_roles), db).result_ids
+    else:
+        writer = run_pipeline(
+            [functools.partial(fetch_adzuna, role, location, filters) for role in search_roles], db
+        )
+        low_roles = [role for role in search_roles if writer.saved_by_tag[role] < 3]
+        for role in low_roles:
+            print(f"⚠️ Low results for '{role}'. Auto-triggering Deep Scan...")
+        result_ids |= writer.result_ids
+        if low_roles:
+            result_ids |= run_pipeline(jobspy_tasks(low_roles), db).result_ids
+
+    print("✅ Search completed.")
+    return result_ids
+
+def handle_ats_task(resume_text, job_description, user_id, job_id=None, resume_url=None, db=None):
+    """Analyzes a resume against a job description.
+    
+    Args:
+        resume_text: Raw resume text
+        job_description: Raw job description text
+        user_id: User ID for storing results
+        job_id: Optional job ID
+        resume_url: Optional URL to download PDF resume from
+        db: SQLAlchemy session
+    """
+    print(f"📄 Processing ATS analysis for user: {user_id}")
+
+    if resume_url:
+        print(f"   📥 Downloading Resume: {resume_url}")
+        try:
+            response = http_get(resume_url, "resume")
+            if response.status_code == 200:
+                # Cached by content hash: a resume checked before isn't parsed again
+                extracted = extract_resume_text(response.content, db)
+                if extracted.strip():
+                    resume_text = extracted
+                    print(f"   ✅ Extracted {len(resume_text)} chars")
+            else:
+                print(f"   ❌ Failed to download PDF: {response.status_code}")
+        except Exception as e:
+            print(f"   ❌ PDF Error: {e}")
+
+    analyzer = ATSAnalyzer()
+    score = analyzer.calculate_score(resume_text, job_description)
+    missing = analyzer.get_missing_keywords(resume_text, job_description)
+    
+    recommendations = []
+    if missing: recommendations.append(f"Missing keywords: {', '.join(missing[:5])}")
+    if score < 50: recommendations.append("Low match score. Tailor your resume.")
+    
+    try:
+        stmt = text("""
+            INSERT INTO resume_scores (user_id, job_id, score, missing_keywords, recommendations)
+            VALUES (:user_id, :job_id, :score, :missing, :recs)
+        """)
+        db.execute(stmt, {
+            "user_id": user_id, "job_id": job_id, "score": score,
+            "missing": json.dumps(missing), "recs": json.dumps(recommendations)
+        })
+        print(f"✅ ATS Score Saved: {score}")
+    except Exception as e:
+        print(f"❌ Failed to save ATS score: {e}")
+    db.commit()
+
+# =============================================================================
+# WORKER DAEMON — Consumes search_queue
+# =============================================================================
+#
+# A long-running alternative to one-shot GitHub Actions runs: imports, HTTP
+# pools and the dedupe indexes stay warm, and new queue items are picked up
+# within seconds (LISTEN/NOTIFY, with polling as the fallback).
+
+WORKER_POLL_INTERVAL = float(os.getenv("AGENT_POLL_INTERVAL", "5"))
+WORKER_INDEX_REFRESH = float(os.getenv("AGENT_INDEX_REFRESH", "600"))
+WORKER_LEASE_SECONDS = int(os.getenv("AGENT_LEASE_SECONDS", str(queue_crud.DEFAULT_LEASE_SECONDS)))
+# Identifies this process in search_queue.locked_by; several workers (and hosts) can run at once
+WORKER_ID = os.getenv("AGENT_WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}"
+
+def _search_args_from_item(item):
+    """Maps a SEARCH queue item (see /opportunities/discover) onto run_search arguments."""
+    filters = item.filters or {}
+    roles = filters.get("roles") or filters.get("skills") or [item.query]
+    locations = [l for l in filters.get("resolved_locations") or [] if l and l != "Unknown"]
+    return {
+        "skills": roles,
+        "location": filters.get("location") or (locations[0] if locations else "India"),
+        "job_type": filters.get("job_type"),
+        "limit": filters.get("limit") or 20,
+        "scan_mode": filters.get("scan_mode", "FAST"),
+        "experience_years": filters.get("experience_years") or 0,
+    }
+
+def _heartbeat_loop(item_id, stop):
+    """Keeps the lease on `item_id` alive until `stop` is set."""
+    db = SessionLocal()
+    try:
+        while not stop.wait(WORKER_LEASE_SECONDS / 3):
+            try:
+                if not queue_crud.heartbeat(db, item_id, WORKER_ID, WORKER_LEASE_SECONDS):
+                    print(f"⚠️ Lost lease on queue item {item_id}")
+                    return
+            except Exception as e:
+                print(f"⚠️ Heartbeat failed for {item_id}: {e}")
+                db.rollback()
+    finally:
+        db.close()
+
+def process_queue_item(item_id):
+    """Runs one claimed queue item in its own session and records the outcome."""
+    db = SessionLocal()
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat_loop, args=(item_id, stop), daemon=True).start()
+    try:
+        item = db.get(SearchQueue, item_id)
+        print(f"⚙️ [{item.task_type}] {item.id}: '{item.query}'")
+        result_ids = None
+        if item.task_type == "ATS":
+            payload = item.payload or {}
+            handle_ats_task(
+                resume_text=payload.get("resume_text", ""),
+                job_description=payload.get("job_description", ""),
+                user_id=payload.get("user_id") or item.user_id,
+                job_id=payload.get("job_id"),
+                resume_url=payload.get("resume_url"),
+                db=db,
+            )
+        else:
+            result_ids = run_search(db=db, **_search_args_from_item(item))
+        # Fans results out to every user whose request was coalesced into this item
+        queue_crud.mark_completed(db, item_id, worker_id=WORKER_ID, result_ids=result_ids)
+        print(f"✅ Queue item {item_id} completed")
+    except Exception as e:
+        print(f"❌ Queue item {item_id} failed: {e}")
+        db.rollback()
+        item = queue_crud.mark_failed(db, item_id, error=str(e)[:2000], worker_id=WORKER_ID)
+        if item is not None and item.status == SearchStatus.PENDING:
+            print(f"🔁 Queue item {item_id} re-queued (attempt {item.attempts}/{queue_crud.MAX_ATTEMPTS})")
+    finally:
+        stop.set()
+        db.close()
+
+class _QueueListener:
+    """LISTENs on the search_queue channel; falls back to plain polling if unavailable."""
+
+    def __init__(self, dsn):
+        self.conn = None
+        try:
+            import psycopg
+            self.conn = psycopg.connect(dsn.replace("postgresql+psycopg://", "postgresql://", 1), autocommit=True)
+            self.conn.execute(f"LISTEN {queue_crud.SEARCH_QUEUE_CHANNEL}")
+            print(f"👂 Listening on '{queue_crud.SEARCH_QUEUE_CHANNEL}'")
+        except Exception as e:
+            print(f"⚠️ LISTEN unavailable ({e}); polling every {WORKER_POLL_INTERVAL:.0f}s")
+            self.conn = None
+
+    def wait(self, timeout):
+        if self.conn is None:
+            time.sleep(timeout)
+            return
+        try:
+            for _ in self.conn.notifies(timeout=timeout, stop_after=1):
+                pass
+        except Exception as e:
+            print(f"⚠️ LISTEN connection lost ({e}); polling instead")
+            self.conn = None
+
+def run_worker(concurrency=2):
+    """Polls/LISTENs on search_queue and processes items with `concurrency` threads."""
+    global engine
+    print(f"👷 Worker {WORKER_ID} started (concurrency={concurrency})")
+    engine.dispose()
+    engine = _create_engine(concurrency)
+    SessionLocal.configure(bind=engine)
+    listener = _QueueListener(DATABASE_URL)
+    in_flight = set()
+    in_flight_lock = threading.Lock()
+    indexes_loaded_at = 0.0
+
+    def done(future, item_id):
+        with in_flight_lock:
+            in_flight.discard(item_id)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="queue") as executor:
+        while True:
+            items = []
+            db = SessionLocal()
+            try:
+                # Other writers insert listings too; keep the dedupe indexes fresh
+                if time.monotonic() - indexes_loaded_at > WORKER_INDEX_REFRESH:
+                    link_index.load(db)
+                    fingerprint_index.load(db)
+                    indexes_loaded_at = time.monotonic()
+
+                with in_flight_lock:
+                    free = concurrency - len(in_flight)
+                items = (
+                    queue_crud.claim_pending(db, WORKER_ID, limit=free, lease_seconds=WORKER_LEASE_SECONDS)
+                    if free > 0 else []
+                )
+                for item in items:
+                    with in_flight_lock:
+                        in_flight.add(item.id)
+                    future = executor.submit(process_queue_item, item.id)
+                    future.add_done_callback(functools.partial(done, item_id=item.id))
+            except Exception as e:
+                print(f"❌ Worker loop error: {e}")
+                db.rollback()
+            finally:
+                db.close()
+
+            if not items:
+                listener.wait(WORKER_POLL_INTERVAL)
+
+# =============================================================================
+# MAIN — On-Demand CLI Entry Point
+# =============================================================================
+
+def backfill_skill_ids(db, batch_size=500):
+    """
+    Fills skill_ids for listings stored before ingest computed them, from the
+    title and whatever description or snippet source_metadata kept.
+    """
+    total = 0
+    while True:
+        listings = db.scalars(
+            select(Opportunity).where(Opportunity.skill_ids.is_(None)).limit(batch_size)
+        ).all()
+        if not listings:
+            break
+        for op in listings:
+            meta = op.source_metadata or {}
+            op.skill_ids = skill_vector(op.role_title, meta.get("description") or meta.get("snippet") or "")
+        db.commit()
+        total += len(listings)
+        print(f"   🧩 Skill ids filled for {total} listings")
+    return total
+
+def backfill_location_ids(db, batch_size=500):
+    """
+    Resolves location_id for listings stored before ingest did. Listings whose
+    location the gazetteer doesn't know keep None, so pages advance by id.
+    """
+    total, last_id = 0, None
+    while True:
+        stmt = select(Opportunity).where(Opportunity.location_id.is_(None))
+        if last_id is not None:
+            stmt = stmt.where(Opportunity.id > last_id)
+        listings = db.scalars(stmt.order_by(Opportunity.id).limit(batch_size)).all()
+        if not listings:
+            break
+        for op in listings:
+            op.location_id = location_id(op.location or "")
+        db.commit()
+        last_id = listings[-1].id
+        total += len(listings)
+        print(f"   📍 Location ids checked for {total} listings")
+    return total
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="KaryaSync Job Agent — On-Demand Execution")
+    parser.add_argument("--skills", type=str, default=None, help="Comma-separated skills/roles to search (e.g. 'React Developer,Python Engineer')")
+    parser.add_argument("--location", type=str, default="India", help="Location to search in (default: India)")
+    parser.add_argument("--job_type", type=str, default=None, choices=["fulltime", "internship"], help="Job type filter")
+    parser.add_argument("--limit", type=int, default=20, help="Max results per query (default: 20)")
+    parser.add_argument("--mode", type=str, default="FAST", choices=["FAST", "DEEP"], help="Scan mode: FAST (Adzuna) or DEEP (JobSpy)")
+    parser.add_argument("--experience", type=int, default=0, help="Years of experience (default: 0)")
+    parser.add_argument("--workers", type=int, default=None, help="JobSpy worker processes; runs (role, site) pairs in parallel (default: AGENT_JOBSPY_WORKERS or 0 = off)")
+    parser.add_argument("--full-scan", action="store_true", help="Ignore per-query watermarks and rescan everything")
+    parser.add_argument("--site-timeout", type=float, default=None, help="Seconds before a slow JobSpy site is skipped in worker mode (default: 90)")
+    parser.add_argument("--worker", action="store_true", help="Run as a long-lived worker consuming search_queue")
+    parser.add_argument("--backfill-skills", action="store_true", help="Compute skill_ids for stored listings that have none, then exit")
+    parser.add_argument("--backfill-locations", action="store_true", help="Resolve location_id for stored listings that have none, then exit")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("AGENT_CONCURRENCY", "2")), help="Queue items processed in parallel in worker mode (default: 2)")
+    
+    args = parser.parse_args()
+
+    if args.worker:
+        print("🚀 Agent Started (Worker Mode)")
+        try:
+            run_worker(concurrency=max(1, args.concurrency))
+        except KeyboardInterrupt:
+            print("🏁 Worker stopped.")
+        return
+
+    if args.backfill_skills or args.backfill_locations:
+        db = SessionLocal()
+        try:
+            if args.backfill_skills:
+                backfill_skill_ids(db)
+            if args.backfill_locations:
+                backfill_location_ids(db)
+        finally:
+            db.close()
+        return
+
+    if not args.skills:
+        parser.error("--skills is required unless --worker or a --backfill-* flag is set")
+
+    print("🚀 Agent Started (On-Demand Mode)")
+    print(f"   Skills: {args.skills}")
+    print(f"   Location: {args.location} | Mode: {args.mode} | Type: {args.job_type or 'any'}")
+
+    # Connect to database
+    try:
+        db = SessionLocal()
+        print("✅ Database Connected")
+        link_index.load(db)
+        fingerprint_index.load(db)
+    except Exception as e:
+        print(f"❌ Fatal Error: DB Connection Failed: {e}")
+        sys.exit(1)
+
+    try:
+        skills_list = [s.strip() for s in args.skills.split(",") if s.strip()]
+        
+        run_search(
+            skills=skills_list,
+            location=args.location,
+            job_type=args.job_type,
+            limit=args.limit,
+            scan_mode=args.mode,
+            experience_years=args.experience,
+            db=db,
+            workers=args.workers,
+            site_timeout=args.site_timeout,
+            incremental=not args.full_scan
+        )
+
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        try:
+            db.rollback()
+        except Exception:
+            pass
+
+    finally:
+        try:
+            db.close()
+            print("🔌 DB Connection Closed.")
+        except Exception:
+            pass
+
+    print("🏁 Agent exiting.")
+
+if __name__ == "__main__":
+    main()
+
@@ -0,0 +1,172 @@
+"""
+ATS scoring benchmark: fit-per-request CountVectorizer vs the shared term vectors.
+
+The legacy functions below are verbatim copies of ATSAnalyzer.calculate_score /
+get_missing_keywords as they were in backend/app/services/ats_logic.py. Both
+paths score a generated set of resume/JD pairs; any disagreement is reported
+before timings. The one-vs-many row shows the hashed vectors (HASHER) scoring
+one resume against every JD in a single sparse product. Usage (from local_agent/):
+
+    python benchmarks/bench_ats.py [--pairs 500] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, CountVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "..", "backend"))
+
+from app.services.text_vectors import hashed_vectors, match_score, missing_terms, term_vector  # noqa: E402
+
+
+# -----------------------------------------------------------------------------
+# Legacy scoring (previous ats_logic.py)
+# -----------------------------------------------------------------------------
+
+def legacy_calculate_score(resume_text, jd_text):
+    if not resume_text or not jd_text:
+        return 0
+    text_list = [resume_text, jd_text]
+    cv = CountVectorizer()
+    count_matrix = cv.fit_transform(text_list)
+    match_percentage = cosine_similarity(count_matrix)[0][1] * 100
+    return round(match_percentage, 2)
+
+
+def legacy_get_missing_keywords(resume_text, jd_text):
+    if not jd_text:
+        return []
+    cv = CountVectorizer(stop_words='english', max_features=20)
+    try:
+        cv.fit([jd_text])
+        keywords = cv.get_feature_names_out()
+    except ValueError:
+        return []
+    resume_lower = resume_text.lower()
+    missing_keywords = []
+    for keyword in keywords:
+        if not re.search(r'\b' + re.escape(keyword) + r'\b', resume_lower):
+            missing_keywords.append(keyword)
+    return missing_keywords
+
+
+def legacy(resume_text, jd_text):
+    return legacy_calculate_score(resume_text, jd_text), legacy_get_missing_keywords(resume_text, jd_text)
+
+
+def agrees(resume_text, jd_text):
+    """
+    Same score and same missing keywords, except among terms tied at the
+    20th-most-frequent count: CountVectorizer breaks that tie with an unstable
+    argsort, the engine alphabetically.
+    """
+    (legacy_score, legacy_missing), (score, missing) = legacy(resume_text, jd_text), engine(resume_text, jd_text)
+    jd_vec = term_vector(jd_text)
+    counts = sorted((c for t, c in jd_vec.items() if t not in ENGLISH_STOP_WORDS), reverse=True)
+    cutoff = counts[19] if len(counts) > 20 else 0
+
+    def above(terms):
+        return {t for t in terms if jd_vec[t] > cutoff}
+
+    return legacy_score == score and above(legacy_missing) == above(missing)
+
+
+def engine(resume_text, jd_text):
+    # As ATSAnalyzer.analyze: each text is vectorized once
+    resume_vec, jd_vec = term_vector(resume_text), term_vector(jd_text)
+    return match_score(resume_vec, jd_vec), missing_terms(resume_vec, jd_vec, 20)
+
+
+# -----------------------------------------------------------------------------
+# Corpus
+# -----------------------------------------------------------------------------
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "React", "Node.js", "Django", "FastAPI", "SQL",
+    "PostgreSQL", "MongoDB", "AWS", "Docker", "Kubernetes", "Git", "Linux", "C++", "Go", "Spark",
+    "Pandas", "TensorFlow", "Figma", "REST", "GraphQL", "Redis", "Kafka", "Terraform", "Excel",
+]
+FILLER = [
+    "built", "designed", "maintained", "services", "team", "customers", "platform", "data",
+    "pipelines", "scalable", "testing", "deployment", "ownership", "collaborate", "product",
+    "features", "performance", "reliability", "users", "dashboards", "analytics", "mentored",
+]
+JD_LINES = [
+    "We are looking for an engineer with experience in {a} and {b}.",
+    "You will work on {a} services and improve {b} performance.",
+    "Strong knowledge of {a}, {b} and {c} is required.",
+    "Nice to have: {a} or {b}. The team values ownership and testing.",
+    "Responsibilities include building {a} pipelines and {b} dashboards.",
+]
+
+
+def _resume(rng):
+    skills = rng.sample(SKILLS, rng.randint(4, 10))
+    lines = [f"Skills: {', '.join(skills)}"]
+    for _ in range(rng.randint(6, 20)):
+        words = rng.choices(FILLER, k=rng.randint(6, 14)) + rng.sample(skills, 2)
+        rng.shuffle(words)
+        lines.append(" ".join(words).capitalize() + ".")
+    return "\n".join(lines)
+
+
+def _jd(rng):
+    lines = []
+    for _ in range(rng.randint(4, 12)):
+        a, b, c = rng.sample(SKILLS, 3)
+        lines.append(rng.choice(JD_LINES).format(a=a, b=b, c=c))
+    return " ".join(lines)
+
+
+def corpus(size, seed=42):
+    rng = random.Random(seed)
+    return [(_resume(rng), _jd(rng)) for _ in range(size)]
+
+
+def timed(fn, pairs, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for resume_text, jd_text in pairs:
+            fn(resume_text, jd_text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pairs) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pairs = corpus(args.pairs)
+    mismatches = [p for p in pairs if not agrees(*p)]
+    print(f"Agreement: {len(pairs) - len(mismatches)}/{len(pairs)} pairs")
+    for resume_text, jd_text in mismatches[:5]:
+        print(f"  MISMATCH: {legacy(resume_text, jd_text)} != {engine(resume_text, jd_text)}")
+
+    legacy_us = timed(legacy, pairs, args.repeat)
+    engine_us = timed(engine, pairs, args.repeat)
+    print(f"fit-per-request CountVectorizer: {legacy_us:7.1f} µs/request  ({legacy_us / engine_us:.1f}x engine)")
+    print(f"shared term vectors:             {engine_us:7.1f} µs/request")
+
+    # One resume against every JD: the JD rows are hashed once up front
+    jd_matrix = hashed_vectors(jd for _, jd in pairs)
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for resume_text, _ in pairs[:50]:
+            jd_matrix.dot(hashed_vectors([resume_text]).T)
+        best = min(best, time.perf_counter() - start)
+    print(f"hashed one-vs-many ({len(pairs)} JDs):   {best / 50 * 1e6 / len(pairs):7.1f} µs/pair")
+
+
+if __name__ == "__main__":
+    main()
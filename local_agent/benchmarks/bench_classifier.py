@@ -0,0 +1,231 @@
+"""
+Classification benchmark: the per-function heuristics vs the single-pass engine.
+
+The legacy functions below are verbatim copies of the agent's previous
+is_entry_level / detect_job_type / extract_salary / _detect_work_mode and the
+discovery NLPProcessor. Both paths run over a generated corpus of postings;
+any disagreement is reported before timings. Usage (from local_agent/):
+
+    python benchmarks/bench_classifier.py [--postings 2000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "..", "backend"))
+
+from app.models import JobType, WorkMode  # noqa: E402
+from app.services.classifier import classify  # noqa: E402
+
+
+# -----------------------------------------------------------------------------
+# Legacy heuristics (previous agent_main.py / job_discovery.py)
+# -----------------------------------------------------------------------------
+
+def legacy_is_entry_level(title, description, experience_years=0):
+    if experience_years > 0:
+        return True
+    title_lower = title.lower()
+    desc_lower = description.lower()
+    senior_titles = ["senior", "lead", "principal", "manager", "architect", "head", "vp", "director"]
+    junior_titles = ["junior", "jr", "intern", "trainee", "entry level", "fresher", "graduate"]
+    if any(t in title_lower for t in senior_titles):
+        return False
+    if any(t in title_lower for t in junior_titles):
+        return True
+    strict_min_exp_pattern = r"(minimum|required|requires|experience)\s*(?:of|:)?\s*[2-9]\s*(?:\+|plus)?\s*(?:years|yrs)"
+    if re.search(strict_min_exp_pattern, desc_lower):
+        return False
+    return True
+
+
+def legacy_detect_job_type(title, description):
+    t_lower = title.lower()
+    d_lower = description.lower()
+
+    def has_word(text, word):
+        return re.search(r'\b' + re.escape(word) + r'\b', text) is not None
+
+    intern_keywords = ['intern', 'internship', 'trainee', 'apprentice', 'students', 'summer', 'placement']
+    if any(k in t_lower for k in intern_keywords) or any(has_word(d_lower, k) for k in intern_keywords):
+        return JobType.INTERNSHIP
+    contract_keywords = ['contract', 'freelance', 'temporary', 'part-time', 'part time']
+    if any(k in t_lower for k in contract_keywords) or any(has_word(d_lower, k) for k in contract_keywords):
+        return JobType.CONTRACT
+    return JobType.FULL_TIME
+
+
+def legacy_extract_salary(description):
+    if not description: return None, None
+    desc = description.lower()
+    lpa_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:-|to)?\s*(\d+(?:\.\d+)?)?\s*lpa', desc)
+    if lpa_match:
+        min_lpa = float(lpa_match.group(1))
+        max_lpa = float(lpa_match.group(2)) if lpa_match.group(2) else min_lpa
+        return int(min_lpa * 100000), int(max_lpa * 100000)
+    k_matches = re.findall(r'(\d{2,3})\s*k', desc)
+    if k_matches:
+        vals = sorted(int(x) * 1000 for x in k_matches)
+        return vals[0], vals[-1]
+    rs_matches = re.findall(r'(?:rs\.?|₹|inr)\s*(\d{1,3}(?:,\d{3})*(?:000|500))', desc)
+    if rs_matches:
+        vals = sorted(int(x.replace(',', '')) for x in rs_matches)
+        clean_vals = [v for v in vals if v > 1000]
+        if clean_vals:
+            return clean_vals[0], clean_vals[-1]
+    return None, None
+
+
+def legacy_work_mode(location, description):
+    desc_lower = description.lower()
+    if "remote" in location.lower() or "remote" in desc_lower:
+        return WorkMode.REMOTE
+    if "hybrid" in desc_lower:
+        return WorkMode.HYBRID
+    return WorkMode.ONSITE
+
+
+def legacy_nlp_location(snippet, default):
+    cities = ["Bangalore", "Bengaluru", "Mumbai", "Delhi", "Hyderabad", "Pune", "Chennai", "Gurgaon", "Noida", "Remote"]
+    for city in cities:
+        if city.lower() in snippet.lower():
+            return city
+    return default
+
+
+def legacy_nlp_salary(snippet):
+    match = re.search(r'(\d+(\.\d+)?\s?-\s?\d+(\.\d+)?\s?LPA)|(\d+\s?LPA)', snippet, re.IGNORECASE)
+    return match.group(0) if match else "Not Disclosed"
+
+
+def legacy_nlp_job_type(snippet):
+    snippet_lower = snippet.lower()
+    if "intern" in snippet_lower:
+        return JobType.INTERNSHIP
+    if "contract" in snippet_lower or "freelance" in snippet_lower:
+        return JobType.CONTRACT
+    return JobType.FULL_TIME
+
+
+def legacy_nlp_work_mode(snippet):
+    snippet_lower = snippet.lower()
+    if "remote" in snippet_lower:
+        return WorkMode.REMOTE
+    if "hybrid" in snippet_lower:
+        return WorkMode.HYBRID
+    return WorkMode.ONSITE
+
+
+def legacy(title, description, location):
+    # Location is not compared: the engine resolves it through the gazetteer
+    # (aliases, structured field first), which differs from the city list by design
+    legacy_nlp_location(description, None)
+    return (
+        legacy_is_entry_level(title, description),
+        legacy_detect_job_type(title, description),
+        legacy_extract_salary(description),
+        legacy_work_mode(location, description),
+        legacy_nlp_salary(description),
+        legacy_nlp_job_type(f"{title} {description}"),
+        legacy_nlp_work_mode(f"{title} {description}"),
+    )
+
+
+def engine(title, description, location):
+    result = classify(title, description, location)
+    return (
+        result.is_entry_level(),
+        result.job_type,
+        (result.salary_min, result.salary_max),
+        result.work_mode,
+        result.salary_text or "Not Disclosed",
+        result.loose_job_type,
+        result.loose_work_mode,
+    )
+
+
+# -----------------------------------------------------------------------------
+# Corpus
+# -----------------------------------------------------------------------------
+
+TITLES = [
+    "Software Engineer", "Senior Backend Developer", "Data Analyst Intern", "Lead Frontend Engineer",
+    "Junior Python Developer", "Product Manager", "Graduate Trainee - Operations", "DevOps Engineer",
+    "Contract QA Engineer", "Part-time Content Writer", "International Sales Associate", "Jr. ML Engineer",
+]
+SENTENCES = [
+    "We are looking for a motivated engineer to join our platform team.",
+    "You will build APIs in Python and Go, backed by PostgreSQL and Redis.",
+    "Minimum 3 years of experience with distributed systems is required.",
+    "Experience: 2+ yrs in React.",
+    "Requires 5 years building data pipelines.",
+    "Compensation: 12-18 LPA depending on experience.",
+    "CTC 6 LPA plus benefits.",
+    "Stipend of 25k - 30k per month for students.",
+    "Salary Rs. 45,000 per month.",
+    "Pay: ₹8,500 weekly allowance.",
+    "This is a remote-first role with quarterly offsites.",
+    "Hybrid working from our Bengaluru office three days a week.",
+    "Located in Pune, Maharashtra.",
+    "Open to candidates in Delhi NCR, Gurgaon and Noida.",
+    "This is a 6-month contract with possible extension.",
+    "Summer internship for final-year students.",
+    "Freelance engagements are welcome.",
+    "Temporary position covering parental leave.",
+    "We value ownership, curiosity and kindness.",
+    "Our internal tools team supports 400 engineers.",
+]
+LOCATIONS = ["Bengaluru, India", "Remote", "Mumbai", "", "Hyderabad, Telangana"]
+
+
+def corpus(size, seed=42):
+    rng = random.Random(seed)
+    postings = []
+    for _ in range(size):
+        description = " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(8, 30)))
+        postings.append((rng.choice(TITLES), description, rng.choice(LOCATIONS)))
+    return postings
+
+
+def timed(fn, postings, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for title, description, location in postings:
+            fn(title, description, location)
+    return (time.perf_counter() - start) / (repeat * len(postings)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--postings", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    postings = corpus(args.postings)
+    mismatches = [p for p in postings if legacy(*p) != engine(*p)]
+    print(f"Agreement: {len(postings) - len(mismatches)}/{len(postings)} postings")
+    for title, description, location in mismatches[:5]:
+        print(f"  MISMATCH {title!r}: {legacy(title, description, location)} != {engine(title, description, location)}")
+
+    # The agent's classify stage: bouncer + job type + work mode + salary per posting
+    def legacy_stage(title, description, location):
+        legacy_is_entry_level(title, description)
+        legacy_detect_job_type(title, description)
+        legacy_work_mode(location, description)
+        legacy_extract_salary(description)
+
+    legacy_us = timed(legacy_stage, postings, args.repeat)
+    everything_us = timed(legacy, postings, args.repeat)
+    engine_us = timed(classify, postings, args.repeat)
+    print(f"legacy agent stage:   {legacy_us:7.1f} µs/posting  ({legacy_us / engine_us:.1f}x engine)")
+    print(f"legacy + NLPProcessor: {everything_us:6.1f} µs/posting  ({everything_us / engine_us:.1f}x engine)")
+    print(f"single-pass engine:   {engine_us:7.1f} µs/posting")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Portal extraction benchmark: BeautifulSoup (previous path) vs extract.py.
+
+Runs both parsers over the saved portal fixtures in tests/fixtures/portal and
+reports the time per page. Usage (from local_agent/):
+
+    python benchmarks/bench_portal_extract.py [--repeat 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from extract import extract, extract_links  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(HERE), "tests", "fixtures", "portal")
+
+
+def bs4_links(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [a["href"] for a in soup.find_all("a", href=True)]
+
+
+def bs4_page(html):
+    soup = BeautifulSoup(html, "html.parser")
+    title = ""
+    if soup.h1: title = soup.h1.get_text().strip()
+    elif soup.title: title = soup.title.get_text().strip()
+    return title, soup.get_text()
+
+
+def fast_page(html):
+    page = extract(html)
+    return page.heading, page.text
+
+
+def bench(fn, html, repeat):
+    fn(html)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(html)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    cases = [
+        ("listing.html", "links", bs4_links, extract_links),
+        ("job.html", "page", bs4_page, fast_page),
+    ]
+    print(f"{'fixture':<14} {'task':<6} {'size':>8} {'bs4 ms':>9} {'fast ms':>9} {'speedup':>8}")
+    for name, task, slow, fast in cases:
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            html = f.read()
+        slow_ms = bench(slow, html, args.repeat)
+        fast_ms = bench(fast, html, args.repeat)
+        print(f"{name:<14} {task:<6} {len(html) // 1024:>6}KB {slow_ms:>9.2f} {fast_ms:>9.2f} {slow_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Native JSON board adapters for hosted ATS career portals.
+
+Greenhouse, Lever and Ashby serve every open posting of a company, with its
+full description, from one public JSON endpoint. When a portal is hosted on
+one of them (or a company page embeds/links to one), a single board request
+replaces scraping the listing page and then fetching job pages one by one.
+
+Each adapter normalizes its provider's payload to the same plain dict:
+    {title, url, location, description, employment_type, remote,
+     salary_min, salary_max, salary_currency, salary_interval, posted_at,
+     provider, external_id}
+Salary amounts, currency and interval are passed through as the provider
+states them; the agent normalizes them to annual INR.
+"""
+
+import html
+import re
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlsplit
+
+from extract import extract
+from throttle import http_get
+
+# host pattern -> provider; the first path segment is the board token and an
+# ".eu." host marks a board hosted in the provider's EU region
+_HOSTS = [
+    (re.compile(r"^(?:boards|job-boards)(\.eu)?\.greenhouse\.io$"), "greenhouse"),
+    (re.compile(r"^jobs(\.eu)?\.lever\.co$"), "lever"),
+    (re.compile(r"^jobs\.ashbyhq\.com$"), "ashby"),
+]
+
+BOARD_URLS = {
+    "greenhouse": "https://boards-api.greenhouse.io/v1/boards/{token}/jobs?content=true",
+    "lever": "https://api.lever.co/v0/postings/{token}?mode=json",
+    "ashby": "https://api.ashbyhq.com/posting-api/job-board/{token}?includeCompensation=true",
+}
+
+# (provider, region) -> API for boards outside the default region; EU Lever
+# boards are not served by api.lever.co
+REGIONAL_BOARD_URLS = {
+    ("lever", "eu"): "https://api.eu.lever.co/v0/postings/{token}?mode=json",
+}
+
+_RESERVED_SEGMENTS = {"embed", "v1", "jobs"}
+
+
+def detect_board(url):
+    """Returns (provider, board_token, region) for a hosted ATS board URL, else None."""
+    parts = urlsplit(url or "")
+    host = (parts.hostname or "").lower()
+    for pattern, provider in _HOSTS:
+        match = pattern.match(host)
+        if not match:
+            continue
+        region = "eu" if match.groups() and match.group(1) else None
+        # Greenhouse embeds: boards.greenhouse.io/embed/job_board?for=<token>
+        token = parse_qs(parts.query).get("for", [None])[0]
+        if not token:
+            segments = [s for s in parts.path.split("/") if s]
+            if segments and segments[0] not in _RESERVED_SEGMENTS:
+                token = segments[0]
+        return (provider, token, region) if token else None
+    return None
+
+
+def detect_board_in_links(links):
+    """First hosted board referenced by a portal page's links (company pages often link out)."""
+    for link in links:
+        board = detect_board(link)
+        if board:
+            return board
+    return None
+
+
+def _html_to_text(markup):
+    return extract(markup or "").text
+
+
+def _iso(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc)
+    except ValueError:
+        return None
+
+
+def _epoch_ms(value):
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc) if value else None
+
+
+def parse_greenhouse(data):
+    jobs = []
+    for job in data.get("jobs", []):
+        jobs.append({
+            "title": job.get("title", "").strip(),
+            "url": job.get("absolute_url"),
+            "location": (job.get("location") or {}).get("name", ""),
+            # `content` is HTML-escaped HTML
+            "description": _html_to_text(html.unescape(job.get("content", ""))),
+            "employment_type": None,
+            "remote": None,
+            "salary_min": None,
+            "salary_max": None,
+            "salary_currency": None,
+            "salary_interval": None,
+            "posted_at": _iso(job.get("first_published") or job.get("updated_at")),
+            "provider": "greenhouse",
+            "external_id": job.get("id"),
+        })
+    return jobs
+
+
+def parse_lever(data):
+    jobs = []
+    for job in data:
+        categories = job.get("categories") or {}
+        salary = job.get("salaryRange") or {}
+        description = job.get("descriptionPlain") or _html_to_text(job.get("description"))
+        lists = " ".join(
+            f"{block.get('text', '')} {_html_to_text(block.get('content'))}" for block in job.get("lists") or []
+        )
+        jobs.append({
+            "title": job.get("text", "").strip(),
+            "url": job.get("hostedUrl"),
+            "location": categories.get("location") or ", ".join(categories.get("allLocations") or []),
+            "description": f"{description} {lists} {job.get('additionalPlain', '')}".strip(),
+            "employment_type": categories.get("commitment"),
+            "remote": (job.get("workplaceType") == "remote") if job.get("workplaceType") else None,
+            "salary_min": salary.get("min"),
+            "salary_max": salary.get("max"),
+            "salary_currency": salary.get("currency"),
+            "salary_interval": salary.get("interval"),
+            "posted_at": _epoch_ms(job.get("createdAt")),
+            "provider": "lever",
+            "external_id": job.get("id"),
+        })
+    return jobs
+
+
+def _ashby_salary(job):
+    for tier in ((job.get("compensation") or {}).get("summaryComponents") or []):
+        if tier.get("compensationType") == "Salary":
+            return tier
+    return {}
+
+
+def parse_ashby(data):
+    jobs = []
+    for job in data.get("jobs", []):
+        if job.get("isListed") is False:
+            continue
+        salary = _ashby_salary(job)
+        jobs.append({
+            "title": job.get("title", "").strip(),
+            "url": job.get("jobUrl"),
+            "location": job.get("location", ""),
+            "description": job.get("descriptionPlain") or _html_to_text(job.get("descriptionHtml")),
+            "employment_type": job.get("employmentType"),
+            "remote": job.get("isRemote"),
+            "salary_min": salary.get("minValue"),
+            "salary_max": salary.get("maxValue"),
+            "salary_currency": salary.get("currencyCode"),
+            "salary_interval": salary.get("interval"),
+            "posted_at": _iso(job.get("publishedAt")),
+            "provider": "ashby",
+            "external_id": job.get("id"),
+        })
+    return jobs
+
+
+PARSERS = {
+    "greenhouse": parse_greenhouse,
+    "lever": parse_lever,
+    "ashby": parse_ashby,
+}
+
+
+def fetch_board(provider, token, region=None):
+    """
+    Fetches a whole board in one request.
+    Returns (postings, status) with status "OK" or the HTTP status code.
+    """
+    url = REGIONAL_BOARD_URLS.get((provider, region), BOARD_URLS[provider])
+    resp = http_get(url.format(token=token), "portal", timeout=15)
+    if resp.status_code != 200:
+        return [], resp.status_code
+    return [job for job in PARSERS[provider](resp.json()) if job["url"] and job["title"]], "OK"
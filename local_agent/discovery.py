@@ -0,0 +1,259 @@
+"""
+Structured discovery for generic career sites.
+
+Career sites that aren't on a hosted ATS (see boards.py) are otherwise crawled
+by guessing job links from URL paths and reading each page's <h1>. Two
+standard sources make that cheaper and more accurate:
+
+* sitemap.xml (plus `Sitemap:` lines in robots.txt) and RSS/Atom job feeds
+  list posting URLs together with a last-modified date, so unchanged
+  postings can be skipped without fetching them;
+* schema.org `JobPosting` JSON-LD gives title, location, employment type,
+  salary and datePosted as structured fields instead of regex guesses.
+
+JobPostings are normalized to the same dict as the JSON board adapters, so
+the agent parses both the same way.
+"""
+
+import html
+import json
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlsplit
+
+from defusedxml import DefusedXmlException
+from defusedxml import ElementTree as ET
+
+from extract import extract, fetch_capped
+
+_JOB_WORDS = r"jobs?|careers?|positions?|openings?|roles?|vacanc(?:y|ies)|opportunit(?:y|ies)"
+# A job word followed by a segment of its own (/careers/1001-backend-developer),
+# so listing pages such as /careers/ or /careers/jobs/ are not taken for postings
+JOB_PATH = re.compile(rf"/(?:{_JOB_WORDS})[/-](?!(?:{_JOB_WORDS})?/?$)[^/]", re.I)
+MAX_SITEMAPS = 5
+SITEMAP_BYTES = 5_000_000
+
+# -----------------------------------------------------------------------------
+# Dates
+# -----------------------------------------------------------------------------
+
+def parse_date(value):
+    """ISO-8601 (sitemaps, JSON-LD, Atom) or RFC 822 (RSS) date -> aware UTC datetime."""
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+# -----------------------------------------------------------------------------
+# JSON-LD JobPosting
+# -----------------------------------------------------------------------------
+
+def _iter_nodes(data):
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _iter_nodes(data["@graph"])
+
+
+def _is_job_posting(node):
+    kind = node.get("@type")
+    kinds = kind if isinstance(kind, list) else [kind]
+    return "JobPosting" in kinds
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _location(node):
+    places = []
+    for place in _as_list(node.get("jobLocation")):
+        address = place.get("address", place) if isinstance(place, dict) else place
+        if isinstance(address, str):
+            places.append(address)
+            continue
+        if not isinstance(address, dict):
+            continue
+        country = address.get("addressCountry")
+        if isinstance(country, dict):
+            country = country.get("name")
+        parts = [address.get("addressLocality"), address.get("addressRegion"), country]
+        text = ", ".join(p for p in parts if isinstance(p, str) and p)
+        if text:
+            places.append(text)
+    return "; ".join(dict.fromkeys(places))
+
+
+def _salary(node):
+    """(min, max, currency, unitText) of baseSalary, as stated on the page."""
+    salary = node.get("baseSalary")
+    if not isinstance(salary, dict):
+        return None, None, None, None
+    value = salary.get("value", salary)
+    if not isinstance(value, dict):
+        value = {"value": value}
+
+    def amount(key):
+        try:
+            return float(value[key]) if value.get(key) is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    low = amount("minValue") or amount("value")
+    high = amount("maxValue") or low
+    return low, high, salary.get("currency"), value.get("unitText") or salary.get("unitText")
+
+
+def job_postings(jsonld_blocks, page_url):
+    """Normalized postings from a page's JSON-LD blocks (malformed blocks are ignored)."""
+    jobs = []
+    for block in jsonld_blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        for node in _iter_nodes(data):
+            if not _is_job_posting(node) or not node.get("title"):
+                continue
+            salary_min, salary_max, currency, interval = _salary(node)
+            location_types = [str(t).upper() for t in _as_list(node.get("jobLocationType"))]
+            identifier = node.get("identifier")
+            jobs.append({
+                "title": re.sub(r"\s+", " ", str(node["title"])).strip(),
+                "url": urljoin(page_url, node.get("url") or page_url),
+                "location": _location(node) or ("Remote" if "TELECOMMUTE" in location_types else ""),
+                # Often HTML, sometimes entity-escaped HTML
+                "description": extract(html.unescape(str(node.get("description") or ""))).text,
+                "employment_type": ", ".join(str(t) for t in _as_list(node.get("employmentType"))) or None,
+                "remote": "TELECOMMUTE" in location_types or None,
+                "salary_min": salary_min,
+                "salary_max": salary_max,
+                "salary_currency": currency,
+                "salary_interval": interval,
+                "posted_at": parse_date(node.get("datePosted")),
+                "provider": "jsonld",
+                "external_id": identifier.get("value") if isinstance(identifier, dict) else identifier,
+            })
+    return jobs
+
+
+# -----------------------------------------------------------------------------
+# Sitemaps and feeds
+# -----------------------------------------------------------------------------
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(element, name):
+    for child in element:
+        if _local(child.tag) == name:
+            return (child.text or "").strip()
+    return ""
+
+
+def parse_sitemap(xml_text):
+    """Returns ({url: lastmod}, [child sitemap urls]) for a urlset or sitemapindex."""
+    urls, children = {}, []
+    try:
+        root = ET.fromstring(xml_text.encode("utf-8") if isinstance(xml_text, str) else xml_text)
+    except (ET.ParseError, DefusedXmlException):
+        return urls, children
+    kind = _local(root.tag)
+    for entry in root:
+        loc = _child_text(entry, "loc")
+        if not loc:
+            continue
+        if kind == "sitemapindex":
+            children.append(loc)
+        elif kind == "urlset":
+            urls[loc] = parse_date(_child_text(entry, "lastmod"))
+    return urls, children
+
+
+def parse_feed(xml_text):
+    """Returns {url: date} for the items of an RSS 2.0 or Atom feed."""
+    urls = {}
+    try:
+        root = ET.fromstring(xml_text.encode("utf-8") if isinstance(xml_text, str) else xml_text)
+    except (ET.ParseError, DefusedXmlException):
+        return urls
+    for element in root.iter():
+        name = _local(element.tag)
+        if name == "item":
+            link = _child_text(element, "link")
+            if link:
+                urls[link] = parse_date(_child_text(element, "pubDate"))
+        elif name == "entry":
+            href = next((c.get("href") for c in element if _local(c.tag) == "link" and c.get("href")), None)
+            if href:
+                urls[href] = parse_date(_child_text(element, "updated") or _child_text(element, "published"))
+    return urls
+
+
+def _get(url):
+    try:
+        status, body = fetch_capped(url, "portal", max_bytes=SITEMAP_BYTES, timeout=10,
+                                    headers={"User-Agent": "Mozilla/5.0"})
+    except Exception:
+        return None
+    return body if status == 200 else None
+
+
+def _sitemap_candidates(portal_link):
+    parts = urlsplit(portal_link)
+    root = f"{parts.scheme}://{parts.netloc}"
+    candidates = []
+    robots = _get(f"{root}/robots.txt") or ""
+    for line in robots.splitlines():
+        if line.lower().startswith("sitemap:"):
+            candidates.append(line.split(":", 1)[1].strip())
+    candidates.append(f"{root}/sitemap.xml")
+    return list(dict.fromkeys(candidates))
+
+
+def discover_posting_urls(portal_link, feed_links=()):
+    """
+    Posting URLs (with last-modified dates, or None) from the site's sitemaps
+    and any job feeds the portal page advertises. Only job-like paths are kept;
+    sitemap indexes are followed for job/career child sitemaps first.
+    """
+    found = {}
+    for feed in feed_links:
+        body = _get(urljoin(portal_link, feed))
+        if body:
+            found.update(parse_feed(body))
+
+    queue = _sitemap_candidates(portal_link)
+    fetched = 0
+    while queue and fetched < MAX_SITEMAPS:
+        body = _get(queue.pop(0))
+        fetched += 1
+        if not body:
+            continue
+        urls, children = parse_sitemap(body)
+        found.update(urls)
+        # Job sitemaps (e.g. /sitemap-jobs.xml) before the rest of the site
+        queue.extend(sorted(children, key=lambda c: not JOB_PATH.search(c) and "job" not in c.lower()))
+
+    host = urlsplit(portal_link).hostname
+    return {
+        url: lastmod for url, lastmod in found.items()
+        if urlsplit(url).hostname == host and JOB_PATH.search(urlsplit(url).path)
+    }
@@ -0,0 +1,162 @@
+"""
+Lightweight HTML extraction for career portals.
+
+Portal scans only need a page's anchors, its title/first <h1>, its visible
+text, and any JSON-LD blocks / feed links for structured discovery.
+Building a full BeautifulSoup tree for that is the slowest part of a portal
+scan, so this module streams the markup through the stdlib tokenizer
+(`html.parser.HTMLParser`) and keeps just those pieces — no tree, no extra
+dependency. Bodies are downloaded with a byte cap so one huge page can't stall
+a fetch worker or blow up memory.
+"""
+
+import os
+import re
+from html.parser import HTMLParser
+
+from throttle import http_get
+
+MAX_PAGE_BYTES = int(os.getenv("AGENT_MAX_PAGE_BYTES", str(1_500_000)))
+
+# Content of these elements is never rendered as text
+_INVISIBLE = {"script", "style", "template", "noscript", "svg"}
+_SPACE = re.compile(r"\s+")
+_FEED_TYPES = {"application/rss+xml", "application/atom+xml"}
+# Elements that break text flow; inline ones (<b>, <a>, <span>) join without a space
+_BLOCKS = {
+    "p", "div", "br", "li", "ul", "ol", "tr", "td", "th", "table", "section", "article",
+    "header", "footer", "nav", "main", "aside", "h1", "h2", "h3", "h4", "h5", "h6",
+    "dt", "dd", "blockquote", "pre", "hr", "form", "option",
+}
+
+
+class _Extractor(HTMLParser):
+    def __init__(self, want_text):
+        super().__init__(convert_charrefs=True)
+        self.want_text = want_text
+        self.links = []
+        self.title_parts = []
+        self.h1_parts = []
+        self.text_parts = []
+        self.jsonld = []
+        self.feeds = []
+        self._jsonld_parts = None   # collecting a <script type="application/ld+json">
+        self._skip = 0          # depth inside invisible elements
+        self._in_title = False
+        self._h1_state = 0      # 0 = not seen, 1 = inside first h1, 2 = done
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _BLOCKS:
+            self.text_parts.append(" ")
+        if tag == "a":
+            for name, value in attrs:
+                if name == "href" and value:
+                    self.links.append(value.strip())
+                    break
+        elif tag in _INVISIBLE:
+            self._skip += 1
+            if tag == "script" and (dict(attrs).get("type") or "").lower() == "application/ld+json":
+                self._jsonld_parts = []
+        elif tag == "link":
+            self._link(attrs)
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "h1" and self._h1_state == 0:
+            self._h1_state = 1
+
+    def handle_startendtag(self, tag, attrs):
+        # <a href="..."/> and friends; void invisible tags have no content to skip
+        if tag in ("a", "link", "br", "hr"):
+            self.handle_starttag(tag, attrs)
+
+    def _link(self, attrs):
+        attrs = dict(attrs)
+        if (attrs.get("rel") or "").lower() == "alternate" and (attrs.get("type") or "").lower() in _FEED_TYPES:
+            if attrs.get("href"):
+                self.feeds.append(attrs["href"].strip())
+
+    def handle_endtag(self, tag):
+        if tag in _BLOCKS:
+            self.text_parts.append(" ")
+        if tag in _INVISIBLE:
+            self._skip = max(0, self._skip - 1)
+            if tag == "script" and self._jsonld_parts is not None:
+                self.jsonld.append("".join(self._jsonld_parts))
+                self._jsonld_parts = None
+        elif tag == "title":
+            self._in_title = False
+        elif tag == "h1" and self._h1_state == 1:
+            self._h1_state = 2
+
+    def handle_data(self, data):
+        if self._jsonld_parts is not None:
+            self._jsonld_parts.append(data)
+            return
+        if self._in_title:
+            self.title_parts.append(data)
+            return
+        if self._skip:
+            return
+        if self._h1_state == 1:
+            self.h1_parts.append(data)
+        if self.want_text:
+            self.text_parts.append(data)
+
+
+class Page:
+    """Extracted pieces of one HTML document."""
+
+    __slots__ = ("links", "title", "h1", "text", "jsonld", "feeds")
+
+    def __init__(self, links, title, h1, text, jsonld=(), feeds=()):
+        self.links = links
+        self.title = title
+        self.h1 = h1
+        self.text = text
+        self.jsonld = list(jsonld)   # raw JSON-LD script bodies
+        self.feeds = list(feeds)     # RSS/Atom <link rel="alternate"> hrefs
+
+    @property
+    def heading(self):
+        """First <h1>, falling back to <title> (what the portal scan uses as the role)."""
+        return self.h1 or self.title
+
+
+def _clean(parts):
+    return _SPACE.sub(" ", "".join(parts)).strip()
+
+
+def extract(html, want_text=True):
+    """Tokenizes `html` once and returns its links, title, first h1, visible text, JSON-LD and feeds."""
+    parser = _Extractor(want_text)
+    parser.feed(html)
+    parser.close()
+    text = _clean(parser.text_parts) if want_text else ""
+    return Page(
+        parser.links, _clean(parser.title_parts), _clean(parser.h1_parts), text,
+        parser.jsonld, parser.feeds,
+    )
+
+
+def extract_links(html):
+    """Just the raw href values of every anchor, in document order."""
+    return extract(html, want_text=False).links
+
+
+def fetch_capped(url, source, max_bytes=MAX_PAGE_BYTES, **kwargs):
+    """
+    GETs `url` (throttled, with retries) and returns (status_code, text),
+    reading at most `max_bytes` of the body; the rest is never downloaded.
+    """
+    resp = http_get(url, source, stream=True, **kwargs)
+    try:
+        body = bytearray()
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
+            body.extend(chunk)
+            if len(body) >= max_bytes:
+                del body[max_bytes:]
+                break
+        encoding = resp.encoding or "utf-8"
+        return resp.status_code, body.decode(encoding, errors="replace")
+    finally:
+        resp.close()
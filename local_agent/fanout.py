@@ -0,0 +1,126 @@
+"""
+Process-pool fan-out for JobSpy scraping.
+
+Instead of one `scrape_jobs` call per role across all sites (where the slowest
+site stalls everything), each (role, site) pair runs as its own task in a pool
+of worker processes. Results are yielded as soon as each task finishes, and a
+task that exceeds the per-site timeout is abandoned so it can't block the rest.
+
+Workers are started with the "spawn" method: the agent process already runs
+pipeline threads and holds DB connections, neither of which survive a fork.
+"""
+
+import multiprocessing
+import time
+from collections import Counter, deque
+
+from throttle import call_with_retry, limiter
+
+JOBSPY_SITES = ["indeed", "linkedin", "glassdoor", "google", "zip_recruiter"]
+
+
+def scrape_site(role, site, location, job_type, results_wanted=20, hours_old=None):
+    """Worker-process entry point: scrapes one site for one role, returns plain rows."""
+    from jobspy import scrape_jobs
+
+    jobs = call_with_retry(
+        lambda: scrape_jobs(
+            site_name=[site],
+            search_term=role,
+            location=location,
+            results_wanted=results_wanted,
+            job_type=job_type,
+            hours_old=hours_old,
+            country_indeed='India'
+        ),
+        f"jobspy:{site}", retries=2, retry_on=(Exception,)
+    )
+    return jobs.to_dict("records")
+
+
+def iter_site_results(pairs, location, job_type, workers, site_timeout, max_per_site=1,
+                      task=scrape_site, kwargs_for=None, **scrape_kwargs):
+    """
+    Runs `task` (default `scrape_site`) for each (role, site) pair on a process pool.
+
+    Yields (role, site, rows) as tasks complete. At most `max_per_site` tasks
+    hit the same site at once, and each dispatch takes a token from the shared
+    per-site rate limiter. Timed-out and failed tasks are reported and skipped.
+    `kwargs_for(role, site)` can add per-task keyword arguments.
+    """
+    pending = deque(pairs)
+    running = {}      # AsyncResult -> (role, site, started_at)
+    abandoned = {}    # timed-out tasks still occupying a worker
+    timed_out = set() # sites with a task that overran site_timeout
+    in_flight = Counter()
+
+    context = multiprocessing.get_context("spawn")
+    pool = context.Pool(processes=workers)
+    try:
+        while pending or running:
+            # 1. Dispatch while there are free workers and the site isn't saturated
+            for pair in list(pending):
+                if len(running) + len(abandoned) >= workers:
+                    break
+                role, site = pair
+                if in_flight[site] >= max_per_site:
+                    continue
+                limiter.acquire(f"jobspy:{site}")
+                kwargs = dict(scrape_kwargs, **(kwargs_for(role, site) if kwargs_for else {}))
+                result = pool.apply_async(task, (role, site, location, job_type), kwargs)
+                running[result] = (role, site, time.monotonic())
+                in_flight[site] += 1
+                pending.remove(pair)
+
+            if pending and not running:
+                # Nothing dispatched, so the rest waits on abandoned tasks: pairs for
+                # a site that timed out are dropped, and if stuck tasks hold every
+                # worker the pool is replaced so healthy sites still get scraped
+                blocked = [pair for pair in pending if pair[1] in timed_out]
+                if blocked:
+                    sites = ", ".join(sorted({site for _, site in blocked}))
+                    print(f"⏱️ JobSpy: skipping {len(blocked)} tasks for timed-out sites ({sites})")
+                    for pair in blocked:
+                        pending.remove(pair)
+                if pending and abandoned:
+                    print(f"♻️ JobSpy: restarting the worker pool to free {len(abandoned)} stuck workers")
+                    pool.terminate()
+                    pool.join()
+                    for site in abandoned.values():
+                        in_flight[site] -= 1
+                    abandoned.clear()
+                    pool = context.Pool(processes=workers)
+                continue
+
+            # 2. Collect finished tasks
+            finished = False
+            for result, (role, site, started) in list(running.items()):
+                if result.ready():
+                    finished = True
+                    del running[result]
+                    in_flight[site] -= 1
+                    try:
+                        rows = result.get()
+                    except Exception as e:
+                        print(f"❌ JobSpy [{site}] failed for '{role}': {e}")
+                        continue
+                    print(f"   📊 JobSpy [{site}] '{role}': {len(rows)} rows in {time.monotonic() - started:.1f}s")
+                    yield role, site, rows
+                elif time.monotonic() - started > site_timeout:
+                    print(f"⏱️ JobSpy [{site}] timed out after {site_timeout}s for '{role}' — skipping")
+                    del running[result]
+                    abandoned[result] = site
+                    timed_out.add(site)
+
+            # 3. Free the slot (and the site) once an abandoned task finally returns
+            for result, site in list(abandoned.items()):
+                if result.ready():
+                    del abandoned[result]
+                    in_flight[site] -= 1
+
+            if not finished:
+                time.sleep(0.2)
+    finally:
+        # Workers stuck on an abandoned site would otherwise block shutdown
+        pool.terminate()
+        pool.join()
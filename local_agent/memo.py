@@ -0,0 +1,107 @@
+"""
+Content-hash memo for classification results.
+
+The same job descriptions come back across Adzuna sub-queries, JobSpy sites
+and repeated runs. Results are keyed by a hash of the classified text (plus
+the classifier's rules version) and kept in an in-process LRU; with
+AGENT_CLASSIFY_PERSIST on (the default) they are also stored in the agent's
+SQLite state, so a rescan skips classification for text it has already seen.
+Stored rows unused for AGENT_CLASSIFY_TTL_DAYS are pruned when the memo first
+touches the state.
+
+Rows are opaque JSON-safe lists here; the caller decides what they hold.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from state import get_state
+
+MEMO_SIZE = int(os.getenv("AGENT_CLASSIFY_CACHE_SIZE", "20000"))
+MEMO_PERSIST = os.getenv("AGENT_CLASSIFY_PERSIST", "1") != "0"
+MEMO_TTL_DAYS = int(os.getenv("AGENT_CLASSIFY_TTL_DAYS", "30"))
+
+
+def content_key(*parts):
+    """Stable hash of the given strings (None counts as empty)."""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update((part or "").encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultMemo:
+    """
+    Thread-safe LRU of key -> row, backed by AgentState when `persist` is on.
+    Lookups consult the LRU first and fetch all remaining keys from SQLite in
+    one query; rows loaded from disk are promoted into the LRU.
+    """
+
+    def __init__(self, size=MEMO_SIZE, persist=MEMO_PERSIST, state=None, ttl_days=MEMO_TTL_DAYS):
+        self.size = size
+        self.persist = persist
+        self.ttl_days = ttl_days
+        self._state = state
+        self._pruned = False
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        state = self._state if self._state is not None else get_state()
+        if not self._pruned:
+            self._pruned = True
+            try:
+                state.prune_classifications(datetime.now(timezone.utc) - timedelta(days=self.ttl_days))
+            except Exception as e:
+                print(f"⚠️ Classification cache prune failed: {e}")
+        return state
+
+    def get_many(self, keys):
+        """Returns {key: row} for every key with a memoized row."""
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                if key in self._rows:
+                    self._rows.move_to_end(key)
+                    found[key] = self._rows[key]
+                else:
+                    missing.append(key)
+
+        if missing and self.persist:
+            try:
+                stored = self.state.get_classifications(missing)
+            except Exception as e:
+                print(f"⚠️ Classification cache read failed: {e}")
+                stored = {}
+            loaded = {key: json.loads(facts) for key, facts in stored.items()}
+            self._remember(loaded)
+            found.update(loaded)
+        return found
+
+    def put_many(self, rows):
+        """Memoizes {key: row}."""
+        if not rows:
+            return
+        self._remember(rows)
+        if self.persist:
+            try:
+                self.state.put_classifications({key: json.dumps(row) for key, row in rows.items()})
+            except Exception as e:
+                print(f"⚠️ Classification cache write failed: {e}")
+
+    def _remember(self, rows):
+        with self._lock:
+            for key, row in rows.items():
+                self._rows[key] = row
+                self._rows.move_to_end(key)
+            while len(self._rows) > self.size:
+                self._rows.popitem(last=False)
+
+    def __len__(self):
+        return len(self._rows)
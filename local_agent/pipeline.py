@@ -0,0 +1,148 @@
+"""
+Staged ingestion pipeline for the job agent.
+
+Each stage runs on its own worker thread(s) and stages are connected by
+bounded queues, so network fetches overlap with parsing and DB writes while
+the amount of in-flight data stays capped. A full queue blocks the stage
+feeding it (backpressure) instead of buffering the whole scan in memory.
+"""
+
+import queue
+import threading
+import time
+
+_DONE = object()
+
+
+class StageStats:
+    """Per-stage counters and timings collected during a run."""
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.busy_seconds = 0.0      # time spent inside the stage function
+        self.blocked_seconds = 0.0   # time spent waiting on a full downstream queue
+        self._lock = threading.Lock()
+
+    def record(self, items_in=0, items_out=0, errors=0, busy=0.0, blocked=0.0):
+        with self._lock:
+            self.items_in += items_in
+            self.items_out += items_out
+            self.errors += errors
+            self.busy_seconds += busy
+            self.blocked_seconds += blocked
+
+    def summary(self):
+        return (
+            f"{self.name:<9} x{self.workers} | in {self.items_in:>4} | out {self.items_out:>4} | "
+            f"err {self.errors:>2} | busy {self.busy_seconds:6.2f}s | blocked {self.blocked_seconds:6.2f}s"
+        )
+
+
+class Stage:
+    """
+    A single pipeline step.
+
+    `fn(item)` returns an iterable of outputs (or None to drop the item). With
+    `batch_size`, `fn` receives lists of up to that many items instead; a
+    partial batch is flushed after `flush_seconds` without new input.
+    """
+
+    def __init__(self, name, fn, workers=1, batch_size=None, flush_seconds=2.0):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+
+
+class Pipeline:
+    """Runs a list of stages over a set of inputs and returns per-stage stats."""
+
+    def __init__(self, stages, queue_size=100):
+        self.stages = stages
+        self.queue_size = queue_size
+
+    def run(self, inputs):
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        stats = [StageStats(s.name, s.workers) for s in self.stages]
+        remaining = [s.workers for s in self.stages]
+        remaining_lock = threading.Lock()
+
+        def emit(idx, outputs):
+            if outputs is None:
+                return
+            outbox = queues[idx + 1] if idx + 1 < len(queues) else None
+            produced, blocked = 0, 0.0
+            for out in outputs:
+                produced += 1
+                if outbox is not None:
+                    start = time.perf_counter()
+                    outbox.put(out)
+                    blocked += time.perf_counter() - start
+            stats[idx].record(items_out=produced, blocked=blocked)
+            return blocked
+
+        def process(idx, payload):
+            stage = self.stages[idx]
+            start = time.perf_counter()
+            blocked = 0.0
+            try:
+                blocked = emit(idx, stage.fn(payload)) or 0.0
+            except Exception as e:
+                stats[idx].record(errors=1)
+                print(f"❌ Pipeline stage '{stage.name}' failed: {e}")
+            finally:
+                stats[idx].record(busy=time.perf_counter() - start - blocked)
+
+        def worker(idx):
+            stage = self.stages[idx]
+            inbox = queues[idx]
+            batch = []
+            while True:
+                try:
+                    item = inbox.get(timeout=stage.flush_seconds if batch else None)
+                except queue.Empty:
+                    process(idx, batch)
+                    batch = []
+                    continue
+                if item is _DONE:
+                    break
+                stats[idx].record(items_in=1)
+                if stage.batch_size:
+                    batch.append(item)
+                    if len(batch) >= stage.batch_size:
+                        process(idx, batch)
+                        batch = []
+                else:
+                    process(idx, item)
+            if batch:
+                process(idx, batch)
+
+            # The last worker out of a stage tells the next stage to finish
+            with remaining_lock:
+                remaining[idx] -= 1
+                last = remaining[idx] == 0
+            if last and idx + 1 < len(self.stages):
+                for _ in range(self.stages[idx + 1].workers):
+                    queues[idx + 1].put(_DONE)
+
+        threads = [
+            threading.Thread(target=worker, args=(idx,), name=f"{stage.name}-{n}", daemon=True)
+            for idx, stage in enumerate(self.stages)
+            for n in range(stage.workers)
+        ]
+        for t in threads:
+            t.start()
+
+        for item in inputs:
+            queues[0].put(item)
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_DONE)
+
+        for t in threads:
+            t.join()
+        return stats
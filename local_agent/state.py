@@ -0,0 +1,156 @@
+"""
+Local SQLite state for the agent.
+
+Holds caches only the agent needs: portal pages already checked and memoized
+classification results. The file lives next to the agent by default
+(AGENT_STATE_PATH overrides it) and is safe to delete, which is what happens
+on every GitHub Actions run (a fresh VM): the agent then just re-checks pages
+and re-classifies. Per-query scan watermarks must survive those runs, so they
+live in Postgres instead (app.crud.watermark, table agent_watermarks).
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+AGENT_STATE_PATH = os.getenv(
+    "AGENT_STATE_PATH", os.path.join(os.path.dirname(__file__), "agent_state.db")
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS portal_pages (
+    scan        TEXT NOT NULL,
+    url         TEXT NOT NULL,
+    checked_at  TEXT NOT NULL,
+    PRIMARY KEY (scan, url)
+);
+
+CREATE TABLE IF NOT EXISTS classifications (
+    key         TEXT PRIMARY KEY,
+    facts       TEXT NOT NULL,
+    updated_at  TEXT NOT NULL
+);
+"""
+
+# SQLite's default limit on bound parameters is 999
+_IN_CHUNK = 500
+
+
+def _key(value):
+    return " ".join((value or "").lower().split())
+
+
+def as_utc(value):
+    """Coerces naive/aware datetimes (and dates) to aware UTC datetimes."""
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class AgentState:
+    """Thin thread-safe wrapper around the agent's SQLite file."""
+
+    def __init__(self, path=AGENT_STATE_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def execute(self, sql, params=(), commit=False):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            if commit:
+                self._conn.commit()
+            return rows
+
+    def executemany(self, sql, rows):
+        with self._lock:
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+
+    def executescript(self, sql):
+        with self._lock:
+            self._conn.executescript(sql)
+            self._conn.commit()
+
+    # -------------------------------------------------------------------------
+    # Portal pages: job pages a portal scan read and rejected
+    # -------------------------------------------------------------------------
+
+    def get_checked_pages(self, scan, since):
+        """URLs `scan` marked as checked at or after `since`."""
+        rows = self.execute(
+            "SELECT url FROM portal_pages WHERE scan = ? AND checked_at >= ?",
+            (_key(scan), as_utc(since).isoformat()),
+        )
+        return {url for (url,) in rows}
+
+    def mark_pages_checked(self, scan, urls):
+        now = datetime.now(timezone.utc).isoformat()
+        self.executemany(
+            "INSERT OR REPLACE INTO portal_pages (scan, url, checked_at) VALUES (?, ?, ?)",
+            [(_key(scan), url, now) for url in urls],
+        )
+
+    # -------------------------------------------------------------------------
+    # Classifications: memoized classifier rows per content hash (see memo.py)
+    # -------------------------------------------------------------------------
+
+    def get_classifications(self, keys):
+        """
+        Returns {key: facts} for the keys that have a stored result. Found rows
+        are marked as used so `prune_classifications` keeps them.
+        """
+        keys = list(keys)
+        found = {}
+        for i in range(0, len(keys), _IN_CHUNK):
+            chunk = keys[i:i + _IN_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(self.execute(
+                f"SELECT key, facts FROM classifications WHERE key IN ({placeholders})", chunk
+            ))
+        if found:
+            now = datetime.now(timezone.utc).isoformat()
+            self.executemany(
+                "UPDATE classifications SET updated_at = ? WHERE key = ?", [(now, key) for key in found]
+            )
+        return found
+
+    def put_classifications(self, items):
+        """Stores {key: facts} (facts is a JSON string), replacing older entries."""
+        now = datetime.now(timezone.utc).isoformat()
+        self.executemany(
+            "INSERT OR REPLACE INTO classifications (key, facts, updated_at) VALUES (?, ?, ?)",
+            [(key, facts, now) for key, facts in items.items()],
+        )
+
+    def prune_classifications(self, before):
+        """
+        Deletes results not used since `before` and returns how many went.
+        Keys include the classifier's rules version, so rows from older rules
+        are never read again and age out here.
+        """
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM classifications WHERE updated_at < ?", (as_utc(before).isoformat(),)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+
+_state = None
+_state_lock = threading.Lock()
+
+
+def get_state():
+    """Process-wide AgentState, opened on first use."""
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = AgentState()
+        return _state
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# Make the agent's sibling modules (pipeline, throttle, ...) importable without
+# importing agent_main, which needs a live DATABASE_URL.
+AGENT_ROOT = Path(__file__).resolve().parent.parent
+if str(AGENT_ROOT) not in sys.path:
+    sys.path.insert(0, str(AGENT_ROOT))
@@ -0,0 +1,82 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import boards
+
+FIXTURES = Path(__file__).parent / "fixtures" / "boards"
+
+
+def _fixture(name):
+    return json.loads((FIXTURES / f"{name}.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://boards.greenhouse.io/acmeanalytics", ("greenhouse", "acmeanalytics", None)),
+    ("https://job-boards.greenhouse.io/acmeanalytics/jobs/4012345008", ("greenhouse", "acmeanalytics", None)),
+    ("https://boards.greenhouse.io/embed/job_board?for=acmeanalytics", ("greenhouse", "acmeanalytics", None)),
+    ("https://jobs.lever.co/zetaflow", ("lever", "zetaflow", None)),
+    ("https://jobs.eu.lever.co/zetaflow/5f3c2a9e", ("lever", "zetaflow", "eu")),
+    ("https://jobs.ashbyhq.com/payloop", ("ashby", "payloop", None)),
+    ("https://careers.acme.example/jobs", None),
+    ("https://boards.greenhouse.io/", None),
+])
+def test_detect_board(url, expected):
+    assert boards.detect_board(url) == expected
+
+
+def test_parse_greenhouse_unescapes_content():
+    jobs = boards.parse_greenhouse(_fixture("greenhouse"))
+
+    assert [j["title"] for j in jobs] == ["Backend Engineer I", "Account Executive"]
+    first = jobs[0]
+    assert first["url"] == "https://job-boards.greenhouse.io/acmeanalytics/jobs/4012345008"
+    assert first["location"] == "Bengaluru, Karnataka, India"
+    assert "What you'll do" in first["description"]
+    assert "<li>" not in first["description"]
+    assert first["posted_at"] == datetime(2024, 5, 10, 7, 30, tzinfo=timezone.utc)
+
+
+def test_parse_lever_includes_lists_and_salary():
+    job = boards.parse_lever(_fixture("lever"))[0]
+
+    assert job["title"] == "Data Engineer"
+    assert job["location"] == "Pune, India"
+    assert "Strong Python fundamentals" in job["description"]
+    assert (job["salary_min"], job["salary_max"]) == (1200000, 1800000)
+    assert (job["salary_currency"], job["salary_interval"]) == ("INR", "per-year-salary")
+    assert job["employment_type"] == "Full-time"
+    assert job["posted_at"].year == 2024
+
+
+def test_parse_ashby_skips_unlisted_and_reads_compensation():
+    jobs = boards.parse_ashby(_fixture("ashby"))
+
+    assert [j["title"] for j in jobs] == ["Frontend Engineer"]
+    assert (jobs[0]["salary_min"], jobs[0]["salary_max"]) == (1500000, 2200000)
+    assert jobs[0]["salary_interval"] == "1 YEAR"
+
+
+def test_fetch_board_is_a_single_request():
+    resp = MagicMock(status_code=200)
+    resp.json.return_value = _fixture("lever")
+    with patch.object(boards, "http_get", return_value=resp) as get:
+        jobs, status = boards.fetch_board("lever", "zetaflow")
+
+    get.assert_called_once()
+    assert get.call_args[0][0] == "https://api.lever.co/v0/postings/zetaflow?mode=json"
+    assert status == "OK"
+    assert len(jobs) == 2
+
+
+def test_fetch_board_uses_the_eu_api_for_eu_boards():
+    resp = MagicMock(status_code=200)
+    resp.json.return_value = _fixture("lever")
+    with patch.object(boards, "http_get", return_value=resp) as get:
+        jobs, status = boards.fetch_board(*boards.detect_board("https://jobs.eu.lever.co/zetaflow"))
+
+    assert get.call_args[0][0] == "https://api.eu.lever.co/v0/postings/zetaflow?mode=json"
+    assert status == "OK"
@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import discovery
+from extract import extract
+
+FIXTURES = Path(__file__).parent / "fixtures" / "discovery"
+
+
+def _fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def test_job_posting_jsonld_fields():
+    page = extract(_fixture("job_jsonld.html"))
+    jobs = discovery.job_postings(page.jsonld, "https://www.acme.example/careers")
+
+    assert len(jobs) == 1   # the Organization node and the broken block are skipped
+    job = jobs[0]
+    assert job["title"] == "Backend Developer"
+    assert job["url"] == "https://www.acme.example/careers/jobs/1001-backend-developer"
+    assert job["location"] == "Bengaluru, KA, IN"
+    assert job["employment_type"] == "FULL_TIME"
+    assert (job["salary_min"], job["salary_max"]) == (150_000, 200_000)
+    assert (job["salary_currency"], job["salary_interval"]) == ("INR", "MONTH")
+    assert job["posted_at"] == datetime(2024, 5, 14, tzinfo=timezone.utc)
+    assert job["description"] == "Build Python services on PostgreSQL."
+    assert job["external_id"] == "ENG-1001"
+    assert page.feeds == ["/careers/feed.xml"]
+
+
+def test_parse_sitemap_index_and_urlset():
+    urls, children = discovery.parse_sitemap(_fixture("sitemap_index.xml"))
+    assert urls == {}
+    assert children[-1] == "https://www.acme.example/sitemap-jobs.xml"
+
+    urls, children = discovery.parse_sitemap(_fixture("sitemap_jobs.xml"))
+    assert children == []
+    assert urls["https://www.acme.example/careers/jobs/1001-backend-developer"] == datetime(2024, 5, 14, 1, 0, tzinfo=timezone.utc)
+
+
+def test_parse_rss_feed():
+    urls = discovery.parse_feed(_fixture("feed.xml"))
+    assert urls == {"https://www.acme.example/careers/jobs/1010-qa-engineer": datetime(2024, 5, 14, 10, tzinfo=timezone.utc)}
+
+
+def test_discover_posting_urls_follows_job_sitemaps_and_feeds():
+    bodies = {
+        "https://www.acme.example/robots.txt": "User-agent: *\nSitemap: https://www.acme.example/sitemap_index.xml\n",
+        "https://www.acme.example/sitemap_index.xml": _fixture("sitemap_index.xml"),
+        "https://www.acme.example/sitemap-jobs.xml": _fixture("sitemap_jobs.xml"),
+        "https://www.acme.example/careers/feed.xml": _fixture("feed.xml"),
+    }
+    fetched = []
+
+    def fake_get(url):
+        fetched.append(url)
+        return bodies.get(url)
+
+    with patch.object(discovery, "_get", side_effect=fake_get):
+        urls = discovery.discover_posting_urls("https://www.acme.example/careers", ["/careers/feed.xml"])
+
+    # The /careers/ listing page in the sitemap is not a posting
+    assert set(urls) == {
+        "https://www.acme.example/careers/jobs/1001-backend-developer",
+        "https://www.acme.example/careers/jobs/0987-data-analyst",
+        "https://www.acme.example/careers/jobs/1010-qa-engineer",
+    }
+    # The job sitemap is read before the generic pages sitemap
+    assert fetched.index("https://www.acme.example/sitemap-jobs.xml") < fetched.index("https://www.acme.example/sitemap-pages.xml")
+
+
+@pytest.mark.parametrize("path, is_job", [
+    ("/careers/jobs/1001-backend-developer", True),
+    ("/jobs/backend-engineer", True),
+    ("/job-1234", True),
+    ("/careers/", False),
+    ("/careers", False),
+    ("/careers/jobs/", False),
+    ("/job-openings", False),
+    ("/about", False),
+])
+def test_job_path_needs_a_segment_after_the_job_word(path, is_job):
+    assert bool(discovery.JOB_PATH.search(path)) is is_job
+
+
+def test_sitemap_entities_are_refused():
+    bomb = (
+        '<?xml version="1.0"?><!DOCTYPE urlset [<!ENTITY a "aaaaaaaaaa">]>'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"><url><loc>&a;</loc></url></urlset>'
+    )
+    assert discovery.parse_sitemap(bomb) == ({}, [])
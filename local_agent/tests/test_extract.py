@@ -0,0 +1,45 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from bs4 import BeautifulSoup
+
+import extract
+
+FIXTURES = Path(__file__).parent / "fixtures" / "portal"
+
+
+def test_links_match_beautifulsoup_on_listing_fixture():
+    html = (FIXTURES / "listing.html").read_text(encoding="utf-8")
+    expected = [a["href"].strip() for a in BeautifulSoup(html, "html.parser").find_all("a", href=True) if a["href"]]
+
+    assert extract.extract_links(html) == expected
+
+
+def test_job_page_heading_and_visible_text():
+    html = (FIXTURES / "job.html").read_text(encoding="utf-8")
+    page = extract.extract(html)
+
+    assert page.heading == "Backend Developer"
+    assert page.title.startswith("Backend Developer - Bengaluru")
+    assert "Bengaluru, India" in page.text
+    assert "₹18,00,000" in page.text
+    # Script and style bodies are not visible text
+    assert "dataLayer" not in page.text
+    assert "display:flex" not in page.text
+
+
+def test_heading_falls_back_to_title():
+    page = extract.extract("<html><head><title> Data  Analyst </title></head><body><p>x</p></body></html>")
+    assert page.heading == "Data Analyst"
+
+
+def test_fetch_capped_stops_reading_at_byte_cap():
+    resp = MagicMock(status_code=200, encoding="utf-8")
+    resp.iter_content.return_value = iter([b"a" * 40, b"b" * 40, b"c" * 40])
+    with patch.object(extract, "http_get", return_value=resp) as get:
+        status, text = extract.fetch_capped("https://acme.example/careers", "portal", max_bytes=50)
+
+    assert get.call_args.kwargs["stream"] is True
+    assert status == 200
+    assert text == "a" * 40 + "b" * 10
+    resp.close.assert_called_once()
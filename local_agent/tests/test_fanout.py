@@ -0,0 +1,35 @@
+import time
+
+import fanout
+
+
+def fake_scrape(role, site, location, job_type):
+    if site == "slow":
+        time.sleep(30)
+    if site == "broken":
+        raise RuntimeError("blocked")
+    return [{"job_url": f"https://{site}.example/{role}", "site": site}]
+
+
+def test_slow_and_failing_sites_do_not_block_the_rest():
+    pairs = [("Backend", "fast"), ("Backend", "slow"), ("Backend", "broken"), ("Frontend", "fast")]
+    started = time.monotonic()
+    results = list(fanout.iter_site_results(
+        pairs, "India", "fulltime", workers=3, site_timeout=2, task=fake_scrape,
+    ))
+
+    assert sorted((role, site) for role, site, _ in results) == [("Backend", "fast"), ("Frontend", "fast")]
+    assert time.monotonic() - started < 20
+
+
+def test_stuck_workers_do_not_drop_healthy_sites():
+    # The slow task holds the only worker past its timeout: its site's other
+    # pair is skipped, but the healthy site still runs on a fresh pool
+    pairs = [("Backend", "slow"), ("Backend", "fast"), ("Frontend", "slow")]
+    started = time.monotonic()
+    results = list(fanout.iter_site_results(
+        pairs, "India", "fulltime", workers=1, site_timeout=2, task=fake_scrape,
+    ))
+
+    assert [(role, site) for role, site, _ in results] == [("Backend", "fast")]
+    assert time.monotonic() - started < 20
@@ -0,0 +1,38 @@
+from memo import ResultMemo, content_key
+from state import AgentState
+
+
+def test_content_key_depends_on_every_part():
+    assert content_key("v1", "Engineer", "Build APIs") == content_key("v1", "Engineer", "Build APIs")
+    assert content_key("v1", "Engineer", "Build APIs") != content_key("v2", "Engineer", "Build APIs")
+    assert content_key("v1", "Engineer", None) == content_key("v1", "Engineer", "")
+    assert content_key("ab", "c") != content_key("a", "bc")
+
+
+def test_lru_evicts_least_recently_used():
+    memo = ResultMemo(size=2, persist=False)
+    memo.put_many({"a": [1], "b": [2]})
+    assert memo.get_many(["a"]) == {"a": [1]}
+    memo.put_many({"c": [3]})
+
+    assert memo.get_many(["a", "b", "c"]) == {"a": [1], "c": [3]}
+    assert len(memo) == 2
+
+
+def test_rows_survive_a_restart_through_agent_state(tmp_path):
+    path = str(tmp_path / "state.db")
+    ResultMemo(persist=True, state=AgentState(path)).put_many({"k1": [True, "full_time", None]})
+
+    fresh = ResultMemo(persist=True, state=AgentState(path))
+    assert fresh.get_many(["k1", "k2"]) == {"k1": [True, "full_time", None]}
+    assert len(fresh) == 1
+
+
+def test_unused_rows_are_pruned_on_first_use(tmp_path):
+    state = AgentState(str(tmp_path / "state.db"))
+    ResultMemo(persist=True, state=state).put_many({"old": [1], "kept": [2]})
+    state.execute("UPDATE classifications SET updated_at = '2000-01-01T00:00:00+00:00'", commit=True)
+    state.get_classifications(["kept"])  # reading a row marks it as used
+
+    fresh = ResultMemo(persist=True, state=state, ttl_days=30)
+    assert fresh.get_many(["old", "kept"]) == {"kept": [2]}
@@ -0,0 +1,87 @@
+import threading
+import time
+
+from pipeline import Pipeline, Stage
+
+
+def _collect(out):
+    def sink(item):
+        out.append(item)
+        return None
+    return sink
+
+
+def test_single_worker_stages_keep_input_order():
+    out = []
+    stats = Pipeline([
+        Stage("double", lambda x: [x * 2]),
+        Stage("inc", lambda x: [x + 1]),
+        Stage("sink", _collect(out)),
+    ]).run(range(20))
+
+    assert out == [x * 2 + 1 for x in range(20)]
+    assert [s.items_in for s in stats] == [20, 20, 20]
+
+
+def test_batches_fill_up_and_the_remainder_is_flushed():
+    batches = []
+    Pipeline([
+        Stage("fetch", lambda x: [x]),
+        Stage("write", lambda batch: batches.append(list(batch)), batch_size=3),
+    ]).run(range(7))
+
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_a_failing_item_is_counted_and_the_rest_still_flow():
+    out = []
+
+    def parse(x):
+        if x == 3:
+            raise ValueError("bad row")
+        return [x]
+
+    stats = Pipeline([Stage("parse", parse), Stage("sink", _collect(out))]).run(range(6))
+
+    assert out == [0, 1, 2, 4, 5]
+    assert stats[0].errors == 1 and stats[1].errors == 0
+
+
+def test_full_queue_blocks_the_stage_feeding_it():
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    def produce(x):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        return [x]
+
+    def slow_sink(x):
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+
+    stats = Pipeline([Stage("fetch", produce), Stage("sink", slow_sink)], queue_size=2).run(range(30))
+
+    # Queued (2) + held by the sink (1) + blocked in put (1)
+    assert peak[0] <= 4
+    assert stats[0].blocked_seconds > 0
+
+
+def test_run_returns_once_every_worker_has_stopped():
+    out = []
+    lock = threading.Lock()
+
+    def sink(batch):
+        with lock:
+            out.extend(batch)
+
+    before = set(threading.enumerate())
+    Pipeline([
+        Stage("fetch", lambda x: [x, x], workers=4),
+        Stage("sink", sink, workers=3, batch_size=5),
+    ]).run(range(50))
+
+    assert sorted(out) == sorted(list(range(50)) * 2)
+    assert not [t for t in set(threading.enumerate()) - before if t.is_alive()]
@@ -0,0 +1,15 @@
+from datetime import datetime, timedelta, timezone
+
+from state import AgentState
+
+
+def test_checked_pages_expire(tmp_path):
+    state = AgentState(str(tmp_path / "state.db"))
+    now = datetime.now(timezone.utc)
+    state.mark_pages_checked("Acme|backend", ["https://acme.test/jobs/1", "https://acme.test/jobs/2"])
+
+    assert state.get_checked_pages("acme|backend", now - timedelta(days=1)) == {
+        "https://acme.test/jobs/1", "https://acme.test/jobs/2"
+    }
+    assert state.get_checked_pages("Acme|data", now - timedelta(days=1)) == set()
+    assert state.get_checked_pages("Acme|backend", now + timedelta(days=1)) == set()
@@ -0,0 +1,74 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+import throttle
+
+
+def _response(status, headers=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    return resp
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiter(monkeypatch):
+    monkeypatch.setattr(throttle, "limiter", throttle.RateLimiter())
+    monkeypatch.setattr(throttle.time, "sleep", lambda s: None)
+
+
+def test_retries_429_and_honours_retry_after():
+    responses = iter([_response(429, {"Retry-After": "7"}), _response(200)])
+    with patch.object(throttle.limiter, "pause") as pause:
+        result = throttle.call_with_retry(lambda: next(responses), "adzuna", url="https://api.adzuna.com/x")
+
+    assert result.status_code == 200
+    pause.assert_called_once_with("adzuna", "https://api.adzuna.com/x", 7.0)
+
+
+def test_gives_up_after_max_retries_and_returns_last_response():
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return _response(503)
+
+    result = throttle.call_with_retry(fn, "portal", retries=2)
+    assert result.status_code == 503
+    assert len(calls) == 3
+
+
+def test_connection_errors_are_retried_then_raised():
+    fn = MagicMock(side_effect=requests.ConnectionError("boom"))
+    with pytest.raises(requests.ConnectionError):
+        throttle.call_with_retry(fn, "portal", retries=1)
+    assert fn.call_count == 2
+
+
+def test_token_bucket_spaces_out_calls(monkeypatch):
+    clock = {"now": 0.0}
+    monkeypatch.setattr(throttle.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(throttle.time, "sleep", lambda s: clock.__setitem__("now", clock["now"] + s))
+
+    bucket = throttle.TokenBucket(rate=2.0, burst=1)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock["now"] == pytest.approx(1.0)
+
+
+def test_retry_after_http_date():
+    resp = _response(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    assert throttle.retry_after_seconds(resp) == 0.0
+
+
+def test_per_site_keys_inherit_the_source_limit(monkeypatch):
+    monkeypatch.delenv("AGENT_RATE_JOBSPY", raising=False)
+    monkeypatch.delenv("AGENT_RATE_JOBSPY_INDEED", raising=False)
+    bucket = throttle.limiter._bucket("source:jobspy:indeed")
+    assert (bucket.rate, bucket.capacity) == throttle.SOURCE_LIMITS["jobspy"]
+
+    monkeypatch.setenv("AGENT_RATE_JOBSPY", "0.5/2")
+    bucket = throttle.limiter._bucket("source:jobspy:linkedin")
+    assert (bucket.rate, bucket.capacity) == (0.5, 2)
@@ -0,0 +1,185 @@
+"""
+Shared throttling for the agent's fetchers.
+
+Every outbound call goes through a per-source and a per-host token bucket,
+and is retried with exponential backoff + full jitter on transient failures
+(connection errors, 429, 5xx). `Retry-After` is honoured and pauses the whole
+bucket, so parallel fetch workers back off together instead of hammering a
+provider that just told us to slow down.
+
+Limits are "rate/burst" pairs (tokens per second / bucket size) and can be
+overridden per source with e.g. AGENT_RATE_ADZUNA="2/4".
+"""
+
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+SOURCE_LIMITS = {
+    "adzuna": (1.0, 2),
+    "jobspy": (0.2, 1),
+    "portal": (4.0, 8),
+}
+DEFAULT_SOURCE_LIMIT = (1.0, 2)
+HOST_LIMIT = (1.0, 3)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0   # seconds
+BACKOFF_CAP = 30.0
+MAX_RETRY_AFTER = 120.0
+
+
+def _parse_limit(value, default):
+    try:
+        rate, burst = value.split("/")
+        return float(rate), int(burst)
+    except (AttributeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    """Thread-safe token bucket; `acquire` blocks until a token is available."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Blocks all callers for `seconds` (used for Retry-After)."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+def _rate_env(name):
+    return "AGENT_RATE_" + name.upper().replace("-", "_").replace(":", "_")
+
+
+class RateLimiter:
+    """Lazily created token buckets keyed by source and by host."""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                kind, name = key.split(":", 1)
+                if kind == "source":
+                    # "jobspy:indeed" falls back to the "jobspy" limit and setting
+                    family = name.split(":")[0]
+                    default = SOURCE_LIMITS.get(name, SOURCE_LIMITS.get(family, DEFAULT_SOURCE_LIMIT))
+                    setting = os.getenv(_rate_env(name)) or os.getenv(_rate_env(family))
+                    rate, burst = _parse_limit(setting, default)
+                else:
+                    rate, burst = _parse_limit(os.getenv("AGENT_RATE_HOST"), HOST_LIMIT)
+                bucket = self._buckets[key] = TokenBucket(rate, burst)
+            return bucket
+
+    def _keys(self, source, url):
+        keys = [f"source:{source}"]
+        host = urlsplit(url).hostname if url else None
+        if host:
+            keys.append(f"host:{host.lower()}")
+        return keys
+
+    def acquire(self, source, url=None):
+        for key in self._keys(source, url):
+            self._bucket(key).acquire()
+
+    def pause(self, source, url, seconds):
+        for key in self._keys(source, url):
+            self._bucket(key).pause(seconds)
+
+
+limiter = RateLimiter()
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+_session.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def retry_after_seconds(response):
+    """Parses a Retry-After header (delta-seconds or HTTP date)."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def call_with_retry(fn, source, url=None, retries=MAX_RETRIES, retry_on=RETRY_EXCEPTIONS):
+    """
+    Runs `fn()` under the source/host rate limits, retrying transient failures.
+
+    If `fn` returns an HTTP response with a retryable status, it is retried too;
+    the last response is returned once retries are exhausted.
+    """
+    for attempt in range(retries + 1):
+        limiter.acquire(source, url)
+        try:
+            result = fn()
+        except retry_on as e:
+            if attempt == retries:
+                raise
+            delay = backoff_delay(attempt)
+            print(f"   🔁 {source}: {type(e).__name__}, retry {attempt + 1}/{retries} in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+
+        status = getattr(result, "status_code", None)
+        if status not in RETRY_STATUSES or attempt == retries:
+            return result
+
+        retry_after = retry_after_seconds(result)
+        if retry_after is not None:
+            # Pausing the buckets makes every worker on this source/host wait
+            limiter.pause(source, url, retry_after)
+            print(f"   🔁 {source}: HTTP {status}, Retry-After {retry_after:.1f}s ({attempt + 1}/{retries})")
+            continue
+        delay = backoff_delay(attempt)
+        print(f"   🔁 {source}: HTTP {status}, retry {attempt + 1}/{retries} in {delay:.1f}s")
+        time.sleep(delay)
+
+
+def http_get(url, source, **kwargs):
+    """GET through the shared connection pool with throttling and retries."""
+    kwargs.setdefault("timeout", 15)
+    return call_with_retry(lambda: _session.get(url, **kwargs), source, url=url)